@@ -0,0 +1,17 @@
+import os
+import sys
+
+# usage: run this script in the bin directory with 'python build_printer_profiles.py'
+# this script compiles the default_initial_settings of all printers in the cura and community_minimal libraries
+# (fullcontrol/devices/LIBRARY/settings/*.py) into a single profile index file for each library (profiles.jsonl)
+# fullcontrol reads printer settings from the index rather than importing the settings module for each printer
+# run it again whenever settings modules or library.json are added or edited
+
+sys.path.insert(0, os.path.abspath('..'))  # use the fullcontrol package in this repo rather than an installed version
+from fullcontrol.gcode.import_printer import build_profile_index, PROFILE_INDEX
+
+for library_name in ['cura', 'community_minimal']:
+    failed = build_profile_index(library_name)
+    print(f'built fullcontrol/devices/{library_name}/{PROFILE_INDEX}')
+    if len(failed) > 0:
+        print(f'   - settings modules that could not be imported (not included in the index): {failed}')
@@ -1,6 +1,7 @@
 
 # from pydantic import model_validator, BaseModel
 from pydantic import BaseModel, __version__
+from types import FunctionType
 
 
 def check_fields(allowed_fields, defined_attributes, class_name):
@@ -43,7 +44,8 @@ class BaseModelPlus(BaseModel):
                 None
             """
             self_vars = vars(self)  # cache, for multiple checks
-            for key, value in vars(source).items():
+            source_vars = dict(source) if isinstance(source, SlottedModel) else vars(source)
+            for key, value in source_vars.items():
                 if (value is not None) and (key in self_vars):
                     self[key] = value
 
@@ -66,4 +68,180 @@ class BaseModelPlus(BaseModel):
         @classmethod
         def reject_extra_fields(cls, values):
             check_fields(cls.__fields__.keys(), values, cls.__name__)
-            return values
\ No newline at end of file
+            return values
+
+
+class SlottedModel:
+    """
+    A lightweight alternative to BaseModelPlus that stores attributes in __slots__ without pydantic validation.
+
+    Subclasses are created from a BaseModelPlus class with slotted_class(), which copies its fields, default
+    values and methods. Instances are much faster to create and use much less memory than pydantic instances,
+    so they are useful for designs with millions of steps. Arguments passed to the constructor are validated and
+    converted as pydantic does (values that already have the field's type are accepted without calling pydantic) and
+    unknown attributes are rejected. Attributes set after construction are not validated.
+    As for pydantic classes, an attribute that is None means it is not changed by this step.
+
+    Methods:
+        __setitem__: Sets the value of an attribute.
+        __getitem__: Retrieves the value of an attribute.
+        __iter__: Yields (name, value) for each attribute, so dict(instance) gives all attributes.
+        update_from: Updates the attributes of the object from another object.
+        copy: Returns a shallow copy of the object.
+        to_pydantic: Returns an equivalent instance of the pydantic class the slotted class was created from.
+    """
+    __slots__ = ()
+    _defaults = {}  # default value of each field
+    _required = ()  # fields that do not have a default value
+    pydantic_class = None
+
+    def __setitem__(self, name, value): setattr(self, name, value)
+
+    def __getitem__(self, name): return getattr(self, name)
+
+    def __iter__(self):
+        for key in self._defaults:
+            yield key, getattr(self, key)
+
+    def __eq__(self, other):
+        return type(self) is type(other) and all(getattr(self, key) == getattr(other, key) for key in self._defaults)
+
+    __hash__ = None
+
+    def __str__(self):
+        return ' '.join(f'{key}={value!r}' for key, value in self)
+
+    def __repr__(self):
+        return f'{type(self).__name__}({", ".join(f"{key}={value!r}" for key, value in self)})'
+
+    def update_from(self, source):
+        """
+        Updates the attributes of the current object from the attributes of another object.
+
+        Args:
+            source: The object from which to update the attributes.
+
+        Returns:
+            None
+        """
+        source_vars = dict(source) if isinstance(source, SlottedModel) else vars(source)
+        for key, value in source_vars.items():
+            if (value is not None) and (key in self._defaults):
+                setattr(self, key, value)
+
+    def copy(self):
+        """Return a shallow copy of the object."""
+        new = object.__new__(type(self))
+        for key in self._defaults:
+            setattr(new, key, getattr(self, key))
+        return new
+
+    __copy__ = copy  # used by copy.copy()
+
+    def to_pydantic(self):
+        """Return an equivalent instance of the pydantic class this slotted class was created from."""
+        return self.pydantic_class(**dict(self))
+
+
+def slotted_class(pydantic_class, base: type = SlottedModel, module: str = None) -> type:
+    """
+    Create a SlottedModel subclass with the same name, fields, default values and methods as a pydantic class.
+
+    Methods are shared with the pydantic class (e.g. gcode() and visualize()), so instances of the new
+    class can be used in a list of steps in the same way as instances of the pydantic class.
+
+    Args:
+        pydantic_class: The pydantic class (typically a BaseModelPlus subclass) to copy.
+        base (type, optional): The base class for the new class. Defaults to SlottedModel.
+        module (str, optional): The module the new class is defined in (used for pickling). Defaults to None.
+
+    Returns:
+        type: The new slotted class.
+    """
+    if int(__version__.split('.')[0]) >= 2:
+        fields = {name: (field.annotation, field.is_required(), field.default) for name, field in pydantic_class.model_fields.items()}
+    else:
+        fields = {name: (field.outer_type_, field.required, field.default) for name, field in pydantic_class.__fields__.items()}
+    namespace = {
+        '__slots__': tuple(fields),
+        '__doc__': pydantic_class.__doc__,
+        '__module__': module or __name__,
+        '_defaults': {name: None if required else default for name, (_, required, default) in fields.items()},
+        '_required': tuple(name for name, (_, required, _) in fields.items() if required),
+        'pydantic_class': pydantic_class,
+    }
+    annotations = {name: annotation for name, (annotation, _, _) in fields.items()}
+    namespace['__init__'] = _slotted_init(namespace['_defaults'], namespace['_required'], annotations, pydantic_class.__name__)
+    # share methods with the pydantic class, ignoring methods of pydantic itself
+    for cls in pydantic_class.__mro__:
+        if cls in (object, BaseModel, BaseModelPlus) or cls.__module__.startswith('pydantic'):
+            continue
+        for name, value in vars(cls).items():
+            if isinstance(value, FunctionType) and not name.startswith('__') and name not in namespace and not hasattr(SlottedModel, name):
+                namespace[name] = value
+    return type(pydantic_class.__name__, (base,), namespace)
+
+
+def _field_type(annotation):
+    'return the type of a field from its annotation (e.g. float for Optional[float]), or None if it is not a single type'
+    from typing import get_args
+    args = [arg for arg in get_args(annotation) if arg is not type(None)]
+    field_type = args[0] if len(args) == 1 else annotation
+    return field_type if isinstance(field_type, type) else None
+
+
+def _field_validator(annotation):
+    '''
+    Return a function that validates and converts a value for a field with the given annotation, as pydantic does.
+
+    None and values that already have the field's type are returned unchanged without calling pydantic (this is what
+    makes slotted classes fast). ints given for float fields are converted to float. Other values are validated by
+    pydantic, which converts them (e.g. '1' to 1 for an int field) or raises a ValidationError (e.g. 'yes' for a bool
+    field in pydantic v2 is converted to True, 'maybe' raises an error).
+
+    Args:
+        annotation: The type annotation of the field in the pydantic class.
+
+    Returns:
+        function: A function that takes a value and returns the validated value.
+    '''
+    field_type = _field_type(annotation)
+    pydantic_validate = None
+
+    def validate(value):
+        nonlocal pydantic_validate
+        if value is None or type(value) is field_type:
+            return value
+        if field_type is float and type(value) is int:
+            return float(value)
+        if isinstance(value, SlottedModel) and field_type is not None and issubclass(value.pydantic_class, field_type):
+            return value  # slotted version of a pydantic class (e.g. a slotted Point for PlotAnnotation.point)
+        if pydantic_validate is None:
+            if int(__version__.split('.')[0]) >= 2:
+                from pydantic import TypeAdapter
+                pydantic_validate = TypeAdapter(annotation).validate_python
+            else:
+                from pydantic import parse_obj_as
+                pydantic_validate = lambda value: parse_obj_as(annotation, value)
+        return pydantic_validate(value)
+    return validate
+
+
+def _slotted_init(defaults: dict, required: tuple, annotations: dict, class_name: str):
+    'return an __init__ method that validates keyword arguments for each field and sets the attributes'
+    missing = object()  # default of required fields
+    fields = tuple((key, missing if key in required else default, _field_type(annotations[key]), _field_validator(annotations[key]))
+                   for key, default in defaults.items())
+
+    def __init__(self, **kwargs):
+        for key, default, field_type, validate in fields:
+            value = kwargs.pop(key, default)
+            if value is None or type(value) is field_type:
+                setattr(self, key, value)
+            elif value is missing:
+                raise TypeError(f"{class_name}.__init__() missing required keyword argument: '{key}'")
+            else:
+                setattr(self, key, validate(value))
+        if kwargs:
+            check_fields(defaults.keys(), kwargs, class_name)
+    return __init__
@@ -1,5 +1,7 @@
-from fullcontrol.extra_functions import flatten, first_point
-from fullcontrol.common import Point
+from fullcontrol.extra_functions import flatten, first_point, step_point
+from fullcontrol.common import Point, SlottedPoint, PointArray
+from fullcontrol.step_source import StepSource, LazySteps, transform_class
+from collections.abc import Iterator
 from typing import Union
 
 def stop(message: str):
@@ -34,14 +36,196 @@ def check(steps: list):
     print("check results:\n" + results)
 
 
-def fix(steps: list, result_type: str, controls):
-    
-    types = set(type(step).__name__ for step in steps)
-    if "list" in types:
+class DesignSummary:
+    '''
+    Information about a design that is collected in one pass through its steps (see summarize()). It is used by
+    the gcode and plot transforms instead of reading the steps again to find the first point, the number of points
+    and the bounding box.
+
+    Attributes:
+        steps: The checked steps: a 1D list, or a StepSource or LazySteps design for designs that are not lists.
+        types (set): The names of the step classes (None if the steps have not been read, e.g. for a generator).
+        first_point (Point): The first Point (x y z may be None). For a PointArray, a Point for its first row.
+        first_point_defined (Point): The first Point with all of x y z defined (None if not found or not known).
+        point_count (int): The number of points (Points and rows of PointArrays), or None if not counted.
+        minx, maxx, miny, maxy, minz, maxz (float): The bounds of all points, or None if not calculated. As for
+            BoundingBox.calc_bounds(), an axis with no values defined has min=1e10 and max=-1e10.
+    '''
+
+    def __init__(self, steps):
+        self.steps = steps
+        self.types = None
+        self.first_point = None
+        self.first_point_defined = None
+        self.point_count = None
+        self.minx = self.maxx = self.miny = self.maxy = self.minz = self.maxz = None
+
+
+POINT, ARRAY, NESTED = 1, 2, 3  # kinds of step in summarize()
+_step_kinds = {}  # cache of the kind of each step class (0 for steps that are not points)
+
+
+def step_kind(step_type) -> int:
+    'return the kind of a step class for summarize(): POINT, ARRAY, NESTED (lists and lazy Transforms) or 0'
+    kind = _step_kinds.get(step_type)
+    if kind is None:
+        if issubclass(step_type, (Point, SlottedPoint)):
+            kind = POINT
+        elif issubclass(step_type, PointArray):
+            kind = ARRAY
+        elif issubclass(step_type, (list, transform_class())):
+            kind = NESTED
+        else:
+            kind = 0
+        _step_kinds[step_type] = kind
+    return kind
+
+
+def summarize(steps, bounds: bool = True) -> DesignSummary:
+    '''
+    Read a design once to find the types of steps, the first points and (if bounds is True) the number of points
+    and the bounding box. If the design is a list that includes lists or lazy Transforms, it is flattened to a 1D list
+    (with a warning for lists) and the new list is summarized.
+
+    Args:
+        steps: A list of steps, or an iterable that gives a 1D sequence of steps each time it is read (e.g. LazySteps).
+        bounds (bool, optional): Whether to count points and calculate the bounding box. Defaults to True.
+
+    Returns:
+        DesignSummary: The summary, with summary.steps the (possibly flattened) steps.
+    '''
+    summary = DesignSummary(steps)
+    if isinstance(steps, list) and not bounds:
+        # the types of steps are found without a python loop, and the first points are found by reading from the start
+        step_types = set(map(type, steps))
+        if any(step_kind(step_type) == NESTED for step_type in step_types):
+            return summarize(flattened(steps, step_types), bounds)
+        summary.types = set(step_type.__name__ for step_type in step_types)
+        summary.first_point = find_first_point(steps, fully_defined=False)
+        summary.first_point_defined = find_first_point(steps, fully_defined=True)
+        return summary
+
+    kinds = {}  # kind of each step class in this design
+    count = 0
+    first, first_defined = None, None
+    minx = miny = minz = 1e10  # initial high value always overwritten
+    maxx = maxy = maxz = -1e10  # initial low value always overwritten
+    for step in steps:
+        step_type = type(step)
+        kind = kinds.get(step_type)
+        if kind is None:
+            kind = kinds[step_type] = step_kind(step_type)
+            if kind == NESTED and isinstance(steps, list):
+                return summarize(flattened(steps, set(map(type, steps))), bounds)
+        if kind == POINT:
+            count += 1
+            x, y, z = step.x, step.y, step.z
+            if bounds:
+                # comparisons give the same results as min() and max() in BoundingBox.calc_bounds()
+                if x is not None:
+                    if x < minx: minx = x
+                    if x > maxx: maxx = x
+                if y is not None:
+                    if y < miny: miny = y
+                    if y > maxy: maxy = y
+                if z is not None:
+                    if z < minz: minz = z
+                    if z > maxz: maxz = z
+            if first_defined is None:
+                if first is None:
+                    first = step
+                if x is not None and y is not None and z is not None:
+                    first_defined = step
+        elif kind == ARRAY and len(step.xyz) > 0:
+            count += len(step.xyz)
+            if bounds:
+                import numpy as np
+                mins, maxs = np.fmin.reduce(step.xyz, axis=0).tolist(), np.fmax.reduce(step.xyz, axis=0).tolist()  # nan values ignored
+                if mins[0] == mins[0]:  # not nan (i.e. at least one value defined)
+                    minx, maxx = min(minx, mins[0]), max(maxx, maxs[0])
+                if mins[1] == mins[1]:
+                    miny, maxy = min(miny, mins[1]), max(maxy, maxs[1])
+                if mins[2] == mins[2]:
+                    minz, maxz = min(minz, mins[2]), max(maxz, maxs[2])
+            if first_defined is None:
+                if first is None:
+                    first = step_point(step, fully_defined=False, last=False)
+                first_defined = step_point(step, fully_defined=True, last=False)
+    summary.types = set(step_type.__name__ for step_type in kinds)
+    summary.first_point, summary.first_point_defined = first, first_defined
+    if bounds:
+        summary.point_count = count
+        summary.minx, summary.maxx, summary.miny, summary.maxy, summary.minz, summary.maxz = minx, maxx, miny, maxy, minz, maxz
+    return summary
+
+
+def find_first_point(steps: list, fully_defined: bool) -> Point:
+    'return the first Point in steps, or None if there is no Point (see first_point())'
+    try:
+        return first_point(steps, fully_defined)
+    except Exception:
+        return None
+
+
+def flattened(steps: list, step_types: set) -> list:
+    'return a 1D list of steps with lazy Transforms carried out and lists flattened (see summarize())'
+    if any(issubclass(step_type, transform_class()) for step_type in step_types):
+        steps = flatten([step.to_steps() if isinstance(step, transform_class()) else step for step in steps])
+    if any(issubclass(step_type, list) for step_type in step_types):
         print("warning - the list of steps should be a 1D list of fullcontrol class instances, it currently includes a 'list'\n   - fc.flatten() is being used to convert the design to a 1D list")
-        steps = flatten(steps)
+    # nested lists are flattened to any depth
+    return list(StepSource(steps))
+
+
+def first_point_step(steps):
+    'return the step that gives the first point (a Point or PointArray) of a list or StepSource, otherwise None'
+    if isinstance(steps, StepSource):
+        steps = steps.lookahead(lambda step: step_point(step, fully_defined=False, last=False) is not None)
+    if isinstance(steps, list):
+        for step in steps:
+            if step_point(step, fully_defined=False, last=False) is not None:
+                return step
+    return None
+
+
+def fix(steps: list, result_type: str, controls):
+    'check and fix a design before it is transformed (see fix_design()) and return the checked steps'
+    return fix_design(steps, result_type, controls).steps
+
+
+def fix_design(steps: list, result_type: str, controls) -> DesignSummary:
+    '''
+    Check and fix a design before it is transformed, and return a DesignSummary of the design, which is used by
+    the gcode and plot transforms instead of reading the steps again.
+
+    Args:
+        steps (list): The design (a list of steps, Transform, generator or other iterable of steps).
+        result_type (str): 'gcode' or 'plot'.
+        controls: The GcodeControls or PlotControls.
+
+    Returns:
+        DesignSummary: The summary, with summary.steps the checked steps.
+    '''
+    # lazy Transforms (see geometry/affine.py) are carried out now to create the steps
+    if isinstance(steps, transform_class()):
+        steps = steps.to_steps()
+    if isinstance(steps, list):
+        summary = summarize(steps, bounds=result_type == 'plot')
+    elif result_type != 'plot':
+        # generators (or other iterables) of steps are read as they are needed. nested lists and Transforms in them
+        # are expanded as they are read (see StepSource). only the steps up to the first point are read now
+        summary = DesignSummary(StepSource(steps))
+        summary.first_point = first_point(summary.steps, fully_defined=False)
+    elif isinstance(steps, Iterator):
+        # plots read the design more than once, so generators (which can only be read once) are read into a list
+        summary = summarize(list(StepSource(steps)))
+    else:
+        # the design is generated once for the summary and again for the plot
+        summary = summarize(steps if isinstance(steps, LazySteps) else LazySteps(iter, steps))
 
-    point0 = first_point(steps, fully_defined=False)
+    point0 = summary.first_point
+    if point0 is None:
+        raise Exception('No point found in steps')
 
     # if any of x y z are None, warn the user:      
     if any(val is None for val in (point0.x, point0.y, point0.z)):
@@ -49,12 +233,19 @@ def fix(steps: list, result_type: str, controls):
         point0.x = point0.x or 0
         point0.y = point0.y or 0
         point0.z = point0.z or 0
+        step0 = first_point_step(summary.steps)
+        if isinstance(step0, PointArray):
+            # point0 is a new Point equivalent to the first row of the array, so the row itself is fixed
+            step0.xyz[0] = [point0.x, point0.y, point0.z]
+        if isinstance(summary.steps, list):
+            # the summary is updated for the edited point (the first fully defined point and the bounds may change)
+            summary = summarize(summary.steps, bounds=result_type == 'plot')
     
     if result_type == 'plot' and controls.color_type == 'manual':
         if point0.color is None:
             stop(message = "error - for fc.PlotControls(color_type='manual') the first point in the design must have a color attribute defined")
 
-    return steps
+    return summary
 
 def check_points(geometry: Union[Point, list], check: str):
     
@@ -62,9 +253,11 @@ def check_points(geometry: Union[Point, list], check: str):
         def check_point(point: Point):
             if point.x is None or point.y is None:
                 raise Exception(f"polar transformations can only be applied to points with both x and y values. Attempted for point ({point})") 
-        if isinstance(geometry, Point):
+        if isinstance(geometry, (Point, SlottedPoint)):
             check_point(geometry)
         else:
             for step in geometry:
-                if isinstance(step, Point):
-                    check_point(step)
\ No newline at end of file
+                if isinstance(step, (Point, SlottedPoint)):
+                    check_point(step)
+                elif isinstance(step, PointArray) and (step.xyz[:, :2] != step.xyz[:, :2]).any():  # nan != nan
+                    raise Exception("polar transformations can only be applied to points with both x and y values. Attempted for a PointArray with undefined x or y values")
\ No newline at end of file
@@ -1,5 +1,6 @@
 
 
+from typing import ClassVar
 import fullcontrol.gcode as gc
 import fullcontrol.visualize as vis
 from fullcontrol.base import BaseModelPlus
@@ -71,6 +72,26 @@ class Point(gc.Point, vis.Point):
     pass
 
 
+class PointArray(gc.PointArray, vis.PointArray):
+    '''
+    Represents a polyline as a single step, with the x, y, z positions of all its points stored in an array
+    with shape (n, 3). This is equivalent to a list of n Points but uses much less memory and is processed
+    much faster.
+
+    nan values in the array are equivalent to Point attributes that are None (i.e. the nozzle does not move in
+    that direction).
+
+    Optionally, for visualization purposes, the color can be defined as [r, g, b] for all points or as a list of
+    [r, g, b] for each point, where each value is in the range of 0-1.
+
+    Attributes:
+        xyz (np.ndarray): The x, y, z positions of the nozzle, with shape (n, 3).
+        color (list): The color of the nozzle for visualization purposes.
+
+    '''
+    point_class: ClassVar[type] = Point
+
+
 class Extruder(gc.Extruder, vis.Extruder):
     '''
     Represents an extruder in a 3D printer.
@@ -211,6 +232,17 @@ class GcodeControls(gc.GcodeControls, PassVisualize):
         initialization_data (Optional[dict]): Values passed for initialization_data overwrite the default initialization_data of the printer. Defaults to an empty dictionary.
         save_as (Optional[str]): The file name to save the gcode as. Defaults to None resulting in no file being saved.
         include_date (Optional[bool]): Whether to include the date in the filename. Defaults to True.
+        columnar (Optional[bool]): Whether to process runs of consecutive Points as arrays, which is much faster for large designs and gives identical gcode. Defaults to True.
+        stream_to (Optional[Any]): A file name or open file-like object (with a write() method) to write the gcode to in chunks as it is generated, so the full gcode is never held in memory. transform() returns None when this is set. Defaults to None.
+        processes (Optional[int]): The number of processes used to generate gcode in parallel for large designs. The gcode is identical to that generated by one process. Defaults to None (one process).
+        decimals (Optional[dict]): The maximum number of decimal places written to gcode for each letter, e.g. {'X': 3, 'Y': 3, 'Z': 3, 'E': 5}. Letters that are not included use the defaults (6 for X, Y, Z and E, and 1 for F). Defaults to None.
+        quantize (Optional[bool]): Whether X, Y and Z values are compared with the previous position after rounding to their number of decimal places, so that axes are only written if their value in the gcode changes. Moves that round to zero length are not written, and their extrusion volume is carried forward to the next line of gcode. Defaults to False.
+        progress (Optional[bool]): Whether to add M73 progress lines (percent complete and remaining minutes) to the gcode, based on the print time estimated with the printer's acceleration and junction_deviation (see fc.transform(steps, 'stats')). Gcode is then generated by one process. Defaults to False.
+        optimize (Optional[bool]): Whether to optimize the gcode after it is generated: consecutive extruding moves on a straight line with the same feedrate and flow are merged into one move, moves that change nothing are removed, and F and E words that do not change the feedrate or E value are removed. A report of the lines and words removed is printed if show_tips is True. Defaults to False.
+        optimize_tolerance (Optional[float]): The maximum distance (mm) of a point from the line it is merged into when optimizing. Defaults to 0.001.
+
+    Methods:
+        compile: Return a GcodeSession to generate gcode for many designs with these controls (session.gcode(steps)).
     '''
     pass
 
@@ -245,6 +277,10 @@ class PlotControls(vis.PlotControls, PassGcode):
         hide_axes (Optional[bool]): Whether to hide axes in the plot. Default is False.
         neat_for_publishing (Optional[bool]): Whether to optimize the plot for publishing. Default is False.
         raw_data (Optional[bool]): Whether to show raw data in the plot. Default is False.
+        simplify (Optional[bool]): Whether to simplify extruded paths before plotting, by removing points that are not needed to show the paths, their colors and widths/heights within simplify_tolerance, so that very large designs can be previewed. Travel paths are unchanged. The number of points removed is shown on the plot (and printed if show_tips is True). Default is False.
+        simplify_tolerance (Optional[float]): The maximum deviation of simplified paths, as a fraction of the size of the design (its largest dimension). Default is 0.0005.
+        merge_traces (Optional[bool]): Whether to combine all extruded paths into one plotly trace (and all travel paths into another), instead of one trace for each path, so that designs with many separate paths are plotted and rendered much faster. Default is False.
+        processes (Optional[int]): The number of processes used to generate the tube meshes of paths in parallel for large designs. The plot is identical to that generated by one process. Defaults to None (one process).
         printer_name (Optional[str]): The name of the printer. Default is 'generic'.
         initialization_data (Optional[dict]): Information about initial printing conditions. Default is an empty dictionary. Values passed for initialization_data overwrite the default initialization_data of the printer.
     """
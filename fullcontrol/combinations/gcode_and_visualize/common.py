@@ -5,7 +5,9 @@ from typing import Union
 
 # import functions and classes that will be accessible to the user
 from .classes import *
-from fullcontrol.common import fix
+from fullcontrol.combinations.gcode_and_visualize import slotted
+from fullcontrol.common import fix, StepSource, LazySteps
+from fullcontrol.check import fix_design
 from fullcontrol.common import check, flatten, linspace, export_design, import_design, points_only, relative_point, first_point, last_point
 from fullcontrol.geometry import *
 from fullcontrol.visualize.bounding_box import BoundingBox
@@ -16,8 +18,8 @@ def transform(steps: list, result_type: str, controls: Union[GcodeControls, Plot
     Transform a fullcontrol design (a list of class instances) into the specified result_type.
     
     Parameters:
-        - steps (list): A list of function class instances representing the fullcontrol design.
-        - result_type (str): The desired result type. Valid options are "gcode" or "plot".
+        - steps (list): A list of function class instances representing the fullcontrol design. For gcode, it may also be a generator (or other iterable) of steps, e.g. yielding one layer at a time, which is converted to gcode as it is read without building the full list of steps.
+        - result_type (str): The desired result type. Valid options are "gcode", "gcode_chunks", "stats" or "plot". "gcode_chunks" returns a generator of gcode string chunks rather than a single string. "stats" returns a PrintStats object (estimated print time, filament, layer count, bounding box) without generating gcode.
         - controls (Union[GcodeControls, PlotControls], optional): Controls to customize the generation of gcode or plot. Defaults to None.
     
     Returns:
@@ -34,14 +36,26 @@ def transform(steps: list, result_type: str, controls: Union[GcodeControls, Plot
     if result_type == 'gcode':
         from fullcontrol.gcode.steps2gcode import gcode
         if controls is None: controls = GcodeControls()
-        steps = fix(steps, result_type, controls)
-        return gcode(steps, controls, show_tips)
+        summary = fix_design(steps, result_type, controls)
+        return gcode(summary.steps, controls, show_tips, summary)
+
+    elif result_type == 'gcode_chunks':
+        from fullcontrol.gcode.steps2gcode import gcode_chunks
+        if controls is None: controls = GcodeControls()
+        summary = fix_design(steps, 'gcode', controls)
+        return gcode_chunks(summary.steps, controls, show_tips, summary)
+
+    elif result_type == 'stats':
+        from fullcontrol.gcode.stats import stats
+        if controls is None: controls = GcodeControls()
+        summary = fix_design(steps, 'gcode', controls)
+        return stats(summary.steps, controls, show_tips, summary)
 
     elif result_type == 'plot':
         from fullcontrol.visualize.steps2visualization import visualize
         if controls is None: controls = PlotControls()
-        steps = fix(steps, result_type, controls)
-        return visualize(steps, controls, show_tips)
+        summary = fix_design(steps, result_type, controls)
+        return visualize(summary.steps, controls, show_tips, summary)
     
     else:
-        raise ValueError(f"result_type '{result_type}' not recognized. Please use 'gcode' or 'plot' of fclab.transform()")
+        raise ValueError(f"result_type '{result_type}' not recognized. Please use 'gcode', 'gcode_chunks', 'stats' or 'plot' of fclab.transform()")
@@ -0,0 +1,58 @@
+from fullcontrol.base import SlottedModel, slotted_class
+from fullcontrol.point import SlottedPoint
+from fullcontrol.combinations.gcode_and_visualize import classes
+
+# lightweight slotted versions of the step classes in classes.py. they have the same names, attributes
+# and gcode/visualize methods as the pydantic classes but are much faster to create and use much less
+# memory, which matters for designs with millions of steps. they can be mixed with the pydantic classes
+# in a list of steps. for example:
+#   steps = [fc.slotted.Point(x=i, y=0, z=0) for i in range(1000000)]
+# to_slotted() and to_pydantic() convert between the two types of class
+
+Point = slotted_class(classes.Point, SlottedPoint, __name__)
+Extruder = slotted_class(classes.Extruder, module=__name__)
+ExtrusionGeometry = slotted_class(classes.ExtrusionGeometry, module=__name__)
+StationaryExtrusion = slotted_class(classes.StationaryExtrusion, module=__name__)
+Printer = slotted_class(classes.Printer, module=__name__)
+PrinterCommand = slotted_class(classes.PrinterCommand, module=__name__)
+ManualGcode = slotted_class(classes.ManualGcode, module=__name__)
+Fan = slotted_class(classes.Fan, module=__name__)
+Hotend = slotted_class(classes.Hotend, module=__name__)
+Buildplate = slotted_class(classes.Buildplate, module=__name__)
+GcodeComment = slotted_class(classes.GcodeComment, module=__name__)
+PlotAnnotation = slotted_class(classes.PlotAnnotation, module=__name__)
+
+_slotted_classes = {cls.pydantic_class: cls for cls in (Point, Extruder, ExtrusionGeometry, StationaryExtrusion, Printer, PrinterCommand,
+                                                        ManualGcode, Fan, Hotend, Buildplate, GcodeComment, PlotAnnotation)}
+
+
+def to_slotted(steps: list) -> list:
+    '''
+    Convert steps to their slotted equivalents.
+
+    Args:
+        steps (list): A list of steps. Steps without a slotted equivalent (e.g. lists or custom classes) are included unchanged.
+
+    Returns:
+        list: A new list of steps.
+    '''
+    new_steps = []
+    for step in steps:
+        slotted_type = _slotted_classes.get(type(step))
+        if slotted_type is not None:
+            step = slotted_type(**{key: value for key, value in vars(step).items() if key in slotted_type._defaults})
+        new_steps.append(step)
+    return new_steps
+
+
+def to_pydantic(steps: list) -> list:
+    '''
+    Convert slotted steps to their pydantic equivalents.
+
+    Args:
+        steps (list): A list of steps. Steps that are not slotted are included unchanged.
+
+    Returns:
+        list: A new list of steps.
+    '''
+    return [step.to_pydantic() if isinstance(step, SlottedModel) else step for step in steps]
@@ -1,7 +1,9 @@
-from fullcontrol.base import BaseModelPlus
+from fullcontrol.base import BaseModelPlus, SlottedModel, slotted_class
 from fullcontrol.extrusion_classes import ExtrusionGeometry, StationaryExtrusion, Extruder
 from fullcontrol.auxilliary_components import Fan, Hotend, Buildplate
-from fullcontrol.point import Point
+from fullcontrol.point import Point, SlottedPoint
+from fullcontrol.point_array import PointArray
 from fullcontrol.printer import Printer
+from fullcontrol.step_source import StepSource, LazySteps
 from fullcontrol.extra_functions import points_only, relative_point, flatten, linspace, first_point, last_point, export_design, import_design
 from fullcontrol.check import check, fix, check_points
\ No newline at end of file
@@ -17,6 +17,8 @@ default_initial_settings = {
     "dia_feed": 1.75,
     "travel_format": "G0",  # options: "G0" / "G1_E0"
     "primer": "front_lines_then_y",
+    "acceleration": 1000,  # mm/s2, used to estimate print time (see fc.transform(steps, 'stats'))
+    "junction_deviation": 0.013,  # mm, used to estimate print time (speed at corners between moves)
     "printer_command_list": {
         "home": "G28 ; home axes",
         "retract": "G10 ; retract",
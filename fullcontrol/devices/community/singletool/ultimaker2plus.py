@@ -7,7 +7,7 @@ def set_up(user_overrides: dict):
     '''
 
     # overrides for this specific printer relative those defined in base_settings.py
-    printer_overrides = {'e_units': 'mm3', 'dia_feed': 2.85}
+    printer_overrides = {'e_units': 'mm3', 'dia_feed': 2.85, 'acceleration': 3000}
     # update default initialization settings based on the printer-specific overrides and user-defined overrides
     initialization_data = {**base_settings.default_initial_settings, **printer_overrides}
     initialization_data = {**initialization_data, **user_overrides}
@@ -10,7 +10,7 @@ def set_up(user_overrides: dict):
     '''
 
     # overrides for this specific printer relative those defined in base_settings.py
-    printer_overrides = {'primer': 'travel', 'chamber_temp': 50, 'z_offset': None, 'include_purge': True}
+    printer_overrides = {'primer': 'travel', 'chamber_temp': 50, 'z_offset': None, 'include_purge': True, 'acceleration': 3000}
     # update default initialization settings with printer-specific overrides and user-defined overrides
     initialization_data = {**base_settings.default_initial_settings, **printer_overrides}
     initialization_data = {**initialization_data, **user_overrides}
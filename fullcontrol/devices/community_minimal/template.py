@@ -1,5 +1,6 @@
 default_initial_settings = {
     # copy this file into the settings directory, edit it, then update library.json with an extra line for "printer_name_in_this_file: this_filename"
+    # then run bin/build_printer_profiles.py to add the printer to the profile index (profiles.jsonl)
     "name": "Printer Name",
     # use curly braces to write expressions that should be evaluated
     # start or end gcode can cross reference settings in base_settings.py, this file, or any supplied as initialization_data in a GcodeControls object sent to fc.transform()
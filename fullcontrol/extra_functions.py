@@ -1,4 +1,6 @@
-from fullcontrol.common import Point
+from fullcontrol.common import Point, SlottedPoint, SlottedModel, PointArray
+from fullcontrol.step_source import StepSource, LazySteps
+from collections.abc import Iterator
 from itertools import chain
 from copy import deepcopy
 from typing import Union
@@ -23,8 +25,10 @@ def points_only(steps: list, track_xyz: bool = True) -> list:
     '''
     new_steps = []
     for step in steps:
-        if isinstance(step, Point):  # only consider Point data
+        if isinstance(step, (Point, SlottedPoint)):  # only consider Point data
             new_steps.append(step)
+        elif isinstance(step, PointArray):
+            new_steps.extend(step.to_points())
     if track_xyz:
         for i in range(len(new_steps)-1):
             # fill in any None attributes for the next point with the most recent previous value:
@@ -61,7 +65,7 @@ def relative_point(reference: Union[Point, list], x_offset: float, y_offset: flo
         Exception: If the reference point does not have all of x, y, z attributes defined.
     '''
     pt = None
-    if isinstance(reference, Point):
+    if isinstance(reference, (Point, SlottedPoint)):
         pt = reference
     elif isinstance(reference, list):
         list_len = len(reference)
@@ -78,13 +82,19 @@ def relative_point(reference: Union[Point, list], x_offset: float, y_offset: flo
     return new_pt
 
 
-def flatten(steps: list) -> list:
+def flatten(steps: list, lazy: bool = False) -> list:
     '''
     Takes a list in which some elements are lists in the second dimension.
     Returns a flattened 1D list.
 
+    If lazy is True, steps may be any iterable (e.g. a generator), nested to any depth with lists, tuples,
+    generators and Transforms. Nothing is copied: the steps are generated in order each time the result is
+    iterated, so a large design never needs to be held in memory as one list.
+
     Parameters:
         steps (list): The input list containing elements, some of which may be lists.
+        lazy (bool, optional): Return a LazySteps design rather than a list. Defaults to False. If steps is a
+            generator (which can only be read once), a StepSource is returned instead.
 
     Returns:
         list: A flattened 1D list.
@@ -92,7 +102,13 @@ def flatten(steps: list) -> list:
     Example:
         >>> flatten([[1, 2], [3, 4], [5, 6]])
         [1, 2, 3, 4, 5, 6]
+        >>> list(flatten([1, [2, (3, [4])], (n for n in [5, 6])], lazy=True))
+        [1, 2, 3, 4, 5, 6]
     '''
+    if lazy:
+        if isinstance(steps, Iterator):
+            return StepSource(steps)
+        return LazySteps(iter, steps)
     return list(chain.from_iterable(step if isinstance(step, list) else [step]
                                     for step in steps))
 
@@ -127,16 +143,7 @@ def first_point(steps: list, fully_defined: bool = True) -> Point:
         - Exception: If no point is found in steps with all x, y, z values defined and fully_defined is True.
         - Exception: If no point is found in steps and fully_defined is False.
     '''
-    if isinstance(steps, list):
-        for step in steps:
-            if isinstance(step, Point):
-                if fully_defined and any(val is None for val in (step.x, step.y, step.z)):
-                    continue
-                return step
-    if fully_defined:
-        raise Exception('No point found in steps with all of x y z defined')
-    if not fully_defined:
-        raise Exception('No point found in steps')
+    return find_point(steps, fully_defined, last=False)
     
 def last_point(steps: list, fully_defined: bool = True) -> Point:
     '''
@@ -153,7 +160,47 @@ def last_point(steps: list, fully_defined: bool = True) -> Point:
         - Exception: If no point is found in steps with all x, y, z values defined and fully_defined is True.
         - Exception: If no point is found in steps and fully_defined is False.
     '''
-    return first_point(list(reversed(steps)), fully_defined)
+    return find_point(steps, fully_defined, last=True)
+
+
+def find_point(steps: list, fully_defined: bool, last: bool) -> Point:
+    '''
+    Function called by first_point() and last_point()
+
+    Return the first (or last) Point in the list. For a PointArray, a new Point equivalent to the relevant row of
+    the array is returned. For a StepSource, the first Point is found by reading steps ahead, which are kept in
+    the StepSource. Other iterables (e.g. LazySteps) are read from the start.
+    '''
+    if not isinstance(steps, (list, StepSource)) and not isinstance(steps, (Point, SlottedPoint)):
+        steps = StepSource(steps)  # e.g. LazySteps or a tuple
+    if isinstance(steps, StepSource):
+        if last:
+            steps = steps.lookahead(lambda step: False)  # all steps are read
+        else:
+            steps = steps.lookahead(lambda step: step_point(step, fully_defined, last) is not None)
+    if isinstance(steps, list):
+        for step in (reversed(steps) if last else steps):
+            point = step_point(step, fully_defined, last)
+            if point is not None:
+                return point
+    if fully_defined:
+        raise Exception('No point found in steps with all of x y z defined')
+    if not fully_defined:
+        raise Exception('No point found in steps')
+
+
+def step_point(step, fully_defined: bool, last: bool) -> Point:
+    'return the step if it is a Point, or the first (or last) row of a PointArray as a Point, otherwise None (see find_point)'
+    if isinstance(step, (Point, SlottedPoint)):
+        if fully_defined and any(val is None for val in (step.x, step.y, step.z)):
+            return None
+        return step
+    if isinstance(step, PointArray) and len(step.xyz) > 0:
+        import numpy as np
+        rows = np.nonzero(~np.isnan(step.xyz).any(axis=1))[0] if fully_defined else np.arange(len(step.xyz))
+        if len(rows) > 0:
+            return step.point(int(rows[-1] if last else rows[0]))
+    return None
 
 
 def export_design(steps: list, filename: str):
@@ -168,8 +215,12 @@ def export_design(steps: list, filename: str):
         None
     '''
     import json
+    def serialize(x):
+        if hasattr(x, 'tolist'):  # numpy arrays (e.g. PointArray.xyz)
+            return x.tolist()
+        return {'type': type(x).__name__, 'data': dict(x) if isinstance(x, SlottedModel) else x.__dict__}
     with open(filename + '.json', 'w', encoding='utf-8') as f:
-        json.dump(steps, f, ensure_ascii=False, indent=4, default=lambda x: {'type': type(x).__name__, 'data': x.__dict__})
+        json.dump(steps, f, ensure_ascii=False, indent=4, default=serialize)
 
 
 def import_design(fc_module_handle, filename: str):
@@ -3,10 +3,20 @@
 from fullcontrol.gcode.commands import PrinterCommand, ManualGcode
 from fullcontrol.gcode.controls import GcodeControls
 from fullcontrol.gcode.point import Point
+from fullcontrol.gcode.point_array import PointArray
 from fullcontrol.gcode.printer import Printer
 from fullcontrol.gcode.auxilliary_components import Fan, Hotend, Buildplate
 from fullcontrol.gcode.extrusion_classes import ExtrusionGeometry, StationaryExtrusion, Extruder
 from fullcontrol.gcode.annotations import GcodeComment
 
 # import functions
-from fullcontrol.gcode.steps2gcode import gcode
+# functions are imported when they are first used (PEP 562 module __getattr__), so that 'import fullcontrol' does not
+# import the gcode generation modules (and numpy) until gcode is generated
+
+
+def __getattr__(name):
+    if name == 'gcode':
+        from fullcontrol.gcode.steps2gcode import gcode
+        globals()['gcode'] = gcode
+        return gcode
+    raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
@@ -0,0 +1,134 @@
+import numpy as np
+from fullcontrol.gcode.formatting import format_number
+
+# arrays of values are formatted without any string trimming: the number of decimal places remaining after
+# trimming is calculated for each value with integer (fixed-point) arithmetic, and each value is then written
+# with exactly that many decimal places with '%.*f'. rounding to fewer decimal places gives the same digits
+# as rounding to the full number of decimal places and trimming zeros, so the result is identical to
+# format_number() in formatting.py. this module is only imported when arrays are formatted, so numpy is not
+# imported by 'import fullcontrol'
+
+
+def uncertain_rounding(scaled):
+    '''
+    Find values for which rounding of a scaled array (values * 10**decimals) to integers with np.rint() may not
+    give the same result as rounding the original values to decimal places with '%.*f' or round().
+
+    The integer value is uncertain if the scaled value is close to half way between integers (the multiplication
+    may have rounded it to the wrong side) or too large to be represented exactly.
+
+    Args:
+        scaled (np.ndarray): The scaled values.
+
+    Returns:
+        np.ndarray: A boolean array, True for uncertain values (including nan).
+    '''
+    return ~(np.abs(np.abs(scaled - np.trunc(scaled)) - 0.5) > 1e-6) | ~(np.abs(scaled) < 2**52)
+
+
+def round_numbers(values, decimals: int = 6):
+    '''
+    Round an array of numbers to decimal places. The result is identical to round(value, decimals) for each value.
+
+    Args:
+        values (np.ndarray): The values (any shape, nan values remain nan).
+        decimals (int, optional): The number of decimal places. Defaults to 6.
+
+    Returns:
+        np.ndarray: The rounded values.
+    '''
+    scale = 10.0**decimals
+    scaled = values * scale
+    # dividing the (exact) rounded integer by the (exact) scale gives the closest float to the decimal value, as round() does
+    rounded = np.rint(scaled) / scale
+    uncertain = uncertain_rounding(scaled) & ~np.isnan(scaled)
+    if uncertain.any():
+        rounded[uncertain] = [round(value, decimals) for value in values[uncertain].tolist()]
+    return rounded
+
+
+def trimmed_decimals(values, decimals: int = 6):
+    '''
+    Calculate the number of decimal places of each formatted value after trailing zeros are removed.
+
+    Args:
+        values (np.ndarray): The values.
+        decimals (int, optional): The maximum number of decimal places. Defaults to 6.
+
+    Returns:
+        np.ndarray: An integer array with the number of decimal places for each value (0 to decimals).
+    '''
+    scaled = values * 10**decimals
+    rounded = np.rint(scaled)
+    uncertain = uncertain_rounding(scaled)
+    digits = np.abs(np.where(uncertain, 0, rounded)).astype(np.int64)
+    places = np.full(len(values), decimals)
+    for _ in range(decimals):
+        trailing_zero = (digits % 10 == 0) & (places > 0) & (digits > 0)
+        if not trailing_zero.any():
+            break
+        places[trailing_zero] -= 1
+        digits[trailing_zero] //= 10
+    places[digits == 0] = 0
+    if uncertain.any():
+        # the few uncertain values are formatted individually
+        places[uncertain] = [len(text) - text.find('.') - 1 if '.' in text else 0
+                             for text in (format_number(value, decimals) for value in values[uncertain].tolist())]
+    return places
+
+
+def format_numbers(values, decimals: int = 6) -> list:
+    '''
+    Format an array of numbers for gcode. The result is identical to format_number() for each value.
+
+    Args:
+        values (np.ndarray): The values.
+        decimals (int, optional): The maximum number of decimal places. Defaults to 6.
+
+    Returns:
+        list: The formatted numbers.
+    '''
+    if len(values) == 0:
+        return []
+    args = [None] * (2 * len(values))
+    args[::2] = trimmed_decimals(values, decimals).tolist()
+    args[1::2] = values.tolist()
+    # one %-format operation for all values is much quicker than formatting each value separately
+    return ('\n'.join(['%.*f'] * len(values)) % tuple(args)).split('\n')
+
+
+def format_lines(templates: list, values, written, decimals: list) -> str:
+    '''
+    Format a block of gcode lines with one %-format operation.
+
+    Args:
+        templates (list): A template for each line, with '%.*f' for each written value (e.g. 'G1 X%.*f E%.*f').
+        values (np.ndarray): An array of values with shape (number of lines, number of columns).
+        written (np.ndarray): A boolean array with the same shape as values, for which values are in the templates.
+        decimals (list): The maximum number of decimal places for each column.
+
+    Returns:
+        str: The lines of gcode separated by new lines. Each number is identical to format_number().
+    '''
+    places = np.zeros(values.shape, dtype=np.int64)
+    for column, column_decimals in enumerate(decimals):
+        rows = written[:, column]
+        places[rows, column] = trimmed_decimals(values[rows, column], column_decimals)
+    args = [None] * (2 * int(written.sum()))
+    args[::2] = places[written].tolist()
+    args[1::2] = values[written].tolist()
+    return '\n'.join(templates) % tuple(args)
+
+
+def round_xyz(xyz, decimals: dict):
+    '''
+    Round an array of x y z values with each axis rounded to its number of decimal places.
+
+    Args:
+        xyz (np.ndarray): The values, with shape (n, 3).
+        decimals (dict): The number of decimal places for each letter (see NumberFormat.decimals).
+
+    Returns:
+        np.ndarray: The rounded values, with shape (n, 3).
+    '''
+    return np.column_stack([round_numbers(xyz[:, axis], decimals[letter]) for axis, letter in enumerate('XYZ')]).reshape(-1, 3)
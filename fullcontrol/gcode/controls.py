@@ -1,5 +1,5 @@
 
-from typing import Optional
+from typing import Optional, Any
 from pydantic import BaseModel
 
 
@@ -12,11 +12,41 @@ class GcodeControls(BaseModel):
         initialization_data (Optional[dict]): Values passed for initialization_data overwrite the default initialization_data of the printer. Defaults to an empty dictionary.
         save_as (Optional[str]): The file name to save the gcode as. Defaults to None resulting in no file being saved.
         include_date (Optional[bool]): Whether to include the date in the filename. Defaults to True.
+        columnar (Optional[bool]): Whether to process runs of consecutive Points as arrays, which is much faster for large designs and gives identical gcode. Defaults to True.
+        stream_to (Optional[Any]): A file name or open file-like object (with a write() method) to write the gcode to in chunks as it is generated, so the full gcode is never held in memory. transform() returns None when this is set. Defaults to None.
+        processes (Optional[int]): The number of processes used to generate gcode in parallel for large designs. The gcode is identical to that generated by one process. Defaults to None (one process).
+        decimals (Optional[dict]): The maximum number of decimal places written to gcode for each letter, e.g. {'X': 3, 'Y': 3, 'Z': 3, 'E': 5}. Letters that are not included use the defaults (6 for X, Y, Z and E, and 1 for F). Defaults to None.
+        quantize (Optional[bool]): Whether X, Y and Z values are compared with the previous position after rounding to their number of decimal places, so that axes are only written if their value in the gcode changes. Moves that round to zero length are not written, and their extrusion volume is carried forward to the next line of gcode. Defaults to False.
+        progress (Optional[bool]): Whether to add M73 progress lines (percent complete and remaining minutes) to the gcode, based on the print time estimated with the printer's acceleration and junction_deviation (see fc.transform(steps, 'stats')). Gcode is then generated by one process. Defaults to False.
+        optimize (Optional[bool]): Whether to optimize the gcode after it is generated: consecutive extruding moves on a straight line with the same feedrate and flow are merged into one move, moves that change nothing are removed, and F and E words that do not change the feedrate or E value are removed. A report of the lines and words removed is printed if show_tips is True. Defaults to False.
+        optimize_tolerance (Optional[float]): The maximum distance (mm) of a point from the line it is merged into when optimizing. Defaults to 0.001.
     """
     printer_name: Optional[str] = None
     initialization_data: Optional[dict] = {} # values passed for initialization_data overwrite the default initialization_data of the printer
     save_as: Optional[str] = None
     include_date: Optional[bool] = True
+    columnar: Optional[bool] = True
+    stream_to: Optional[Any] = None  # file name or file-like object
+    processes: Optional[int] = None
+    decimals: Optional[dict] = None  # e.g. {'X': 3, 'Y': 3, 'Z': 3, 'E': 5}
+    quantize: Optional[bool] = False
+    progress: Optional[bool] = False
+    optimize: Optional[bool] = False
+    optimize_tolerance: Optional[float] = 0.001
+
+    def compile(self, show_tips: bool = True):
+        '''
+        Return a GcodeSession, which generates gcode for many designs with these controls more quickly than calling
+        fc.transform() for each design, since the printer, initial state and starting procedure are only set up once.
+
+        Args:
+            show_tips (bool, optional): Whether to print tips about the gcode controls. Defaults to True.
+
+        Returns:
+            GcodeSession: The session, with methods gcode(steps) and gcode_chunks(steps).
+        '''
+        from fullcontrol.gcode.session import GcodeSession
+        return GcodeSession(self, show_tips)
 
     def initialize(self):
         if self.printer_name is None:
@@ -4,10 +4,27 @@ from fullcontrol.common import Extruder as BaseExtruder
 from fullcontrol.common import StationaryExtrusion as BaseStationaryExtrusion
 from fullcontrol.gcode import Point
 # from fullcontrol.geometry.measure import distance_forgiving
+from fullcontrol.gcode.formatting import DEFAULT_FORMAT
 from math import pi
 from pydantic import root_validator
 
 
+def distance_forgiving(point1: Point, point2: Point) -> float:
+    '''Calculate the distance between two points. x, y or z components are ignored unless defined in both points
+
+    Args:
+        point1 (Point): The first point.
+        point2 (Point): The second point.
+
+    Returns:
+        float: The distance between the two points.
+    '''
+    dist_x = 0 if point1.x == None or point2.x == None else point1.x - point2.x
+    dist_y = 0 if point1.y == None or point2.y == None else point1.y - point2.y
+    dist_z = 0 if point1.z == None or point2.z == None else point1.z - point2.z
+    return ((dist_x)**2+(dist_y)**2+(dist_z)**2)**0.5
+
+
 class ExtrusionGeometry(BaseExtrusionGeometry):
     'Extend generic class with gcode method to convert the object to gcode'
     def gcode(self, state):
@@ -98,32 +115,30 @@ class Extruder(BaseExtruder):
         Returns:
             str: The gcode component for extrusion.
         '''
-        def distance_forgiving(point1: Point, point2: Point) -> float:
-            '''Calculate the distance between two points. x, y or z components are ignored unless defined in both points
-
-            Args:
-                point1 (Point): The first point.
-                point2 (Point): The second point.
-
-            Returns:
-                float: The distance between the two points.
-            '''
-            dist_x = 0 if point1.x == None or point2.x == None else point1.x - point2.x
-            dist_y = 0 if point1.y == None or point2.y == None else point1.y - point2.y
-            dist_z = 0 if point1.z == None or point2.z == None else point1.z - point2.z
-            return ((dist_x)**2+(dist_y)**2+(dist_z)**2)**0.5
+        number_format = getattr(state, 'number_format', DEFAULT_FORMAT)  # states for multiaxis printers (lab) do not have number_format
         if self.on:
             # length = pt1.distance_to_self(pt2)
             length = distance_forgiving(point1, state.point)
-            return f'E{self.get_and_update_volume(length*state.extrusion_geometry.area)*self.volume_to_e:.6f}'.rstrip('0').rstrip('.')
+            return number_format.word('E', self.get_and_update_volume(length*state.extrusion_geometry.area)*self.volume_to_e)
         else:
             if state.extruder.travel_format == 'G1_E0':
                 # return 'E0' for relative extrusion or E(previous extrusion) for absolute extrusion
-                return f'E{self.get_and_update_volume(0)*self.volume_to_e:.6f}'.rstrip('0').rstrip('.')
+                return number_format.word('E', self.get_and_update_volume(0)*self.volume_to_e)
             else: 
                 # return nothing if travel format does not require am E value
                 return ''
 
+    def carry_volume(self, point1: Point, state):
+        '''Add the extrusion volume for a move that is not written to gcode (see NumberFormat.quantize) to the total
+        volume, without updating total_volume_ref, so that it is included in the E value of the next line of gcode.
+
+        Args:
+            point1 (Point): The point at the end of the move.
+            state: The current state of the printer.
+        '''
+        if self.on:
+            self.total_volume += distance_forgiving(point1, state.point)*state.extrusion_geometry.area
+
     def update_e_ratio(self):
         '''Calculate the ratio for conversion from mm3 extrusion to units for E in gcode.'''
         try:  # try in case not all parameters set yet
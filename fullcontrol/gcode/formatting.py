@@ -0,0 +1,63 @@
+from typing import Optional
+from pydantic import BaseModel
+
+# numbers in gcode are written with a fixed number of decimal places and then trailing zeros (and any
+# trailing decimal point) are removed, e.g. f'{value:.6f}'.rstrip('0').rstrip('.') gives 'X12.5' for 12.5.
+# arrays of values are formatted with the functions in array_formatting.py, which give identical results
+
+DEFAULT_DECIMALS = {'X': 6, 'Y': 6, 'Z': 6, 'E': 6, 'F': 1}
+
+
+def format_number(value: float, decimals: int = 6) -> str:
+    '''
+    Format a number for gcode with up to 'decimals' decimal places (trailing zeros are removed).
+
+    Args:
+        value (float): The number.
+        decimals (int, optional): The maximum number of decimal places. Defaults to 6.
+
+    Returns:
+        str: The formatted number, identical to f'{value:.{decimals}f}'.rstrip('0').rstrip('.') for decimals > 0.
+    '''
+    if decimals == 0:
+        return '%.0f' % value
+    return ('%.*f' % (decimals, value)).rstrip('0').rstrip('.')
+
+
+class NumberFormat(BaseModel):
+    '''
+    The number of decimal places written for each type of gcode word (X, Y, Z, E and F).
+
+    Attributes:
+        decimals (dict): The maximum number of decimal places for each letter. Letters that are not included
+            use DEFAULT_DECIMALS.
+        quantize (bool): Whether X Y Z values are compared with the previous position after rounding to their
+            number of decimal places, so an axis is only written if its value in gcode changes. Moves for which
+            no axis changes are not written to gcode, but their extrusion volume is carried forward to the next
+            line of gcode so the total extrusion is unchanged. Defaults to False.
+        templates (dict): %-format templates for each letter, calculated automatically. The word for a value is
+            (templates[letter] % value).rstrip('0').rstrip('.').
+    '''
+    decimals: Optional[dict] = {}
+    quantize: Optional[bool] = False
+    templates: Optional[dict] = None
+
+    def __init__(self, **data):
+        super().__init__(**data)
+        for letter in self.decimals:
+            if letter not in DEFAULT_DECIMALS:
+                raise Exception(f'decimal places cannot be set for \'{letter}\' - options are {list(DEFAULT_DECIMALS)}')
+        self.decimals = {**DEFAULT_DECIMALS, **self.decimals}
+        # for 0 decimal places, a decimal point is added so that rstrip('0') does not remove zeros from integers
+        self.templates = {letter: f'{letter}%.{places}f' + ('.' if places == 0 else '') for letter, places in self.decimals.items()}
+
+    def word(self, letter: str, value: float) -> str:
+        'return a gcode word for a value, e.g. X12.5'
+        return (self.templates[letter] % value).rstrip('0').rstrip('.')
+
+    def changed(self, letter: str, value: float, previous: float) -> bool:
+        'return True if a value is written differently to the previous value in gcode (previous may be None)'
+        return previous == None or round(value, self.decimals[letter]) != round(previous, self.decimals[letter])
+
+
+DEFAULT_FORMAT = NumberFormat()
@@ -0,0 +1,183 @@
+import ast
+import operator
+import re
+from math import log2
+from functools import lru_cache
+
+# start_gcode and end_gcode in printer settings may contain expressions in curly braces, e.g. 'M109 S{data['nozzle_temp']}',
+# which are replaced by their values. each gcode string is parsed once into a GcodeTemplate, in which every expression
+# is compiled into a python function. only a restricted set of expressions is allowed (numbers, strings, data['key'],
+# arithmetic, comparisons, conditional expressions and a few built-in functions), so no arbitrary code is executed.
+# rendered gcode is memoised for each set of values referenced by the template
+
+MAX_INT_BITS = 1024  # maximum size of integers created in expressions (e.g. by 9**9**9)
+MAX_STRING_LENGTH = 100000  # maximum length of strings created in expressions (e.g. by 'text' * n)
+RENDER_CACHE_SIZE = 64  # number of rendered strings memoised for each template
+
+FUNCTIONS = {'abs': abs, 'float': float, 'int': int, 'max': max, 'min': min, 'round': round, 'str': str}
+
+
+def is_int(value) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def checked_pow(a, b):
+    # the result of int ** int has about b * log2(abs(a)) bits, so nested powers are rejected before they are calculated
+    if is_int(a) and is_int(b) and b > 0 and abs(a) > 1 and b * log2(abs(a)) > MAX_INT_BITS:
+        raise Exception(f'integers larger than {MAX_INT_BITS} bits are not allowed in start_gcode or end_gcode expressions')
+    return a ** b
+
+
+def checked_mult(a, b):
+    if (isinstance(a, str) and isinstance(b, int) and len(a) * b > MAX_STRING_LENGTH) \
+            or (isinstance(b, str) and isinstance(a, int) and len(b) * a > MAX_STRING_LENGTH):
+        raise Exception(f'strings longer than {MAX_STRING_LENGTH} characters are not allowed in start_gcode or end_gcode expressions')
+    if is_int(a) and is_int(b) and a.bit_length() + b.bit_length() > MAX_INT_BITS:
+        raise Exception(f'integers larger than {MAX_INT_BITS} bits are not allowed in start_gcode or end_gcode expressions')
+    return a * b
+
+
+def checked_mod(a, b):
+    # '%' formatting of strings is not allowed, since the width in the format (e.g. '%0300000000d') is not limited
+    if isinstance(a, str):
+        raise Exception("'%' formatting of strings is not allowed in start_gcode or end_gcode expressions")
+    return a % b
+
+
+BINARY_OPERATORS = {ast.Add: operator.add, ast.Sub: operator.sub, ast.Mult: checked_mult, ast.Div: operator.truediv,
+                    ast.FloorDiv: operator.floordiv, ast.Mod: checked_mod, ast.Pow: checked_pow}
+UNARY_OPERATORS = {ast.USub: operator.neg, ast.UAdd: operator.pos, ast.Not: operator.not_}
+COMPARISONS = {ast.Eq: operator.eq, ast.NotEq: operator.ne, ast.Lt: operator.lt, ast.LtE: operator.le,
+               ast.Gt: operator.gt, ast.GtE: operator.ge}
+
+
+def compile_expression(node, keys: set):
+    '''
+    Compile a node of a parsed expression into a function.
+
+    Args:
+        node (ast.AST): The node.
+        keys (set): The keys of data referenced by the expression are added to this set.
+
+    Returns:
+        function: A function f(data, printer_name) that returns the value of the expression.
+    '''
+    if isinstance(node, ast.Expression):
+        return compile_expression(node.body, keys)
+    if isinstance(node, ast.Constant) and (node.value is None or isinstance(node.value, (bool, int, float, str))):
+        value = node.value
+        return lambda data, printer_name: value
+    if isinstance(node, ast.Name) and node.id == 'printer_name':
+        return lambda data, printer_name: printer_name
+    if isinstance(node, ast.Subscript) and isinstance(node.value, ast.Name) and node.value.id == 'data':
+        if isinstance(node.slice, ast.Constant) and isinstance(node.slice.value, str):
+            key = node.slice.value
+            keys.add(key)
+            return lambda data, printer_name: data[key]
+    if isinstance(node, ast.BinOp) and type(node.op) in BINARY_OPERATORS:
+        function, left, right = BINARY_OPERATORS[type(node.op)], compile_expression(node.left, keys), compile_expression(node.right, keys)
+        return lambda data, printer_name: function(left(data, printer_name), right(data, printer_name))
+    if isinstance(node, ast.UnaryOp) and type(node.op) in UNARY_OPERATORS:
+        function, operand = UNARY_OPERATORS[type(node.op)], compile_expression(node.operand, keys)
+        return lambda data, printer_name: function(operand(data, printer_name))
+    if isinstance(node, ast.Compare) and all(type(op) in COMPARISONS for op in node.ops):
+        functions = [COMPARISONS[type(op)] for op in node.ops]
+        operands = [compile_expression(operand, keys) for operand in [node.left] + node.comparators]
+
+        def compare(data, printer_name):
+            values = [operand(data, printer_name) for operand in operands]
+            return all(function(a, b) for function, a, b in zip(functions, values[:-1], values[1:]))
+        return compare
+    if isinstance(node, ast.BoolOp):
+        operands = [compile_expression(operand, keys) for operand in node.values]
+        if isinstance(node.op, ast.And):
+            def bool_and(data, printer_name):
+                for operand in operands:
+                    value = operand(data, printer_name)
+                    if not value:
+                        return value
+                return value
+            return bool_and
+
+        def bool_or(data, printer_name):
+            for operand in operands:
+                value = operand(data, printer_name)
+                if value:
+                    return value
+            return value
+        return bool_or
+    if isinstance(node, ast.IfExp):
+        test, body, orelse = compile_expression(node.test, keys), compile_expression(node.body, keys), compile_expression(node.orelse, keys)
+        return lambda data, printer_name: body(data, printer_name) if test(data, printer_name) else orelse(data, printer_name)
+    if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id in FUNCTIONS and len(node.keywords) == 0:
+        function, args = FUNCTIONS[node.func.id], [compile_expression(arg, keys) for arg in node.args]
+        return lambda data, printer_name: function(*[arg(data, printer_name) for arg in args])
+    raise Exception(f"'{ast.unparse(node)}' is not allowed in start_gcode or end_gcode expressions - expressions may only contain " +
+                    f"numbers, strings, data['key'], printer_name, arithmetic, comparisons, 'x if condition else y' and the functions {list(FUNCTIONS)}")
+
+
+class GcodeTemplate:
+    '''
+    A start_gcode or end_gcode string parsed into literal text and compiled expressions (see compile_template).
+
+    Expressions are the terms in curly braces. As for the original string replacement, terms containing commas or
+    with leading or trailing spaces are not replaced.
+
+    Args:
+        text (str): The gcode string.
+    '''
+
+    def __init__(self, text: str):
+        self.text = text
+        self.parts = []  # literal strings and compiled expressions, in order
+        self.keys = set()  # keys of data referenced by the expressions
+        self.uses_printer_name = False
+        self.renders = {}
+        position = 0
+        for match in re.finditer(r'\{(.*?)\}', text):
+            term = match.group(1)
+            if ',' in term or term != term.strip() or term == '':
+                continue
+            try:
+                tree = ast.parse(term, mode='eval')
+            except SyntaxError:
+                raise Exception(f"the expression '{{{term}}}' in start_gcode or end_gcode is not valid python")
+            self.parts.append(text[position:match.start()])
+            self.parts.append(compile_expression(tree, self.keys))
+            self.uses_printer_name = self.uses_printer_name or any(isinstance(node, ast.Name) and node.id == 'printer_name' for node in ast.walk(tree))
+            position = match.end()
+        self.parts.append(text[position:])
+        self.keys = tuple(sorted(self.keys))
+
+    def render(self, data: dict, printer_name: str = '') -> str:
+        '''
+        Return the gcode string with expressions replaced by their values.
+
+        Args:
+            data (dict): The printer settings referenced by data['key'] in expressions.
+            printer_name (str, optional): The printer name, referenced by printer_name in expressions. Defaults to ''.
+
+        Returns:
+            str: The gcode string.
+        '''
+        if len(self.parts) == 1:
+            return self.text
+        try:
+            # the type of each value is included since values such as 1 and 1.0 are equal but are written differently
+            render_key = tuple((type(data[key]), data[key]) for key in self.keys) + ((printer_name,) if self.uses_printer_name else ())
+            rendered = self.renders.get(render_key)
+        except (KeyError, TypeError):
+            render_key, rendered = None, None  # missing keys raise KeyError below, and unhashable values are not memoised
+        if rendered is None:
+            rendered = ''.join(part if isinstance(part, str) else str(part(data, printer_name)) for part in self.parts)
+            if render_key is not None:
+                if len(self.renders) >= RENDER_CACHE_SIZE:
+                    self.renders.clear()
+                self.renders[render_key] = rendered
+        return rendered
+
+
+@lru_cache(maxsize=1024)
+def compile_template(text: str) -> GcodeTemplate:
+    'return the compiled GcodeTemplate for a start_gcode or end_gcode string (each string is only parsed once)'
+    return GcodeTemplate(text)
@@ -1,52 +1,175 @@
 
 import json
 import os
+import hashlib
 from copy import deepcopy
+from collections import OrderedDict
+from functools import lru_cache
 from fullcontrol.gcode import Extruder, ManualGcode, Buildplate, Hotend, Fan
+from fullcontrol.gcode.gcode_templates import compile_template
 import fullcontrol.devices.community.singletool.base_settings as base_settings
 from importlib import import_module, resources
 
+# the default_initial_settings of all printers in a library (one python module per printer in the 'settings' directory)
+# are compiled into a single profile index file, so printer settings can be read without importing a module. the first
+# line of the index is a json object giving the byte offset and length of each printer's line and a hash of its settings
+# module, so only the requested printer is parsed. printers missing from the index (e.g. new settings modules) and
+# printers whose settings module has changed since the index was built (the hash is different) are imported from their
+# module as usual. rebuild the index after adding or editing settings modules: python bin/build_printer_profiles.py
+
+PROFILE_INDEX = 'profiles.jsonl'
+SETTINGS_CACHE_SIZE = 128  # number of resolved sets of printer settings (printer name + user overrides) kept in memory
+
+_settings_cache = OrderedDict()  # least-recently-used cache of resolved settings, see resolved_settings()
+
 
 def load_json(library, file_name):
     resource = resources.files('fullcontrol') / 'devices' / library / file_name
     with resource.open('r') as file:
         return json.load(file)
 
-def find_terms_in_brackets(input_string):
-    import re
-    ' find all terms in the start_gcode string contained within {} and split the terms if they are comma separated'
-    matches = re.findall(r'\{(.*?)\}', input_string)
-    split_matches = [item.split(',') for item in matches]
-    cleaned_matches = [[item.strip() for item in sublist]
-                       for sublist in split_matches]
-    cleaned_matches = [item for sublist in cleaned_matches for item in sublist]
-    return set(cleaned_matches)
+
+@lru_cache(maxsize=None)
+def load_library(library_name: str) -> dict:
+    'return the library.json mapping of printer names to settings modules (loaded once)'
+    return load_json(library_name, 'library.json')
+
+
+@lru_cache(maxsize=None)
+def load_profile_offsets(library_name: str) -> dict:
+    'return the offset, length and source hash of each settings module in the profile index of a library (empty if there is no index)'
+    resource = resources.files('fullcontrol') / 'devices' / library_name / PROFILE_INDEX
+    if not resource.is_file():
+        return {}
+    with resource.open('rb') as file:
+        return json.loads(file.readline())
+
+
+def settings_source_hash(library_name: str, module_name: str) -> str:
+    'return a hash of the source file of a settings module (None if the source file is not available)'
+    resource = resources.files('fullcontrol') / 'devices' / library_name / 'settings' / f'{module_name}.py'
+    if not resource.is_file():
+        return None
+    return hashlib.md5(resource.read_bytes()).hexdigest()
+
+
+def printer_profile(library_name: str, module_name: str) -> dict:
+    '''
+    Return a copy of the default_initial_settings for a printer, from the profile index if its record is up to date
+    with the settings module, otherwise from the settings module.
+
+    Args:
+        library_name (str): The library directory in fullcontrol/devices (e.g. 'cura').
+        module_name (str): The name of the settings module for the printer.
+
+    Returns:
+        dict: The default_initial_settings of the printer.
+    '''
+    offsets = load_profile_offsets(library_name)
+    if module_name in offsets and offsets[module_name][2] == settings_source_hash(library_name, module_name):
+        offset, length, _ = offsets[module_name]
+        resource = resources.files('fullcontrol') / 'devices' / library_name / PROFILE_INDEX
+        with resource.open('rb') as file:
+            file.seek(offset)
+            return json.loads(file.read(length))
+    return deepcopy(import_module(f'fullcontrol.devices.{library_name}.settings.{module_name}').default_initial_settings)
+
+
+def build_profile_index(library_name: str) -> list:
+    '''
+    Compile the default_initial_settings of all printers in a library into the library's profile index file.
+
+    Args:
+        library_name (str): The library directory in fullcontrol/devices (e.g. 'cura').
+
+    Returns:
+        list: The names of settings modules that could not be imported (these are not included in the index).
+    '''
+    lines, failed = [], []
+    for module_name in sorted(set(load_library(library_name).values())):
+        try:
+            settings = import_module(f'fullcontrol.devices.{library_name}.settings.{module_name}').default_initial_settings
+        except Exception:
+            failed.append(module_name)
+            continue
+        lines.append((module_name, (json.dumps(settings) + '\n').encode(), settings_source_hash(library_name, module_name)))
+    # the header gives offsets from the start of the file, so its length must be known before the offsets are set
+    header_length = 0
+    while True:
+        offsets, offset = {}, header_length
+        for module_name, line, source_hash in lines:
+            offsets[module_name] = [offset, len(line), source_hash]
+            offset += len(line)
+        header = (json.dumps(offsets) + '\n').encode()
+        if len(header) == header_length:
+            break
+        header_length = len(header)
+    with open(os.path.join(str(resources.files('fullcontrol') / 'devices' / library_name), PROFILE_INDEX), 'wb') as file:
+        file.write(header + b''.join(line for _, line, _ in lines))
+    load_profile_offsets.cache_clear()
+    return failed
 
 
 def replace_gcode_variables(printer_name: str, gcode_type: str, data: dict):
-    # 'data' is used during the eval process to replace variables in the gcode string
-    variables = find_terms_in_brackets(data[gcode_type])
-    if len(variables) > 0:
-        new_start_end_gcode = data[gcode_type]
-        for variable in variables:
-            new_start_end_gcode = new_start_end_gcode.replace('{' + variable + '}', str(eval(variable)))
-        data[gcode_type] = new_start_end_gcode
+    # expressions in {} in the gcode string are evaluated with 'data' (and printer_name) - see gcode_templates.py
+    data[gcode_type] = compile_template(data[gcode_type]).render(data, printer_name)
 
 
-def import_printer(printer_name: str, user_overrides: dict):
+def frozen(value):
+    'return a hashable equivalent of a value for use in cache keys (raises TypeError if this is not possible)'
+    if isinstance(value, dict):
+        return tuple((key, frozen(item)) for key, item in sorted(value.items()))
+    if isinstance(value, (list, tuple)):
+        return (type(value).__name__,) + tuple(frozen(item) for item in value)
+    hash(value)
+    return (type(value).__name__, value)
+
+
+def resolved_settings(printer_name: str, user_overrides: dict) -> dict:
+    '''
+    Return the printer settings combined with base settings and user overrides, with variables in start_gcode and
+    end_gcode replaced. Results are cached for each printer name and set of user overrides.
+
+    Args:
+        printer_name (str): The printer name, starting with 'Cura/' or 'Community/'.
+        user_overrides (dict): The initialization_data passed by the designer in GcodeControls.
+
+    Returns:
+        dict: The settings, including 'original_start_gcode' (before variables were replaced).
+    '''
+    try:
+        key = (printer_name, frozen(user_overrides))
+    except TypeError:
+        key = None  # overrides that cannot be hashed are not cached
+    if key in _settings_cache:
+        _settings_cache.move_to_end(key)
+        return deepcopy(_settings_cache[key])
+
     library_name = 'cura' if printer_name[:5] == 'Cura/' else 'community_minimal'
     printer_name = printer_name[5:] if library_name == 'cura' else printer_name[10:]
-    library = load_json(library_name, os.path.join('library.json'))
-    data = import_module(f'fullcontrol.devices.{library_name}.settings.{library[printer_name]}').default_initial_settings
+    library = load_library(library_name)
+    data = printer_profile(library_name, library[printer_name])
     if library_name == 'cura':
         data['print_speed'] = int(data['print_speed']*60)
         data['travel_speed'] = int(data['travel_speed']*60)
     data = {**base_settings.default_initial_settings, **data}
     data = {**data, **user_overrides}
-    original_start_gcode = deepcopy(data['start_gcode'])
+    data['original_start_gcode'] = deepcopy(data['start_gcode'])
     replace_gcode_variables(printer_name, 'start_gcode', data)
     replace_gcode_variables(printer_name, 'end_gcode', data)
-    
+
+    if key is not None:
+        _settings_cache[key] = deepcopy(data)
+        if len(_settings_cache) > SETTINGS_CACHE_SIZE:
+            _settings_cache.popitem(last=False)
+    return data
+
+
+def import_printer(printer_name: str, user_overrides: dict):
+    data = resolved_settings(printer_name, user_overrides)
+    original_start_gcode = data.pop('original_start_gcode')
+    printer_name = printer_name[5:] if printer_name[:5] == 'Cura/' else printer_name[10:]
+
     starting_procedure_steps = []
     starting_procedure_steps.append(ManualGcode(text=data['start_gcode']))
     starting_procedure_steps.append(ManualGcode(
@@ -0,0 +1,308 @@
+import re
+import numpy as np
+from itertools import chain
+from typing import Optional
+from pydantic import BaseModel
+from fullcontrol.gcode.formatting import format_number, DEFAULT_DECIMALS
+
+# the optimizer is an optional stage after gcode generation (see GcodeControls.optimize). it reads the lines of gcode
+# and tracks the position, feedrate and E value of the printer. consecutive G0/G1 lines without comments are collected
+# in batches, which are processed as arrays: F words that repeat the current feedrate, E words that do not change the
+# E value and moves that change nothing are removed, and consecutive extruding moves that lie on a straight line
+# (within the tolerance) with the same feedrate and flow (E per mm) are merged into one line. all other lines are
+# written unchanged, and positions are treated as unknown after lines that may change them in other ways (e.g. G28)
+
+DEFAULT_TOLERANCE = 0.001  # mm, the maximum distance of a merged point from the merged line
+FLOW_TOLERANCE = 0.05  # maximum relative difference between the flow (E per mm) of merged moves and their average
+BATCH_LINES = 10000  # maximum number of lines in each batch of moves
+
+
+class OptimizeReport(BaseModel):
+    '''
+    The number of lines and words removed from gcode by the optimizer (see GcodeControls.optimize).
+
+    Attributes:
+        lines_before (int): The number of lines of gcode before optimization.
+        lines_after (int): The number of lines of gcode after optimization.
+        merged_lines (int): The number of lines removed by merging collinear extruding moves.
+        zero_moves (int): The number of lines removed because they did not change the position, E value or feedrate.
+        f_words (int): The number of F words removed because they repeated the current feedrate.
+        e_words (int): The number of E words removed because they did not change the E value (e.g. 'E0' for travel).
+    '''
+    lines_before: Optional[int] = 0
+    lines_after: Optional[int] = 0
+    merged_lines: Optional[int] = 0
+    zero_moves: Optional[int] = 0
+    f_words: Optional[int] = 0
+    e_words: Optional[int] = 0
+
+    def __str__(self):
+        return f'gcode optimized: {self.lines_before} lines reduced to {self.lines_after} ({self.merged_lines} merged collinear moves, ' + \
+            f'{self.zero_moves} zero-length moves, {self.f_words} F words and {self.e_words} E words removed)'
+
+
+# G0/G1 lines that are optimized, with words in the order they are written by fullcontrol (other lines are unchanged).
+# it matches every line of a block of text, with empty groups for words that are not present and for other lines
+MOVE_LINES = re.compile(r'^(?:G([01])(?: F(-?\d*\.?\d+))?(?: X(-?\d*\.?\d+))?(?: Y(-?\d*\.?\d+))?(?: Z(-?\d*\.?\d+))?(?: E(-?\d*\.?\d+))?$|.*)', re.M)
+WORDS = 'FXYZE'  # letters of the numbers matched by MOVE_LINES, after the G number
+
+
+def forward_fill(values: np.ndarray, initial) -> np.ndarray:
+    'return values (1D or 2D) with nan replaced by the most recent value that is not nan (or initial, per column)'
+    values = values.reshape(len(values), -1)
+    latest = np.where(~np.isnan(values), np.arange(len(values))[:, None], -1)
+    np.maximum.accumulate(latest, axis=0, out=latest)
+    filled = np.take_along_axis(values, np.maximum(latest, 0), axis=0)
+    return np.where(latest >= 0, filled, np.asarray(initial, dtype=float).reshape(1, -1))
+
+
+def line_distances(points: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    'return the distance of each point from the straight line through the corresponding start and end'
+    chords = ends - starts
+    chord_lengths = np.sqrt(np.einsum('ij,ij->i', chords, chords))
+    offsets = points - starts
+    crosses = np.cross(offsets, chords)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        distances = np.sqrt(np.einsum('ij,ij->i', crosses, crosses)) / chord_lengths
+    return np.where(chord_lengths > 0, distances, np.sqrt(np.einsum('ij,ij->i', offsets, offsets)))
+
+
+def span_fits(vertices: np.ndarray, e_values: np.ndarray, lengths: np.ndarray, tolerance: float) -> int:
+    '''
+    Check whether a sequence of moves can be merged into one move.
+
+    Args:
+        vertices (np.ndarray): The positions at the start of the first move and the end of each move, shape (m+1, 3).
+        e_values (np.ndarray): The E value (change) of each move.
+        lengths (np.ndarray): The length of each move.
+        tolerance (float): The maximum distance of a vertex from the merged line.
+
+    Returns:
+        int: 0 if the moves can be merged, otherwise the index of the vertex at which to split them.
+    '''
+    interior = vertices[1:-1]
+    distances = line_distances(interior, vertices[:1], vertices[-1:])
+    worst = int(np.argmax(distances))
+    if distances[worst] > tolerance:
+        return worst + 1
+    flows = e_values / lengths
+    deviations = np.abs(flows - e_values.sum()/lengths.sum())
+    worst = int(np.argmax(deviations))
+    if deviations[worst] > FLOW_TOLERANCE * flows[worst]:
+        return worst if worst > 0 else 1
+    return 0
+
+
+class GcodeOptimizer:
+    '''
+    Optimize lines of gcode (see the comment at the top of optimize.py), keeping track of the printer's position,
+    feedrate and E value from one call of lines() to the next.
+
+    Args:
+        tolerance (float, optional): The maximum distance (mm) of a merged point from the merged line. Defaults to
+            DEFAULT_TOLERANCE.
+        report (OptimizeReport, optional): The report to update with the number of lines and words removed.
+            Defaults to a new OptimizeReport.
+        e_decimals (int, optional): The number of decimal places of E values (see NumberFormat), used for the E values
+            of merged moves with relative extrusion. Defaults to DEFAULT_DECIMALS['E'].
+    '''
+
+    def __init__(self, tolerance: float = None, report: OptimizeReport = None, e_decimals: int = None):
+        self.tolerance = DEFAULT_TOLERANCE if tolerance is None else tolerance
+        self.report = OptimizeReport() if report is None else report
+        self.e_decimals = DEFAULT_DECIMALS['E'] if e_decimals is None else e_decimals
+        self.position = np.full(3, np.nan)  # nan for unknown values
+        self.feedrate = np.nan
+        self.e = 0.0  # the E value for absolute extrusion
+        self.relative_e = False
+        self.relative_xyz = False
+
+    def lines(self, lines: list) -> list:
+        'return the optimized lines of gcode'
+        # the words of all lines are found with one regex search of the text, and all numbers are converted to floats
+        # in one call, with nan for empty groups (words that are not present, and lines that are not G0/G1 moves)
+        groups = MOVE_LINES.findall('\n'.join(lines))
+        text = (',' + ','.join(chain.from_iterable(groups)) + ',').replace(',,', ',nan,').replace(',,', ',nan,')
+        numbers = np.fromstring(text[1:-1], sep=',').reshape(-1, 6)  # G F X Y Z E
+        # lines with only 'G0' or 'G1' are not optimized
+        move_lines = ~np.isnan(numbers[:, 0]) & ~np.isnan(numbers[:, 1:]).all(axis=1)
+        result = []
+        bounds = np.concatenate(([0], np.flatnonzero(move_lines[1:] != move_lines[:-1]) + 1, [len(lines)])).tolist()
+        for start, end in zip(bounds[:-1], bounds[1:]):
+            # moves with relative coordinates (G91) are not optimized
+            if move_lines[start] and not self.relative_xyz:
+                for batch_start in range(start, end, BATCH_LINES):
+                    batch = slice(batch_start, min(batch_start + BATCH_LINES, end))
+                    result.extend(self.moves(lines[batch], groups[batch], numbers[batch]))
+            else:
+                for line in lines[start:end]:
+                    self.track(line)
+                result.extend(lines[start:end])
+        self.report.lines_before += len(lines)
+        self.report.lines_after += len(result)
+        return result
+
+    def track(self, line: str):
+        'update the position, feedrate and E value for a line of gcode that is not optimized'
+        command = line.split(';')[0].split()
+        if len(command) == 0:
+            return
+        code, words = command[0].upper(), command[1:]
+        values = {}
+        for word in words:
+            try:
+                values[word[0].upper()] = float(word[1:])
+            except (ValueError, IndexError):
+                pass
+        if code in ('G0', 'G1', 'G2', 'G3'):
+            if 'F' in values:
+                self.feedrate = values['F']
+            if self.relative_xyz or code in ('G2', 'G3'):
+                self.position[:] = np.nan
+            else:
+                for axis, letter in enumerate('XYZ'):
+                    if letter in values:
+                        self.position[axis] = values[letter]
+            if 'E' in values and not self.relative_e:
+                self.e = values['E']
+        elif code == 'G90':
+            self.relative_xyz = False
+        elif code == 'G91':
+            self.relative_xyz = True
+        elif code == 'M82':
+            self.relative_e = False
+        elif code == 'M83':
+            self.relative_e = True
+        elif code == 'G92':
+            for axis, letter in enumerate('XYZ'):
+                if letter in values or len(values) == 0:
+                    self.position[axis] = values.get(letter, 0)
+            if 'E' in values or len(values) == 0:
+                self.e = values.get('E', 0)
+        elif code == 'G28' or code.startswith('T'):
+            self.position[:] = np.nan
+
+    def moves(self, lines: list, groups: list, numbers: np.ndarray) -> list:
+        'return the optimized lines for a batch of consecutive G0/G1 lines, with their groups of MOVE_LINES and numbers (see lines())'
+        g1 = numbers[:, 0] == 1
+        values = numbers[:, [2, 3, 4, 5, 1]]  # X Y Z E F
+        ends = forward_fill(values[:, 0:3], self.position)
+        starts = np.vstack((self.position, ends[:-1]))
+        feedrates = values[:, 4]
+        filled_feedrates = forward_fill(feedrates, self.feedrate)[:, 0]
+        previous_feedrates = np.concatenate(([self.feedrate], filled_feedrates[:-1]))
+        new_f = ~np.isnan(feedrates) & (feedrates != previous_feedrates)
+        redundant_f = ~np.isnan(feedrates) & (feedrates == previous_feedrates)
+        has_e = ~np.isnan(values[:, 3])
+        if self.relative_e:
+            e_values = np.where(has_e, values[:, 3], 0)
+        else:
+            e_totals = forward_fill(values[:, 3], self.e)[:, 0]
+            e_values = e_totals - np.concatenate(([self.e], e_totals[:-1]))
+        deltas = ends - starts
+        moved = ~(deltas == 0).all(axis=1)  # nan values (unknown positions) count as moves
+        zero = ~moved & (e_values == 0) & ~new_f
+        redundant_e = has_e & (e_values == 0) & ~zero
+        lengths = np.sqrt(np.einsum('ij,ij->i', deltas, deltas))
+        extruding = g1 & moved & ~np.isnan(lengths) & (e_values > 0)
+
+        # consecutive lines that are kept (zero-length moves are removed) may be merged
+        kept = np.flatnonzero(~zero)
+        a, b = kept[:-1], kept[1:]
+        joinable = extruding[a] & extruding[b] & ~new_f[b]
+        if joinable.any():
+            vertices, before, after = ends[a], starts[a], ends[b]
+            with np.errstate(divide='ignore', invalid='ignore'):
+                flows = e_values / lengths
+                joinable &= (line_distances(vertices, before, after) <= self.tolerance) \
+                    & (np.einsum('ij,ij->i', vertices - before, after - vertices) > 0) \
+                    & (np.abs(flows[b] - flows[a]) <= FLOW_TOLERANCE*flows[a])
+        # spans of kept lines (indices into kept) that are written as one line
+        span_starts = np.flatnonzero(np.concatenate(([True], ~joinable)))
+        span_ends = np.concatenate((span_starts[1:], [len(kept)])) - 1
+        spans = []
+        for first, last in zip(span_starts.tolist(), span_ends.tolist()):
+            if first == last:
+                spans.append((kept[first], kept[first]))
+            else:
+                spans.extend(self.split_span(kept[first:last + 1], starts, ends, e_values, lengths))
+
+        report = self.report
+        report.zero_moves += int(zero.sum())
+        report.f_words += int(redundant_f[~zero].sum())
+        report.e_words += int(redundant_e.sum())
+        result = []
+        for first, last in spans:
+            if first == last:
+                if redundant_f[first] or redundant_e[first]:
+                    removed = ('F' if redundant_f[first] else '') + ('E' if redundant_e[first] else '')
+                    result.append(f'G{groups[first][0]} ' + ' '.join(letter + number for letter, number in zip(WORDS, groups[first][1:])
+                                                                      if number != '' and letter not in removed))
+                else:
+                    result.append(lines[first])
+            else:
+                report.merged_lines += int(np.count_nonzero(~zero[first:last + 1])) - 1
+                result.append(self.merged_line(groups, first, last, starts, ends, e_values, new_f))
+
+        self.position = ends[-1].copy()
+        self.feedrate = float(filled_feedrates[-1])
+        if not self.relative_e:
+            self.e = float(e_totals[-1])
+        return result
+
+    def split_span(self, lines: np.ndarray, starts, ends, e_values, lengths) -> list:
+        'return (first, last) line indices for the parts of a span of joinable lines, split where they do not fit one line'
+        vertices = np.vstack((starts[lines[:1]], ends[lines]))
+        e_values, lengths = e_values[lines], lengths[lines]
+        splits, pending = [0, len(lines)], [(0, len(lines))]
+        while len(pending) > 0:
+            first, last = pending.pop()  # vertex indices
+            if last - first < 2:
+                continue
+            split = span_fits(vertices[first:last + 1], e_values[first:last], lengths[first:last], self.tolerance)
+            if split > 0:
+                splits.append(first + split)
+                pending.extend([(first, first + split), (first + split, last)])
+        splits = sorted(splits)
+        return [(int(lines[first]), int(lines[last - 1])) for first, last in zip(splits[:-1], splits[1:])]
+
+    def merged_line(self, groups: list, first: int, last: int, starts, ends, e_values, new_f) -> str:
+        'return the line of gcode for extruding moves from line first to line last, merged into one move'
+        words = []
+        if new_f[first]:
+            words.append('F' + groups[first][1])
+        for axis, letter in enumerate('XYZ'):
+            if ends[last, axis] != starts[first, axis]:
+                # the number is taken from the last line that includes the axis, so the value is written as before
+                words.append(letter + next(groups[i][axis + 2] for i in range(last, first - 1, -1) if groups[i][axis + 2] != ''))
+        if self.relative_e:
+            words.append('E' + format_number(float(e_values[first:last + 1].sum()), self.e_decimals))
+        else:
+            words.append('E' + groups[last][5])
+        return 'G1 ' + ' '.join(words)
+
+
+def optimize_chunks(chunks, tolerance: float = None, report: OptimizeReport = None, show_report: bool = False, e_decimals: int = None):
+    '''
+    Optimize chunks of gcode (see gcode_chunks()) as they are generated.
+
+    Args:
+        chunks (generator): Chunks of gcode. Chunks after the first begin with a newline.
+        tolerance (float, optional): See GcodeOptimizer. Defaults to DEFAULT_TOLERANCE.
+        report (OptimizeReport, optional): The report to update as chunks are optimized. Defaults to None.
+        show_report (bool, optional): Whether to print the report after the last chunk. Defaults to False.
+        e_decimals (int, optional): See GcodeOptimizer. Defaults to DEFAULT_DECIMALS['E'].
+
+    Yields:
+        str: Chunks of optimized gcode. Joining all chunks with ''.join() gives the full gcode.
+    '''
+    optimizer = GcodeOptimizer(tolerance, report, e_decimals)
+    first, separator = True, ''
+    for chunk in chunks:
+        lines = optimizer.lines((chunk if first else chunk[1:]).split('\n'))
+        first = False
+        if len(lines) > 0:
+            yield separator + '\n'.join(lines)
+            separator = '\n'
+    if show_report:
+        print(optimizer.report)
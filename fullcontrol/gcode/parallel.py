@@ -0,0 +1,230 @@
+import multiprocessing
+import numpy as np
+from copy import copy
+from math import nan
+from fullcontrol.gcode.state import State
+from fullcontrol.gcode.controls import GcodeControls
+from fullcontrol.gcode.point_array import PointArray
+from fullcontrol.gcode.point_runs import point_run_end, run_arrays, run_moves, run_position
+from fullcontrol.step_source import StepSource
+
+# gcode is generated in parallel by splitting state.steps into sections, which are processed in separate
+# processes. each process needs the state (extruder volume, current point, speed, etc.) at the start of its
+# section. a quick pre-pass in the main process updates the state for each step other than Points, and only the
+# position (state.point) for runs of Points, and saves a copy of the state at the start of each section. only the
+# parts of the state that steps change are copied. runs of Points are replaced by equivalent PointArrays, which are
+# much quicker to send to another process. the extrusion volume at the start of a section depends on the length of
+# every earlier move, so worker processes first calculate the volume added by each move in their section, which the
+# main process adds up in order, as one process would, so the total volume at the start of each section is exact.
+# worker processes then generate the gcode for each section, which is joined in order, so the result is identical
+# to gcode generated by one process
+
+SECTIONS_PER_PROCESS = 4  # more sections than processes so that processes finishing early can start another section
+MIN_SECTION_STEPS = 20000  # smaller sections are not worth the overhead of sending them to another process
+
+
+def section_starts(n_steps: int, processes: int) -> list:
+    '''
+    Return the index of the first step in each section of state.steps.
+
+    Args:
+        n_steps (int): The number of steps.
+        processes (int): The number of processes.
+
+    Returns:
+        list: The start index of each section (a single section starting at 0 if there are too few steps to split).
+    '''
+    sections = max(1, min(processes * SECTIONS_PER_PROCESS, n_steps // MIN_SECTION_STEPS))
+    return [n_steps * i // sections for i in range(sections)]
+
+
+def state_snapshot(state: State) -> State:
+    '''
+    Return a copy of state without its steps and gcode.
+
+    Steps replace attributes of the extruder, printer, extrusion geometry and current point (they do not modify
+    lists or dicts in place), so shallow copies of these objects are enough. number_format is not changed by
+    steps and is shared.
+    '''
+    snapshot = copy(state)
+    snapshot.steps, snapshot.gcode = None, None
+    for name in ['extruder', 'printer', 'extrusion_geometry', 'point']:
+        setattr(snapshot, name, copy(getattr(state, name)))
+    return snapshot
+
+
+def prepare_sections(state: State, starts: list) -> list:
+    '''
+    Update state for all steps up to the start of the last section, without calculating extrusion volumes or
+    formatting gcode, and return the state at the start of each section with the steps of that section.
+
+    Runs of Points are replaced by an equivalent PointArray (the x y z array is already extracted to update the
+    position), since an array is much quicker to send to another process than a list of Points. The extrusion volume
+    (extruder.total_volume and total_volume_ref) is not updated, so it is only correct in the state of the first
+    section (see section_volumes).
+
+    Args:
+        state (State): The state object, with state.i = 0. It is updated by this function.
+        starts (list): The index of the first step in each section.
+
+    Returns:
+        list: (state, steps) for each section.
+    '''
+    steps = state.steps
+    ends = starts[1:] + [len(steps)]
+    sections = []
+    state.gcode = ['']  # gcode lines are discarded, but some steps modify the previous line (e.g. GcodeComment)
+    for start, end in zip(starts, ends):
+        sections.append((state_snapshot(state), []))
+        section_steps = sections[-1][1]
+        update = end < len(steps)  # the state after the last section is not needed
+        i = start
+        while i < end:
+            run_end = point_run_end(steps, i, end - i)
+            if run_end > i:
+                xyz, defined, nan_row = run_arrays(steps[i:run_end])
+                if nan_row is None:
+                    if update:
+                        run_position(xyz, defined, state)
+                    section_steps.append(PointArray(xyz=np.where(defined, xyz, np.nan)))
+                else:
+                    # nan values cannot be distinguished from None in a PointArray
+                    if update:
+                        for point in steps[i:run_end]:
+                            point.gcode(state)
+                    section_steps.extend(steps[i:run_end])
+                i = run_end
+                continue
+            step = steps[i]
+            if update:
+                if type(step).gcode is PointArray.gcode:
+                    # see PointArray.gcode
+                    defined = ~np.isnan(step.xyz)
+                    if len(step.xyz) > 0:
+                        run_position(np.where(defined, step.xyz, 0), defined, state)
+                else:
+                    step.gcode(state)
+                    del state.gcode[:-1]
+            section_steps.append(step)
+            i += 1
+    return sections
+
+
+def section_volumes(section: tuple) -> tuple:
+    '''
+    Calculate the extrusion volume added by each move (or other step) in a section of steps, in order (called in a
+    worker process).
+
+    The volumes do not depend on the total volume at the start of the section, so they are calculated before it is
+    known. Adding them to the total volume in order gives exactly the same totals as generating gcode for the steps.
+
+    Args:
+        section (tuple): (state, steps) for the section (see prepare_sections).
+
+    Returns:
+        tuple: (volumes, ref_count). volumes is an array of the volumes added to extruder.total_volume, in order, and
+        ref_count is the number of them added before extruder.total_volume_ref was last set to extruder.total_volume
+        (None if it is not set in this section).
+    '''
+    state, steps = section
+    extruder = state.extruder
+    state.gcode = ['']
+    volume_log = []  # (volumes, ref_count) for each step (see run_moves)
+    for step in steps:
+        if type(step).gcode is PointArray.gcode:
+            defined = ~np.isnan(step.xyz)
+            if len(step.xyz) > 0:
+                run_moves(np.where(defined, step.xyz, 0), defined, state, volume_log)
+        else:
+            # other steps add at most one volume (e.g. StationaryExtrusion, or a Point processed one at a time), which
+            # is found by starting from zero. total_volume_ref is set to nan to find whether the step sets it
+            extruder.total_volume, extruder.total_volume_ref = 0.0, nan
+            step.gcode(state)
+            del state.gcode[:-1]
+            ref_set = extruder.total_volume_ref == extruder.total_volume_ref
+            if extruder.total_volume != 0 or ref_set:
+                volume_log.append((np.array([extruder.total_volume]), 1 if ref_set else None))
+    count, ref_count = 0, None
+    for volumes, step_ref_count in volume_log:
+        if step_ref_count is not None:
+            ref_count = count + step_ref_count
+        count += len(volumes)
+    return np.concatenate([volumes for volumes, _ in volume_log]) if len(volume_log) > 0 else np.zeros(0), ref_count
+
+
+def set_section_volumes(sections: list, volumes: list):
+    '''
+    Set the extrusion volume at the start of each section from the state at the start of the first section and the
+    volumes added in each section (see section_volumes), by adding the volumes in order as one process would.
+
+    Args:
+        sections (list): (state, steps) for each section (see prepare_sections). The states are updated.
+        volumes (list): (volumes, ref_count) for each section except the last.
+    '''
+    extruder = sections[0][0].extruder
+    total, ref = extruder.total_volume, extruder.total_volume_ref
+    for (state, _), (section_volumes, ref_count) in zip(sections[1:], volumes):
+        totals = np.cumsum(np.concatenate(([total], section_volumes)))
+        if ref_count is not None:
+            ref = float(totals[ref_count])
+        total = float(totals[-1])
+        state.extruder.total_volume, state.extruder.total_volume_ref = total, ref
+
+
+def gcode_section(section: tuple) -> tuple:
+    '''
+    Generate gcode for a section of steps (called in a worker process).
+
+    Args:
+        section (tuple): (state, start, steps, columnar). state is the State at the start of the section, start is
+            the index of its first step in the full list of steps and steps is the list of steps in this section (see
+            prepare_sections).
+
+    Returns:
+        tuple: (edit, gcode). edit is text to add to the end of the last line of gcode of previous sections (e.g. from
+        GcodeComment) and gcode is the gcode string for this section.
+    '''
+    from fullcontrol.gcode.steps2gcode import gcode_next
+    state, start, steps, columnar = section
+    state.steps, state.i = StepSource(steps), start
+    state.gcode = ['']  # represents the last line of previous sections
+    while gcode_next(state, columnar):
+        pass
+    return state.gcode[0], '\n'.join(state.gcode[1:])
+
+
+def parallel_gcode_chunks(state: State, gcode_controls: GcodeControls):
+    '''
+    Generate gcode from state.steps in parallel in gcode_controls.processes processes.
+
+    Args:
+        state (State): The initialized state object, with state.i = 0. state.gcode contains the lines of gcode for any
+            previous steps (e.g. the starting procedure, see GcodeSession).
+        gcode_controls (GcodeControls): An instance of GcodeControls class.
+
+    Yields:
+        str: Chunks of gcode (one for each section of steps). Joining all chunks with ''.join() gives the same
+        string as gcode generated by one process.
+    '''
+    starts = section_starts(len(state.steps), gcode_controls.processes)
+    previous_gcode = '\n'.join(state.gcode)
+    sections = prepare_sections(state, starts)
+    # fork (where available) starts processes without importing the designer's script again
+    fork = 'fork' in multiprocessing.get_all_start_methods()
+    with multiprocessing.get_context('fork' if fork else None).Pool(gcode_controls.processes) as pool:
+        # the volumes added in the last section are not needed
+        set_section_volumes(sections, pool.map(section_volumes, sections[:-1]))
+        sections = [(snapshot, start, steps, gcode_controls.columnar) for start, (snapshot, steps) in zip(starts, sections)]
+        # gcode for each section is held back until the next section is complete, since it may edit the last line
+        pending, separator = previous_gcode, ''
+        for edit, gcode in pool.imap(gcode_section, sections):
+            if pending != '':
+                pending += edit
+            if gcode != '':
+                if pending != '':
+                    yield separator + pending
+                    separator = '\n'
+                pending = gcode
+        if pending != '':
+            yield separator + pending
+
@@ -1,28 +1,40 @@
 from typing import Optional
 from fullcontrol.common import Point as BasePoint
+from fullcontrol.gcode.formatting import NumberFormat, DEFAULT_FORMAT
 
 
 class Point(BasePoint):
     'Extend generic class with gcode methods to convert the object to gcode'
 
-    def XYZ_gcode(self, p) -> float:
+    def XYZ_gcode(self, p, number_format: NumberFormat = DEFAULT_FORMAT) -> float:
         '''
         Generate XYZ gcode string to move from a point p to this point.
 
         Args:
             p (Point): The point to move from.
+            number_format (NumberFormat, optional): The number of decimal places for each axis. Defaults to DEFAULT_FORMAT.
 
         Returns:
             str: The XYZ gcode string.
 
         '''
+        if number_format.quantize:
+            # values are compared after rounding to the number of decimal places written to gcode
+            x_changed = self.x != None and number_format.changed('X', self.x, p.x)
+            y_changed = self.y != None and number_format.changed('Y', self.y, p.y)
+            z_changed = self.z != None and number_format.changed('Z', self.z, p.z)
+        else:
+            x_changed = self.x != None and self.x != p.x
+            y_changed = self.y != None and self.y != p.y
+            z_changed = self.z != None and self.z != p.z
         s = ''
-        if self.x != None and self.x != p.x:
-            s += f'X{self.x:.6f}'.rstrip('0').rstrip('.') + ' '
-        if self.y != None and self.y != p.y:
-            s += f'Y{self.y:.6f}'.rstrip('0').rstrip('.') + ' '
-        if self.z != None and self.z != p.z:
-            s += f'Z{self.z:.6f}'.rstrip('0').rstrip('.') + ' '
+        templates = number_format.templates
+        if x_changed:
+            s += (templates['X'] % self.x).rstrip('0').rstrip('.') + ' '
+        if y_changed:
+            s += (templates['Y'] % self.y).rstrip('0').rstrip('.') + ' '
+        if z_changed:
+            s += (templates['Z'] % self.z).rstrip('0').rstrip('.') + ' '
         return s if s != '' else None
 
     def gcode(self, state):
@@ -36,7 +48,7 @@ class Point(BasePoint):
             str: The generated line of gcode.
 
         '''
-        XYZ_str = self.XYZ_gcode(state.point)
+        XYZ_str = self.XYZ_gcode(state.point, state.number_format)
         if XYZ_str != None:  # only write a line of gcode if movement occurs
             G_str = 'G1 ' if state.extruder.on or state.extruder.travel_format == "G1_E0" else 'G0 '
             F_str = state.printer.f_gcode(state)
@@ -45,3 +57,7 @@ class Point(BasePoint):
             state.printer.speed_changed = False
             state.point.update_from(self)
             return gcode_str.strip()  # strip the final space
+        elif state.number_format.quantize:
+            # the move is too short to change the gcode position, but the extrusion volume is carried forward to the next line
+            state.extruder.carry_volume(self, state)
+            state.point.update_from(self)
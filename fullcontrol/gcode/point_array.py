@@ -0,0 +1,28 @@
+from typing import ClassVar
+from fullcontrol.point_array import PointArray as BasePointArray
+from fullcontrol.gcode.point import Point
+
+
+class PointArray(BasePointArray):
+    'Extend generic class with gcode method to convert the object to gcode'
+    point_class: ClassVar[type] = Point
+
+    def gcode(self, state):
+        '''
+        Process this instance in a list of steps supplied by the designer to generate and return lines of gcode.
+
+        The gcode is identical to that generated by the equivalent list of Points, but all rows of the array are
+        processed at once.
+
+        Args:
+            state (State): The state object containing printer and extruder information.
+
+        Returns:
+            str: The generated lines of gcode (separated by new lines), or None if no movement occurs.
+        '''
+        import numpy as np
+        from fullcontrol.gcode.point_runs import gcode_xyz_run
+        defined = ~np.isnan(self.xyz)
+        gcode_lines = gcode_xyz_run(np.where(defined, self.xyz, 0), defined, state)
+        if len(gcode_lines) > 0:
+            return '\n'.join(gcode_lines)
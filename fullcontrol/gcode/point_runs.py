@@ -0,0 +1,308 @@
+import numpy as np
+from itertools import chain
+from operator import attrgetter
+from fullcontrol.gcode.point import Point
+from fullcontrol.gcode.array_formatting import format_lines, round_xyz
+
+# runs of consecutive Points are converted to gcode as arrays rather than one Point at a time. the
+# output must be identical to Point.gcode(), so the same float operations are carried out in the
+# same order (e.g. cumulative extrusion volume is accumulated sequentially with np.cumsum)
+
+MIN_RUN_LENGTH = 8  # shorter runs are quicker to process one step at a time
+MAX_RUN_LENGTH = 50000  # limit the size of arrays (and lists of gcode lines) created for each run
+RUN_CHECK_BLOCK = 256  # number of steps whose types are checked together in point_run_end()
+
+_run_types = {}  # cache of whether each step class can be processed in a run of Points
+# Python's ** (pow from the C library) can differ in the last bit from numpy's square and sqrt, so the lengths of moves
+# are calculated with the same operation as distance_forgiving() in extrusion_classes.py, applied to each element
+_pow = np.frompyfunc(pow, 2, 1)
+_xyz = attrgetter('x', 'y', 'z')
+
+
+def is_run_point(step) -> bool:
+    '''Return True if the step is a Point that generates gcode with the standard Point methods.
+
+    Subclasses that override gcode() or XYZ_gcode() are processed one step at a time.
+    '''
+    return is_run_point_type(type(step))
+
+
+def is_run_point_type(step_type: type) -> bool:
+    'return True if steps of this class can be processed in a run of Points (see is_run_point)'
+    result = _run_types.get(step_type)
+    if result is None:
+        result = getattr(step_type, 'gcode', None) is Point.gcode and getattr(step_type, 'XYZ_gcode', None) is Point.XYZ_gcode
+        _run_types[step_type] = result
+    return result
+
+
+def point_run_end(steps: list, start: int, max_length: int = MAX_RUN_LENGTH) -> int:
+    '''Return the index after the last Point in the run of consecutive Points beginning at steps[start].
+
+    Args:
+        steps (list): The list of steps.
+        start (int): The index of the first step in the run.
+        max_length (int, optional): The maximum number of Points in the run. Defaults to MAX_RUN_LENGTH.
+
+    Returns:
+        int: The index after the end of the run (equal to start if steps[start] is not a Point).
+    '''
+    end = start
+    limit = min(len(steps), start + max_length)
+    while end < limit:
+        # the types of steps are checked in blocks, since a run of Points usually contains one or two types
+        block_types = list(map(type, steps[end:min(end + RUN_CHECK_BLOCK, limit)]))
+        other_types = [step_type for step_type in set(block_types) if not is_run_point_type(step_type)]
+        if len(other_types) > 0:
+            return end + min(block_types.index(step_type) for step_type in other_types)
+        end += len(block_types)
+    return end
+
+
+def run_arrays(points: list) -> tuple:
+    '''Extract x y z values for a run of Points.
+
+    Args:
+        points (list): A list of Points.
+
+    Returns:
+        tuple: (xyz, defined, nan_row). xyz and defined are arrays with shape (n, 3), where undefined
+        (None) values have xyz=0 and defined=False. nan_row is the index of the first Point with a nan
+        value (None if there are no nan values), since nan cannot be distinguished from None in arrays.
+    '''
+    # a flat list converts to an array much faster than a list of tuples
+    xyz = np.array(list(chain.from_iterable(map(_xyz, points))), dtype=float).reshape(-1, 3)
+    undefined = np.isnan(xyz)
+    nan_row = None
+    if undefined.any():
+        for i, j in zip(*np.nonzero(undefined)):
+            if getattr(points[i], 'xyz'[j]) is not None:
+                nan_row = int(i)
+                break
+        xyz[undefined] = 0
+    return xyz, ~undefined, nan_row
+
+
+def previous_positions(xyz: np.ndarray, defined: np.ndarray, state) -> tuple:
+    '''Return the x y z values tracked in state.point before each point in a run.
+
+    Args:
+        xyz (np.ndarray): x y z values for the run (see run_arrays).
+        defined (np.ndarray): Boolean array of which x y z values are defined (not None).
+        state (State): The state object, with state.point the position before the run.
+
+    Returns:
+        tuple: (prev, prev_defined), arrays with the same shape as xyz. Undefined values have prev=0.
+    '''
+    prev = np.empty_like(xyz)
+    prev_defined = np.empty_like(defined)
+    for axis, attr in enumerate('xyz'):
+        value = getattr(state.point, attr)
+        prev[0, axis] = 0 if value is None else value
+        prev_defined[0, axis] = value is not None
+    # forward-fill the most recent defined value for each axis
+    last_defined = np.where(defined, np.arange(len(xyz))[:, None], -1)
+    np.maximum.accumulate(last_defined, axis=0, out=last_defined)
+    filled = np.take_along_axis(xyz, np.maximum(last_defined, 0), axis=0)
+    filled_defined = last_defined >= 0
+    prev[1:] = np.where(filled_defined[:-1], filled[:-1], prev[:1])
+    prev_defined[1:] = filled_defined[:-1] | prev_defined[:1]
+    return prev, prev_defined
+
+
+def move_lengths(deltas: np.ndarray) -> np.ndarray:
+    'return the length of each move from its x y z deltas, identical to distance_forgiving() in extrusion_classes.py'
+    squares = _pow(deltas[:, 0], 2) + _pow(deltas[:, 1], 2) + _pow(deltas[:, 2], 2)
+    return _pow(squares, 0.5).astype(float)
+
+
+def run_changes(xyz: np.ndarray, defined: np.ndarray, state) -> tuple:
+    '''Return the position before each Point in a run and which axes change for each Point (see Point.XYZ_gcode).
+
+    Args:
+        xyz (np.ndarray): x y z values for the run (see run_arrays).
+        defined (np.ndarray): Boolean array of which x y z values are defined (not None).
+        state (State): The state object, with state.point the position before the run.
+
+    Returns:
+        tuple: (prev, prev_defined, changed). prev and prev_defined are given by previous_positions() and changed is
+        a boolean array with the same shape as xyz.
+    '''
+    prev, prev_defined = previous_positions(xyz, defined, state)
+    if state.number_format.quantize:
+        # see NumberFormat.quantize
+        decimals = state.number_format.decimals
+        changed = defined & ((round_xyz(xyz, decimals) != round_xyz(prev, decimals)) | ~prev_defined)
+    else:
+        changed = defined & ((xyz != prev) | ~prev_defined)
+    return prev, prev_defined, changed
+
+
+def update_run_position(xyz: np.ndarray, defined: np.ndarray, rows: np.ndarray, state):
+    '''Update state.point and state.printer.speed_changed after a run of Points, as Point.gcode() does for each Point.
+
+    Args:
+        xyz (np.ndarray): x y z values for the run (see run_arrays).
+        defined (np.ndarray): Boolean array of which x y z values are defined (not None).
+        rows (np.ndarray): The indices of Points that generate a line of gcode.
+        state (State): The state object.
+    '''
+    quantize = state.number_format.quantize
+    if len(rows) > 0:
+        state.printer.speed_changed = False
+    if len(rows) > 0 or quantize:
+        # each axis of state.point takes the value from the last line of gcode with that axis defined (or from the last
+        # Point with that axis defined if quantizing, since Points that are not written to gcode also update state.point)
+        if quantize:
+            written = defined
+        else:
+            written = np.zeros_like(defined)
+            written[rows] = defined[rows]
+        for axis, attr in enumerate('xyz'):
+            last = np.nonzero(written[:, axis])[0]
+            if len(last) > 0:
+                setattr(state.point, attr, float(xyz[last[-1], axis]))
+
+
+def run_position(xyz: np.ndarray, defined: np.ndarray, state):
+    '''Update state.point and state.printer.speed_changed for a run of Points without calculating extrusion.
+
+    Args:
+        xyz (np.ndarray): x y z values for the run (see run_arrays).
+        defined (np.ndarray): Boolean array of which x y z values are defined (not None).
+        state (State): The state object.
+    '''
+    quantize = state.number_format.quantize
+    first_written = run_changes(xyz[:1], defined[:1], state)[2].any()
+    if (state.printer.speed_changed and not first_written) or (not quantize and (np.signbit(xyz) & (xyz == 0)).any()):
+        changed = run_changes(xyz, defined, state)[2]
+        update_run_position(xyz, defined, np.nonzero(changed.any(axis=1))[0], state)
+        return
+    # the x y z values of Points that are not written to gcode are equal to those in state.point (see run_changes), so
+    # each axis of state.point takes the last defined value in the run (-0.0 is equal to 0.0 but is checked above)
+    if first_written:
+        state.printer.speed_changed = False
+    for axis, attr in enumerate('xyz'):
+        last = np.nonzero(defined[:, axis])[0]
+        if len(last) > 0:
+            setattr(state.point, attr, float(xyz[last[-1], axis]))
+
+
+def run_moves(xyz: np.ndarray, defined: np.ndarray, state, volume_log: list = None) -> tuple:
+    '''Calculate which axes change for each Point in a run and the E values for each line of gcode.
+
+    state.point, state.extruder and state.printer are updated as if Point.gcode() had been called for
+    every Point in the run.
+
+    Args:
+        xyz (np.ndarray): x y z values for the run (see run_arrays).
+        defined (np.ndarray): Boolean array of which x y z values are defined (not None).
+        state (State): The state object containing printer and extruder information.
+        volume_log (list, optional): If given, (volumes, ref_count) is appended to it, where volumes is the array of
+            volumes added to extruder.total_volume, in order, and ref_count is the number of them added before
+            extruder.total_volume_ref is set to extruder.total_volume (None if it is not set). See gcode/parallel.py.
+
+    Returns:
+        tuple: (rows, changed, e_values). rows are the indices of Points that generate a line of gcode,
+        changed is a boolean array (len(rows), 3) of the axes written to each of those lines, and e_values
+        is an array of E values for those lines (None if the travel format does not require E values).
+    '''
+    prev, prev_defined, changed = run_changes(xyz, defined, state)
+    rows = np.nonzero(changed.any(axis=1))[0]
+    changed = changed[rows]
+
+    extruder = state.extruder
+    e_values = None
+    if extruder.on or extruder.travel_format == 'G1_E0':
+        # if quantizing, Points that are not written to gcode still add extrusion volume (see Extruder.carry_volume)
+        moves = np.arange(len(xyz)) if state.number_format.quantize and extruder.on else rows
+        if extruder.on:
+            # see distance_forgiving() in extrusion_classes.py
+            both_defined = defined[moves] & prev_defined[moves]
+            deltas = np.where(both_defined, xyz[moves] - prev[moves], 0)
+            volumes = move_lengths(deltas) * state.extrusion_geometry.area
+        else:
+            volumes = np.zeros(len(moves))
+        # see Extruder.get_and_update_volume
+        totals = np.cumsum(np.concatenate(([extruder.total_volume], volumes)))
+        line_totals = totals[1:] if moves is rows else totals[1:][rows]
+        if extruder.relative_gcode == True:
+            refs = np.concatenate(([extruder.total_volume_ref], line_totals[:-1]))
+        else:
+            refs = extruder.total_volume_ref
+        e_values = (line_totals - refs) * extruder.volume_to_e
+        if len(moves) > 0:
+            extruder.total_volume = float(totals[-1])
+        if len(rows) > 0 and extruder.relative_gcode == True:
+            extruder.total_volume_ref = float(line_totals[-1])
+        if volume_log is not None:
+            ref_count = None
+            if len(rows) > 0 and extruder.relative_gcode == True:
+                ref_count = len(rows) if moves is rows else int(rows[-1]) + 1
+            volume_log.append((volumes, ref_count))
+
+    update_run_position(xyz, defined, rows, state)
+    return rows, changed, e_values
+
+
+def gcode_point_run(points: list, state) -> list:
+    '''Generate lines of gcode for a run of consecutive Points.
+
+    The result is identical to calling Point.gcode() for each Point in turn.
+
+    Args:
+        points (list): A list of Points, with no other steps between them.
+        state (State): The state object containing printer and extruder information.
+
+    Returns:
+        list: The generated lines of gcode.
+    '''
+    if len(points) == 0:
+        return []
+    xyz, defined, nan_row = run_arrays(points)
+    if nan_row is not None:
+        # a Point with a nan value is processed on its own, with arrays for the Points either side
+        gcode_lines = gcode_point_run(points[:nan_row], state)
+        gcode_line = points[nan_row].gcode(state)
+        if gcode_line != None:
+            gcode_lines.append(gcode_line)
+        return gcode_lines + gcode_point_run(points[nan_row+1:], state)
+    return gcode_xyz_run(xyz, defined, state)
+
+
+def gcode_xyz_run(xyz: np.ndarray, defined: np.ndarray, state) -> list:
+    '''Generate lines of gcode for a sequence of x y z positions.
+
+    The result is identical to calling Point.gcode() for a Point at each position in turn.
+
+    Args:
+        xyz (np.ndarray): x y z values with shape (n, 3), with undefined values set to 0.
+        defined (np.ndarray): Boolean array of which x y z values are defined (equivalent to Point attributes that are not None).
+        state (State): The state object containing printer and extruder information.
+
+    Returns:
+        list: The generated lines of gcode.
+    '''
+    if len(xyz) == 0:
+        return []
+    G_str = 'G1 ' if state.extruder.on or state.extruder.travel_format == "G1_E0" else 'G0 '
+    F_str = state.printer.f_gcode(state)
+    rows, changed, e_values = run_moves(xyz, defined, state)
+    if len(rows) == 0:
+        return []
+
+    # numbers are written with '%.*f', with the number of decimal places for each value calculated by
+    # trimmed_decimals() so that no trailing zeros need to be removed (see array_formatting.py)
+    E_str = ' E%.*f' if e_values is not None else ''
+    templates = [G_str + ' '.join(f'{axis}%.*f' for axis, axis_changed in zip('XYZ', code) if axis_changed) + E_str
+                 for code in ((code & 1, code & 2, code & 4) for code in range(8))]
+    codes = changed @ np.array([1, 2, 4])
+    values = xyz[rows]
+    letters = 'XYZ'
+    if e_values is not None:
+        values = np.column_stack((values, e_values))
+        changed = np.column_stack((changed, np.ones(len(rows), dtype=bool)))
+        letters += 'E'
+    text = format_lines([templates[code] for code in codes.tolist()], values, changed, [state.number_format.decimals[letter] for letter in letters])
+    # the feedrate is added separately since it is only included in the first line
+    return (G_str + F_str + text[len(G_str):]).split('\n')
@@ -0,0 +1,129 @@
+import numpy as np
+
+# print time is estimated by simulating the motion planner of the printer's firmware for the recorded moves (see
+# stats.Moves): each move accelerates from its entry speed towards its feedrate and decelerates to its exit speed
+# (a trapezoidal or triangular speed profile). the speed at the junction between two moves is limited by the angle
+# between them (junction deviation). the planner's backward and forward passes, which limit each junction speed so
+# that it can be reached from the previous junction and still decelerate for the next, are usually loops over all
+# moves. with squared speeds they become cumulative minimums of arrays, so all moves are processed by numpy at once
+
+DEFAULT_ACCELERATION = 1000  # mm/s2, used if 'acceleration' is not in the printer's initialization_data
+DEFAULT_JUNCTION_DEVIATION = 0.013  # mm, used if 'junction_deviation' is not in the printer's initialization_data
+
+
+def junction_limits(directions: np.ndarray, speeds: np.ndarray, acceleration: float, junction_deviation: float) -> np.ndarray:
+    '''
+    Return the maximum squared speed at each junction between consecutive moves, and at the start and end of all
+    moves (where the print head is stationary).
+
+    Args:
+        directions (np.ndarray): Unit vectors of the direction of each move, shape (n, 3).
+        speeds (np.ndarray): The nominal speed of each move (mm/s).
+        acceleration (float): The acceleration (mm/s2).
+        junction_deviation (float): The junction deviation (mm).
+
+    Returns:
+        np.ndarray: Squared speeds (mm2/s2) with length n + 1. Value i is the limit for the start of move i.
+    '''
+    limits = np.zeros(len(speeds) + 1)
+    if len(speeds) > 1:
+        # cos_theta is 1 for a reversal and -1 for moves in a straight line
+        cos_theta = np.clip(-np.einsum('ij,ij->i', directions[:-1], directions[1:]), -1, 1)
+        sin_half_theta = np.sqrt(0.5*(1 - cos_theta))
+        with np.errstate(divide='ignore'):
+            corner_limits = acceleration*junction_deviation*sin_half_theta / (1 - sin_half_theta)  # inf if straight
+        speeds_squared = speeds*speeds
+        limits[1:-1] = np.minimum(corner_limits, np.minimum(speeds_squared[:-1], speeds_squared[1:]))
+    return limits
+
+
+def planned_speeds(limits: np.ndarray, lengths: np.ndarray, acceleration: float) -> np.ndarray:
+    '''
+    Return the squared speed at each junction after the planner's backward pass (so each move can decelerate to the
+    next junction speed) and forward pass (so each junction speed can be reached by accelerating from the previous).
+
+    The backward pass limit for junction i is min over k >= i of (limits[k] + distances[k]) - distances[i], where
+    distances is the cumulative sum of 2 * acceleration * length, so it is a reversed cumulative minimum. The forward
+    pass is a cumulative minimum in the same way.
+
+    Args:
+        limits (np.ndarray): The maximum squared speed at each junction (see junction_limits()).
+        lengths (np.ndarray): The length of each move (all greater than zero).
+        acceleration (float): The acceleration (mm/s2).
+
+    Returns:
+        np.ndarray: Squared speeds (mm2/s2) at the junctions, with the same length as limits.
+    '''
+    distances = np.concatenate(([0], np.cumsum(2*acceleration*lengths)))
+    backward = np.minimum.accumulate((limits + distances)[::-1])[::-1] - distances
+    forward = np.minimum.accumulate(backward - distances) + distances
+    return np.maximum(forward, 0)  # rounding errors can give tiny negative values
+
+
+def move_times(moves, acceleration: float, junction_deviation: float) -> np.ndarray:
+    '''
+    Estimate the time for each move, with acceleration and deceleration between junction speeds.
+
+    Args:
+        moves (Moves): The moves (see GcodeSession.moves()).
+        acceleration (float): The acceleration (mm/s2).
+        junction_deviation (float): The junction deviation (mm).
+
+    Returns:
+        np.ndarray: The time for each move (seconds). Moves with zero length (e.g. the first definition of an axis)
+        take no time and are ignored when calculating junction speeds.
+    '''
+    times = np.zeros(len(moves.lengths))
+    moving = moves.lengths > 0
+    lengths = moves.lengths[moving]
+    if len(lengths) == 0:
+        return times
+    deltas = moves.ends[moving] - moves.starts[moving]
+    directions = np.where(np.isnan(deltas), 0, deltas) / lengths[:, None]  # axes not defined at both ends are ignored
+    speeds = moves.feedrates[moving] / 60
+    squared = planned_speeds(junction_limits(directions, speeds, acceleration, junction_deviation), lengths, acceleration)
+    entry_squared, exit_squared = squared[:-1], squared[1:]
+    entry_speeds, exit_speeds = np.sqrt(entry_squared), np.sqrt(exit_squared)
+    # trapezoid: accelerate to the nominal speed, cruise and decelerate
+    cruise_lengths = lengths - (2*speeds*speeds - entry_squared - exit_squared) / (2*acceleration)
+    trapezoid = (2*speeds - entry_speeds - exit_speeds)/acceleration + np.maximum(cruise_lengths, 0)/speeds
+    # triangle: the move is too short to reach the nominal speed
+    peak_speeds = np.sqrt((2*acceleration*lengths + entry_squared + exit_squared) / 2)
+    triangle = (2*peak_speeds - entry_speeds - exit_speeds)/acceleration
+    times[moving] = np.where(cruise_lengths >= 0, trapezoid, triangle)
+    return times
+
+
+def printer_move_times(moves, initialization_data: dict) -> np.ndarray:
+    'return the time for each move (see move_times()) for the printer\'s acceleration and junction_deviation'
+    return move_times(moves, initialization_data.get('acceleration', DEFAULT_ACCELERATION),
+                      initialization_data.get('junction_deviation', DEFAULT_JUNCTION_DEVIATION))
+
+
+def progress_lines(moves, times: np.ndarray) -> tuple:
+    '''
+    Return M73 progress lines (percent complete and remaining minutes) and where to add them to the gcode.
+
+    A line is given whenever the percentage or the remaining minutes change, plus a first line before any moves.
+
+    Args:
+        moves (Moves): The moves (see GcodeSession.moves()), including moves.steps.
+        times (np.ndarray): The time for each move (see move_times()).
+
+    Returns:
+        tuple: (step_counts, lines), where step_counts (list) gives the number of steps processed (see State.i)
+        after which each line (str) is added to the gcode.
+    '''
+    total = float(times.sum())
+    if total == 0:
+        return [0], ['M73 P0 R0']
+    elapsed = np.cumsum(times)
+    percents = np.minimum(np.floor(100*elapsed/total), 100).astype(int)
+    remaining = np.round((total - elapsed)/60).astype(int)
+    percents = np.concatenate(([0], percents))
+    remaining = np.concatenate(([round(total/60)], remaining))
+    step_counts = np.concatenate(([0], moves.steps))
+    changed = np.ones(len(percents), dtype=bool)
+    changed[1:] = (percents[1:] != percents[:-1]) | (remaining[1:] != remaining[:-1])
+    lines = [f'M73 P{percent} R{minutes}' for percent, minutes in zip(percents[changed].tolist(), remaining[changed].tolist())]
+    return step_counts[changed].tolist(), lines
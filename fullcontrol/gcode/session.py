@@ -0,0 +1,162 @@
+from copy import copy
+from importlib import import_module
+from fullcontrol.gcode.state import State, printer_initialization_data
+from fullcontrol.gcode.controls import GcodeControls
+from fullcontrol.gcode.steps2gcode import gcode_next, state_gcode_chunks, output_gcode
+from fullcontrol.gcode.stats import Moves, PrintStats, state_moves, print_stats
+from fullcontrol.gcode.print_time import printer_move_times, progress_lines
+from fullcontrol.gcode.optimize import OptimizeReport, optimize_chunks
+from fullcontrol.gcode.tips import tips
+from fullcontrol.common import first_point
+from fullcontrol.step_source import StepSource
+
+
+class GcodeSession:
+    '''
+    Gcode generation for many designs with the same GcodeControls (created with GcodeControls.compile()).
+
+    Everything that does not depend on the design is done once when the session is created: the printer's
+    initialization_data is resolved, the State (extruder, printer, extrusion geometry) is initialized, the primer
+    function is imported, and the starting procedure is converted to gcode. Each design then starts from a copy of
+    the State after the starting procedure. The primer, the design and the ending procedure are processed as
+    separate lists of steps in turn, rather than being combined into one new list. Designs may also be generators
+    (or other iterables) of steps. The gcode is identical to
+    fc.transform(steps, 'gcode', gcode_controls).
+
+    Example:
+        session = fc.GcodeControls(printer_name='prusa_i3').compile()
+        gcodes = [session.gcode(design) for design in designs]
+        stats = [session.stats(design) for design in designs]
+
+    Args:
+        gcode_controls (GcodeControls, optional): The controls for all designs. Defaults to GcodeControls().
+        show_tips (bool, optional): Whether to print tips about the gcode controls (once, when the session is
+            created) and the report of the gcode optimizer (see GcodeControls.optimize). Defaults to True.
+
+    Attributes:
+        optimize_report (OptimizeReport): The report of the gcode optimizer for the most recent design (None if
+            GcodeControls.optimize is not set).
+    '''
+
+    def __init__(self, gcode_controls: GcodeControls = None, show_tips: bool = True):
+        if gcode_controls is None:
+            gcode_controls = GcodeControls()
+        gcode_controls.initialize()
+        if show_tips: tips(gcode_controls)
+        self.gcode_controls = gcode_controls
+        self.show_tips = show_tips
+        self.optimize_report = None
+        initialization_data = printer_initialization_data(gcode_controls)
+        self.initialization_data = initialization_data
+        self.primer = import_module(f'fullcontrol.gcode.primer_library.{initialization_data["primer"]}').primer
+        self.ending_procedure_steps = initialization_data['ending_procedure_steps']
+        # the starting procedure is the same for all designs, so its gcode and the resulting state are saved
+        state = State(None, gcode_controls, initialization_data)
+        state.steps, state.i, state.gcode = StepSource(initialization_data['starting_procedure_steps']), 0, []
+        while gcode_next(state, gcode_controls.columnar):
+            pass
+        self.start_gcode = state.gcode
+        state.steps, state.i, state.gcode = None, 0, None
+        self.start_state = state
+
+    def chunks(self, steps: list, summary=None):
+        '''
+        Generate gcode for steps that have already been checked with fc.fix() (see gcode_chunks()).
+
+        Args:
+            steps (list): A 1D list of step objects, or a StepSource.
+            summary (DesignSummary, optional): The summary from fix_design(). If it includes the first point with
+                x y z defined, the steps are not read to find it. Defaults to None.
+
+        Yields:
+            str: Chunks of gcode. Joining all chunks with ''.join() gives the same string as gcode().
+        '''
+        progress = None
+        if self.gcode_controls.progress:
+            # the print time is estimated before gcode is generated, so the steps are read twice
+            if not isinstance(steps, list):
+                steps = list(steps)
+            moves = self.moves(steps, summary)
+            progress = progress_lines(moves, printer_move_times(moves, self.initialization_data))
+        state = self.new_state()
+        state.gcode = list(self.start_gcode)
+        chunks = state_gcode_chunks(state, self.segments(steps, summary), self.gcode_controls, progress)
+        if self.gcode_controls.optimize:
+            self.optimize_report = OptimizeReport()
+            chunks = optimize_chunks(chunks, self.gcode_controls.optimize_tolerance, self.optimize_report, self.show_tips,
+                                     state.number_format.decimals['E'])
+        yield from chunks
+
+    def new_state(self) -> State:
+        'return a copy of the State after the starting procedure'
+        # the objects in state that are updated during gcode generation are copied (attributes are replaced rather than edited in place)
+        state = copy(self.start_state)
+        state.point, state.extruder, state.printer, state.extrusion_geometry = \
+            copy(state.point), copy(state.extruder), copy(state.printer), copy(state.extrusion_geometry)
+        return state
+
+    def segments(self, steps: list, summary=None) -> list:
+        'return the primer, the design and the ending procedure (the lists of steps processed after the starting procedure)'
+        point0 = summary.first_point_defined if summary is not None and summary.first_point_defined is not None else first_point(steps)
+        return [self.primer(point0), steps, self.ending_procedure_steps]
+
+    def moves(self, steps: list, summary=None) -> Moves:
+        '''
+        Record the moves of the print head for steps that have already been checked with fc.fix(), without generating
+        gcode (see stats()).
+
+        Args:
+            steps (list): A 1D list of step objects, or a StepSource.
+            summary (DesignSummary, optional): The summary from fix_design(). Defaults to None.
+
+        Returns:
+            Moves: The moves for the primer, the design and the ending procedure, with moves.volume the volume of
+            material extruded.
+        '''
+        state = self.new_state()
+        volume_start = state.extruder.total_volume
+        moves = state_moves(state, self.segments(steps, summary))
+        moves.volume = state.extruder.total_volume - volume_start
+        return moves
+
+    def stats(self, steps: list) -> PrintStats:
+        '''
+        Calculate statistics for a design (print time, filament, layer count, bounding box) without generating gcode
+        (see fc.transform(steps, 'stats')).
+
+        Args:
+            steps (list): A list (or other iterable) of step objects.
+
+        Returns:
+            PrintStats: The statistics.
+        '''
+        from fullcontrol.check import fix_design
+        summary = fix_design(steps, 'gcode', self.gcode_controls)
+        return print_stats(self.moves(summary.steps, summary), self.initialization_data)
+
+    def gcode_chunks(self, steps: list):
+        '''
+        Generate gcode for a design as a series of string chunks (see fc.transform(steps, 'gcode_chunks')).
+
+        Args:
+            steps (list): A list (or other iterable) of step objects.
+
+        Returns:
+            generator: Chunks of gcode. Joining all chunks with ''.join() gives the same string as gcode().
+        '''
+        from fullcontrol.check import fix_design
+        summary = fix_design(steps, 'gcode', self.gcode_controls)
+        return self.chunks(summary.steps, summary)
+
+    def gcode(self, steps: list):
+        '''
+        Generate a gcode string for a design (see fc.transform(steps, 'gcode')).
+
+        Args:
+            steps (list): A list (or other iterable) of step objects.
+
+        Returns:
+            str: The generated gcode string, or None if gcode_controls.stream_to is set (the gcode is written to
+            stream_to in chunks rather than being returned).
+        '''
+        return output_gcode(self.gcode_chunks(steps), self.gcode_controls)
@@ -6,6 +6,7 @@ from fullcontrol.gcode.point import Point
 from fullcontrol.gcode.printer import Printer
 from fullcontrol.gcode.extrusion_classes import ExtrusionGeometry, Extruder
 from fullcontrol.gcode.controls import GcodeControls
+from fullcontrol.gcode.formatting import NumberFormat, DEFAULT_FORMAT
 from fullcontrol.common import first_point
 from fullcontrol.gcode.import_printer import import_printer
 
@@ -25,6 +26,7 @@ class State(BaseModel):
         point (Optional[Point]): The current point.
         i (Optional[int]): The current index.
         gcode (Optional[list]): The list of Gcode.
+        number_format (Optional[NumberFormat]): The number of decimal places for X Y Z E and F values in gcode.
 
     Methods:
         __init__: Initializes the State object.
@@ -38,26 +40,25 @@ class State(BaseModel):
     point: Optional[Point] = Point()
     i: Optional[int] = 0
     gcode: Optional[list] = []
+    number_format: Optional[NumberFormat] = DEFAULT_FORMAT
 
-    def __init__(self, steps: list, gcode_controls: GcodeControls):
+    def __init__(self, steps: list, gcode_controls: GcodeControls, initialization_data: dict = None):
         """
         Initializes a State object.
 
         Args:
-            steps (list): A list of steps for the state.
+            steps (list): A list of steps for the state. If None, state.steps is not set (see GcodeSession).
             gcode_controls (GcodeControls): An instance of the GcodeControls class.
+            initialization_data (dict, optional): The initialization_data of the printer, if it has already been
+                resolved with printer_initialization_data(). Defaults to None.
 
         Returns:
             None
         """
         super().__init__()
         # initialize state based on the named-printer default initialization_data and initialization_data over-rides passed by designer in gcode_controls
-
-        if gcode_controls.printer_name[:5] == 'Cura/' or gcode_controls.printer_name[:10] == 'Community/':
-            initialization_data = import_printer(gcode_controls.printer_name, gcode_controls.initialization_data)
-            # note if using 'no_primer' there is a risk that no initial Point is defined before the first G1 command meaning length calculation for the line is impossible and an error will occur
-        else:
-            initialization_data = import_module(f'fullcontrol.devices.community.singletool.{gcode_controls.printer_name}').set_up(gcode_controls.initialization_data)
+        if initialization_data is None:
+            initialization_data = printer_initialization_data(gcode_controls)
 
         self.extruder = Extruder(
             units=initialization_data['e_units'],
@@ -81,5 +82,26 @@ class State(BaseModel):
             height=initialization_data['extrusion_height'])
         self.extrusion_geometry.update_area()
 
-        primer_steps = import_module(f'fullcontrol.gcode.primer_library.{initialization_data["primer"]}').primer(first_point(steps))
-        self.steps = initialization_data['starting_procedure_steps'] + primer_steps + steps + initialization_data['ending_procedure_steps']
+        if gcode_controls.decimals != None or gcode_controls.quantize == True:
+            self.number_format = NumberFormat(decimals=gcode_controls.decimals if gcode_controls.decimals != None else {}, quantize=gcode_controls.quantize)
+
+        if steps is not None:
+            primer_steps = import_module(f'fullcontrol.gcode.primer_library.{initialization_data["primer"]}').primer(first_point(steps))
+            self.steps = initialization_data['starting_procedure_steps'] + primer_steps + steps + initialization_data['ending_procedure_steps']
+
+
+def printer_initialization_data(gcode_controls: GcodeControls) -> dict:
+    '''
+    Return the initialization_data for the printer in gcode_controls: the named-printer default initialization_data
+    combined with initialization_data over-rides passed by the designer in gcode_controls.
+
+    Args:
+        gcode_controls (GcodeControls): An instance of the GcodeControls class.
+
+    Returns:
+        dict: The initialization_data, including starting_procedure_steps and ending_procedure_steps.
+    '''
+    if gcode_controls.printer_name[:5] == 'Cura/' or gcode_controls.printer_name[:10] == 'Community/':
+        # note if using 'no_primer' there is a risk that no initial Point is defined before the first G1 command meaning length calculation for the line is impossible and an error will occur
+        return import_printer(gcode_controls.printer_name, gcode_controls.initialization_data)
+    return import_module(f'fullcontrol.devices.community.singletool.{gcode_controls.printer_name}').set_up(gcode_controls.initialization_data)
@@ -0,0 +1,294 @@
+import numpy as np
+from math import pi
+from typing import Optional
+from pydantic import BaseModel
+from fullcontrol.gcode.state import State
+from fullcontrol.gcode.point_array import PointArray
+from fullcontrol.gcode.point_runs import is_run_point, run_arrays, previous_positions, MIN_RUN_LENGTH, MAX_RUN_LENGTH
+from fullcontrol.gcode.print_time import printer_move_times
+from fullcontrol.step_source import StepSource
+
+# statistics for a design (print time, filament, layers, bounding box) are calculated by updating the gcode State for
+# every step, as for gcode generation, but without formatting any gcode. the moves of the print head are recorded as
+# arrays (runs of Points are processed together) and the statistics are calculated from the arrays
+
+DEFAULT_DENSITY = 1.24  # g/cm3 (PLA), used if 'material_density' is not in the printer's initialization_data
+LAYER_DECIMALS = 3  # z values of extruding moves are rounded to this many decimal places to identify layers
+
+
+class Moves:
+    '''
+    The moves of the print head for a design, recorded in order as they are processed (see state_moves()).
+
+    Moves from runs of Points are added as arrays. Moves from other steps are collected in lists and added to the
+    arrays before the next run, so that all moves stay in order.
+
+    Attributes (after arrays() is called):
+        starts (np.ndarray): x y z at the start of each move, shape (n, 3) (nan if not yet defined).
+        ends (np.ndarray): x y z at the end of each move, shape (n, 3) (nan if not yet defined).
+        lengths (np.ndarray): The length of each move (x y z components are ignored unless defined at both ends).
+        extruding (np.ndarray): Boolean array of whether the extruder is on for each move.
+        feedrates (np.ndarray): The feedrate (mm/min) for each move.
+        steps (np.ndarray): The number of steps processed (see State.i) when each move is complete.
+        volume (float): The volume of material extruded (mm3), set by GcodeSession.moves().
+    '''
+
+    def __init__(self):
+        self.chunks = []  # tuples of arrays (starts, ends, lengths, extruding, feedrates, steps)
+        self.pending = []  # moves from single steps: (start x y z, end x y z, length, extruding, feedrate, steps)
+        self.volume = None  # volume of material extruded (set by GcodeSession.moves())
+
+    def add_arrays(self, starts, ends, lengths, extruding, feedrates, steps):
+        self.flush()
+        self.chunks.append((starts, ends, lengths, extruding, feedrates, steps))
+
+    def add_move(self, start: tuple, end: tuple, extruding: bool, feedrate: float, steps: int):
+        deltas = [0 if a is None or b is None else b - a for a, b in zip(start, end)]
+        length = (deltas[0]*deltas[0] + deltas[1]*deltas[1] + deltas[2]*deltas[2])**0.5
+        self.pending.append((*start, *end, length, extruding, feedrate, steps))
+
+    def flush(self):
+        if len(self.pending) > 0:
+            values = np.array(self.pending, dtype=float).reshape(-1, 10)  # None becomes nan
+            self.chunks.append((values[:, 0:3], values[:, 3:6], values[:, 6], values[:, 7] != 0, values[:, 8],
+                                values[:, 9].astype(np.int64)))
+            self.pending = []
+
+    def arrays(self) -> 'Moves':
+        'combine all recorded moves into the arrays starts, ends, lengths, extruding, feedrates and steps'
+        self.flush()
+        if len(self.chunks) == 0:
+            self.chunks = [(np.empty((0, 3)), np.empty((0, 3)), np.empty(0), np.empty(0, dtype=bool), np.empty(0),
+                            np.empty(0, dtype=np.int64))]
+        self.starts, self.ends, self.lengths, self.extruding, self.feedrates, self.steps = \
+            (np.concatenate(values) for values in zip(*self.chunks))
+        self.chunks = [(self.starts, self.ends, self.lengths, self.extruding, self.feedrates, self.steps)]
+        return self
+
+
+def current_feedrate(state: State) -> float:
+    'return the feedrate for a move in the current state (see Printer.f_gcode)'
+    return state.printer.print_speed if state.extruder.on else state.printer.travel_speed
+
+
+def add_run(xyz: np.ndarray, defined: np.ndarray, state: State, moves: Moves, point_steps: bool = True):
+    '''
+    Record the moves for a run of Points (or the rows of a PointArray) and update state as for gcode generation
+    (see run_moves()).
+
+    Args:
+        xyz (np.ndarray): x y z values with shape (n, 3), with undefined values set to 0.
+        defined (np.ndarray): Boolean array of which x y z values are defined.
+        state (State): The state object.
+        moves (Moves): The recorded moves.
+        point_steps (bool, optional): Whether each row is a separate step (a run of Points) rather than all rows
+            being one step (a PointArray). Defaults to True.
+    '''
+    if len(xyz) == 0:
+        return
+    prev, prev_defined = previous_positions(xyz, defined, state)
+    deltas = np.where(defined & prev_defined, xyz - prev, 0)
+    lengths = np.sqrt(np.einsum('ij,ij->i', deltas, deltas))
+    starts = np.where(prev_defined, prev, np.nan)
+    ends = np.where(defined, xyz, starts)  # positions after each point
+    moving = (defined & (ends != starts)).any(axis=1)  # nan != nan, so the first definition of an axis is a move
+    count = int(np.count_nonzero(moving))
+    if count == 0:
+        return
+    extruding = bool(state.extruder.on)
+    steps = state.i + 1 + np.flatnonzero(moving) if point_steps else np.full(count, state.i + 1)
+    moves.add_arrays(starts[moving], ends[moving], lengths[moving], np.full(count, extruding),
+                     np.full(count, float(current_feedrate(state))), steps)
+    # state is updated in the same way as run_moves(), except that extrusion volumes are added as one sum
+    extruder = state.extruder
+    if extruding:
+        extruder.total_volume += float(lengths.sum()) * state.extrusion_geometry.area
+    if (extruding or extruder.travel_format == 'G1_E0') and extruder.relative_gcode == True:
+        extruder.total_volume_ref = extruder.total_volume
+    state.printer.speed_changed = False
+    for attr, value in zip('xyz', ends[-1].tolist()):
+        if value == value:  # not nan
+            setattr(state.point, attr, value)
+
+
+def add_step(step, state: State, moves: Moves):
+    'record the move (if any) for a step and update state as for gcode generation'
+    start = (state.point.x, state.point.y, state.point.z)
+    extruding, feedrate = bool(state.extruder.on), current_feedrate(state)
+    step.gcode(state)
+    del state.gcode[:-1]  # gcode lines are discarded, but some steps modify the previous line (e.g. GcodeComment)
+    end = (state.point.x, state.point.y, state.point.z)
+    if end != start:
+        moves.add_move(start, end, extruding, feedrate, state.i + 1)
+
+
+def state_moves(state: State, segments: list) -> Moves:
+    '''
+    Update state for several iterables of steps in turn (e.g. primer, design and ending procedure) without formatting
+    gcode, and record the moves of the print head.
+
+    Args:
+        state (State): The state object.
+        segments (list): The lists (or other iterables) of steps, processed in order as if they were one list.
+
+    Returns:
+        Moves: The moves, with arrays() already called.
+    '''
+    moves = Moves()
+    source = StepSource(*segments)
+    state.steps, state.i, state.gcode = source, 0, ['']
+    while True:
+        run = source.next_run(is_run_point, MAX_RUN_LENGTH)
+        if len(run) >= MIN_RUN_LENGTH:
+            xyz, defined, nan_row = run_arrays(run)
+            if nan_row is None:
+                add_run(xyz, defined, state, moves)
+                state.i += len(run)
+                continue
+        if len(run) > 0:
+            # short runs and runs with nan values are processed one step at a time
+            for point in run:
+                add_step(point, state, moves)
+                state.i += 1
+            continue
+        step = next(source, None)
+        if step is None:
+            break
+        if type(step).gcode is PointArray.gcode:
+            # see PointArray.gcode
+            defined = ~np.isnan(step.xyz)
+            add_run(np.where(defined, step.xyz, 0), defined, state, moves, point_steps=False)
+        else:
+            add_step(step, state, moves)
+        state.i += 1
+    return moves.arrays()
+
+
+class PrintStats(BaseModel):
+    '''
+    Statistics for a design, calculated without generating gcode (see fc.transform(steps, 'stats')).
+
+    Times are estimated with acceleration and deceleration between moves, for the printer's 'acceleration' (mm/s2)
+    and 'junction_deviation' (mm) in initialization_data (see print_time.py). Only moves of the print head are
+    included (e.g. not the time to heat up).
+
+    Attributes:
+        print_time (float): The estimated time for all moves (seconds).
+        extrusion_time (float): The estimated time for extruding moves (seconds).
+        travel_time (float): The estimated time for travel moves (seconds).
+        full_speed_time (float): The time for all moves if each move was carried out at its full feedrate (seconds).
+        layer_times (list): The estimated time for each layer (seconds), in order of z. Travel moves are included in
+            the layer of the previous extruding move (or the first layer, before any extruding moves).
+        extrusion_length (float): The total length of extruding moves (mm).
+        travel_length (float): The total length of travel moves (mm).
+        move_count (int): The number of moves.
+        volume (float): The volume of material extruded (mm3), including StationaryExtrusion.
+        filament_length (float): The length of filament for the extruded volume (mm), for filament diameter dia_feed.
+        filament_mass (float): The mass of material extruded (g), for the printer's 'material_density' (g/cm3) in
+            initialization_data (default 1.24 for PLA).
+        max_speed (float): The highest feedrate used for any move (mm/min).
+        layer_count (int): The number of different z values of the ends of extruding moves (to 0.001 mm).
+        minx, maxx, miny, maxy, minz, maxz (float): The bounding box of extruding moves (None if there are none).
+    '''
+    print_time: Optional[float] = None
+    extrusion_time: Optional[float] = None
+    travel_time: Optional[float] = None
+    full_speed_time: Optional[float] = None
+    layer_times: Optional[list] = None
+    extrusion_length: Optional[float] = None
+    travel_length: Optional[float] = None
+    move_count: Optional[int] = None
+    volume: Optional[float] = None
+    filament_length: Optional[float] = None
+    filament_mass: Optional[float] = None
+    max_speed: Optional[float] = None
+    layer_count: Optional[int] = None
+    minx: Optional[float] = None
+    maxx: Optional[float] = None
+    miny: Optional[float] = None
+    maxy: Optional[float] = None
+    minz: Optional[float] = None
+    maxz: Optional[float] = None
+
+
+def print_stats(moves: Moves, initialization_data: dict) -> PrintStats:
+    '''
+    Calculate statistics for a design from the recorded moves.
+
+    Args:
+        moves (Moves): The moves (see GcodeSession.moves()), with moves.volume the volume of material extruded (mm3).
+        initialization_data (dict): The printer's initialization_data (for dia_feed, material_density, acceleration
+            and junction_deviation).
+
+    Returns:
+        PrintStats: The statistics.
+    '''
+    times = printer_move_times(moves, initialization_data)
+    extruding, volume = moves.extruding, moves.volume
+    stats = PrintStats(
+        print_time=float(times.sum()),
+        extrusion_time=float(times[extruding].sum()),
+        travel_time=float(times[~extruding].sum()),
+        full_speed_time=float((moves.lengths / (moves.feedrates / 60)).sum()),
+        extrusion_length=float(moves.lengths[extruding].sum()),
+        travel_length=float(moves.lengths[~extruding].sum()),
+        move_count=len(moves.lengths),
+        volume=volume,
+        filament_length=volume / (pi*(initialization_data['dia_feed']/2)**2),
+        filament_mass=volume * initialization_data.get('material_density', DEFAULT_DENSITY) / 1000,
+        max_speed=float(moves.feedrates.max()) if len(moves.feedrates) > 0 else None)
+    if extruding.any():
+        ends = moves.ends[extruding]
+        stats.layer_times = layer_times(moves, times).tolist()
+        stats.layer_count = len(stats.layer_times)
+        starts = moves.starts[extruding]  # starts of extruding moves are included in the bounding box
+        for i, axis in enumerate('xyz'):
+            # each axis is reduced separately since reductions of contiguous arrays are quicker (nan values are ignored)
+            values = np.concatenate((starts[:, i], ends[:, i]))
+            min_value, max_value = float(np.fmin.reduce(values)), float(np.fmax.reduce(values))
+            if min_value == min_value:  # not nan (i.e. at least one value defined)
+                setattr(stats, f'min{axis}', min_value)
+                setattr(stats, f'max{axis}', max_value)
+    else:
+        stats.layer_count, stats.layer_times = 0, []
+    return stats
+
+
+def layer_times(moves: Moves, times: np.ndarray) -> np.ndarray:
+    '''
+    Return the total time for each layer, in order of z (see PrintStats.layer_times).
+
+    Args:
+        moves (Moves): The moves.
+        times (np.ndarray): The time for each move.
+
+    Returns:
+        np.ndarray: The time for each different z value of the ends of extruding moves (to LAYER_DECIMALS).
+    '''
+    z = moves.ends[:, 2]
+    in_layer = moves.extruding & ~np.isnan(z)
+    if not in_layer.any():
+        return np.empty(0)
+    # each move is assigned to the layer of the most recent extruding move (or the first one)
+    latest = np.maximum.accumulate(np.where(in_layer, np.arange(len(z)), -1))
+    latest[latest < 0] = np.argmax(in_layer)
+    layers, layer_indices = np.unique(np.round(z[latest], LAYER_DECIMALS), return_inverse=True)
+    return np.bincount(layer_indices.ravel(), weights=times, minlength=len(layers))
+
+
+def stats(steps: list, gcode_controls, show_tips: bool, summary=None) -> PrintStats:
+    '''
+    Calculate statistics for a design (print time, filament, layer count, bounding box) without generating gcode.
+
+    Args:
+        steps (list): A list (or other iterable) of step objects, checked with fix_design().
+        gcode_controls (GcodeControls): An instance of GcodeControls class.
+        show_tips (bool): Whether to print tips about the gcode controls.
+        summary (DesignSummary, optional): The summary from fix_design(), which includes the first point.
+
+    Returns:
+        PrintStats: The statistics.
+    '''
+    from fullcontrol.gcode.session import GcodeSession
+    session = GcodeSession(gcode_controls, show_tips)
+    return print_stats(session.moves(steps, summary), session.initialization_data)
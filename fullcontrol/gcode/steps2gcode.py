@@ -4,34 +4,170 @@ from fullcontrol.gcode.point import Point
 from fullcontrol.gcode.printer import Printer
 from fullcontrol.gcode.extrusion_classes import ExtrusionGeometry, Extruder
 from fullcontrol.gcode.state import State
+from fullcontrol.gcode.annotations import GcodeComment
 from fullcontrol.gcode.controls import GcodeControls
 from datetime import datetime
-from fullcontrol.gcode.tips import tips
+from fullcontrol.gcode.point_runs import is_run_point, gcode_point_run, MIN_RUN_LENGTH, MAX_RUN_LENGTH
+from fullcontrol.step_source import StepSource
 
+CHUNK_LINES = 10000  # approximate number of lines of gcode in each chunk generated by gcode_chunks()
 
-def gcode(steps: list, gcode_controls: GcodeControls, show_tips: bool):
+
+def gcode_chunks(steps: list, gcode_controls: GcodeControls, show_tips: bool, summary=None):
+    '''
+    Generate gcode from a list of steps as a series of string chunks. Only the current chunk is held in
+    memory, so memory use does not increase with the length of the gcode. steps may also be a generator (or
+    other iterable) of steps, which is read as gcode is generated, so the full list of steps is never built.
+
+    Args:
+        steps (list): A list (or other iterable) of step objects.
+        gcode_controls (GcodeControls): An instance of GcodeControls class.
+        show_tips (bool): Whether to print tips about the gcode controls.
+        summary (DesignSummary, optional): The summary from fix_design(), which includes the first point.
+
+    Yields:
+        str: Chunks of gcode. Joining all chunks with ''.join() gives the same string as gcode().
+    '''
+    from fullcontrol.gcode.session import GcodeSession
+    yield from GcodeSession(gcode_controls, show_tips).chunks(steps, summary)
+
+
+def state_gcode_chunks(state: State, segments: list, gcode_controls: GcodeControls, progress: tuple = None):
+    '''
+    Generate gcode for several iterables of steps in turn (e.g. primer, design and ending procedure) as a series of
+    string chunks, continuing from the state after any previous steps.
+
+    Args:
+        state (State): The state object. state.gcode contains the lines of gcode for any previous steps.
+        segments (list): The lists (or other iterables) of steps, processed in order as if they were one list.
+        gcode_controls (GcodeControls): An instance of GcodeControls class.
+        progress (tuple, optional): (step_counts, lines) from progress_lines(). Each line is added to the gcode when
+            state.i reaches its step count (after the step that reached it, and after any following GcodeComment
+            that adds text to the end of that step's line). Runs of Points are split so that lines are
+            added at the correct place, and gcode is generated by one process. Defaults to None.
+
+    Yields:
+        str: Chunks of gcode, including the lines already in state.gcode.
+    '''
+    if gcode_controls.processes != None and gcode_controls.processes > 1 and progress is None:
+        from fullcontrol.gcode.parallel import section_starts, parallel_gcode_chunks
+        # steps are split into sections by index, so generators of steps are read into a list
+        steps = list(StepSource(*segments))
+        if len(section_starts(len(steps), gcode_controls.processes)) > 1:
+            state.steps, state.i = steps, 0
+            yield from parallel_gcode_chunks(state, gcode_controls)
+            return
+        segments = [steps]
+    separator = ''  # newline between chunks (not included before the first chunk)
+    state.steps, state.i = StepSource(*segments), 0
+    step_counts, progress_lines = progress if progress is not None else ([], [])
+    next_line = 0  # index of the next progress line
+    while True:
+        if len(state.gcode) > CHUNK_LINES:
+            # the most recent line stays in state.gcode since some steps modify it (e.g. GcodeComment)
+            yield separator + '\n'.join(state.gcode[:-1])
+            del state.gcode[:-1]
+            separator = '\n'
+        max_run = MAX_RUN_LENGTH
+        if next_line < len(step_counts):
+            if step_counts[next_line] <= state.i and not modifies_previous_line(state.steps.lookahead(lambda step: True)):
+                # the line is added after the step that reached its step count. only the latest line is added if
+                # several are due at once (e.g. for the rows of a PointArray)
+                while next_line < len(step_counts) and step_counts[next_line] <= state.i:
+                    next_line += 1
+                state.gcode.append(progress_lines[next_line - 1])
+            if next_line < len(step_counts):
+                max_run = max(min(MAX_RUN_LENGTH, step_counts[next_line] - state.i), 1)
+        if not gcode_next(state, gcode_controls.columnar, max_run):
+            break
+    if len(state.gcode) > 0:
+        yield separator + '\n'.join(state.gcode)
+
+
+def modifies_previous_line(steps: list) -> bool:
+    'return True if the first of steps (if any) modifies the most recent line of gcode (see GcodeComment)'
+    return len(steps) > 0 and isinstance(steps[0], GcodeComment) and steps[0].end_of_previous_line_text != None
+
+
+def gcode_next(state: State, columnar: bool, max_run: int = MAX_RUN_LENGTH) -> bool:
+    '''
+    Add gcode for the next step in state.steps (or the next run of consecutive Points) to state.gcode.
+
+    Args:
+        state (State): The state object. state.steps is a StepSource, and state.i is the number of steps processed.
+        columnar (bool): Whether to process runs of consecutive Points as arrays (see GcodeControls).
+        max_run (int, optional): The maximum number of Points in a run. Defaults to MAX_RUN_LENGTH.
+
+    Returns:
+        bool: False if there were no more steps in state.steps, otherwise True.
+    '''
+    if columnar:
+        # process runs of consecutive Points as arrays
+        run = state.steps.next_run(is_run_point, max_run)
+        if len(run) >= MIN_RUN_LENGTH:
+            state.gcode.extend(gcode_point_run(run, state))
+            state.i += len(run)
+            return True
+        if len(run) > 0:
+            # short runs are quicker to process one step at a time
+            for step in run:
+                gcode_line = step.gcode(state)
+                if gcode_line != None:
+                    state.gcode.append(gcode_line)
+            state.i += len(run)
+            return True
+    # call the gcode function of each class instance in 'steps'
+    step = next(state.steps, None)
+    if step is None:
+        return False
+    gcode_line = step.gcode(state)
+    if gcode_line != None:
+        state.gcode.append(gcode_line)
+    state.i += 1
+    return True
+
+
+def gcode(steps: list, gcode_controls: GcodeControls, show_tips: bool, summary=None):
     '''
     Generate a gcode string from a list of steps.
 
     Args:
         steps (list): A list of step objects.
         gcode_controls (GcodeControls, optional): An instance of GcodeControls class. Defaults to GcodeControls().
+        summary (DesignSummary, optional): The summary from fix_design(), which includes the first point.
 
     Returns:
-        str: The generated gcode string.
-    '''
-    gcode_controls.initialize()
-    if show_tips: tips(gcode_controls)
-
-    state = State(steps, gcode_controls)
-    # need a while loop because some classes may change the length of state.steps
-    while state.i < len(state.steps):
-        # call the gcode function of each class instance in 'steps'
-        gcode_line = state.steps[state.i].gcode(state)
-        if gcode_line != None:
-            state.gcode.append(gcode_line)
-        state.i += 1
-    gc = '\n'.join(state.gcode)
+        str: The generated gcode string, or None if gcode_controls.stream_to is set, in which case
+        the gcode is written to stream_to in chunks rather than being returned.
+    '''
+    return output_gcode(gcode_chunks(steps, gcode_controls, show_tips, summary), gcode_controls)
+
+
+def output_gcode(chunks, gcode_controls: GcodeControls):
+    '''
+    Join chunks of gcode into a string, and save it if gcode_controls.save_as is set, or write the chunks to
+    gcode_controls.stream_to.
+
+    Args:
+        chunks (generator): Chunks of gcode (see gcode_chunks()).
+        gcode_controls (GcodeControls): An instance of GcodeControls class.
+
+    Returns:
+        str: The gcode string, or None if gcode_controls.stream_to is set.
+    '''
+    if gcode_controls.stream_to != None:
+        if gcode_controls.save_as != None:
+            raise Exception('GcodeControls.save_as and GcodeControls.stream_to cannot both be set')
+        if hasattr(gcode_controls.stream_to, 'write'):
+            for chunk in chunks:
+                gcode_controls.stream_to.write(chunk)
+        else:
+            with open(gcode_controls.stream_to, 'w') as f:
+                for chunk in chunks:
+                    f.write(chunk)
+        return None
+
+    gc = ''.join(chunks)
 
     if gcode_controls.save_as != None:
         filename = gcode_controls.save_as
@@ -1,6 +1,6 @@
 
 # import classes
-from fullcontrol.combinations.gcode_and_visualize.classes import Point, Extruder
+from fullcontrol.combinations.gcode_and_visualize.classes import Point, Extruder, PointArray
 # objects are imported here with functionality for both gcode and visualization. this means
 # the modules within the geometry subpackage can simply import from here, with the idea being
 # that only one import command needs to be changed if a different combination of properties is
@@ -18,8 +18,10 @@ from fullcontrol.geometry.move_polar import move_polar
 from fullcontrol.geometry.reflect import reflectXY, reflectXY_mc
 from fullcontrol.geometry.reflect_polar import reflectXYpolar
 from fullcontrol.geometry.ramping import ramp_xyz, ramp_polar
-from fullcontrol.geometry.arcs import arcXY, variable_arcXY, elliptical_arcXY, arcXY_3pt
-from fullcontrol.geometry.shapes import rectangleXY, circleXY, circleXY_3pt, ellipseXY, polygonXY, spiralXY, helixZ
+from fullcontrol.geometry.arrays import linspace_array, polar_to_array, points_to_array, array_to_points
+from fullcontrol.geometry.arcs import arcXY, variable_arcXY, elliptical_arcXY, arcXY_3pt, arcXY_np, variable_arcXY_np, elliptical_arcXY_np
+from fullcontrol.geometry.shapes import rectangleXY, circleXY, circleXY_3pt, ellipseXY, polygonXY, spiralXY, helixZ, spiralXY_np, helixZ_np
 from fullcontrol.geometry.waves import squarewaveXY, squarewaveXYpolar, trianglewaveXYpolar, sinewaveXYpolar
-from fullcontrol.geometry.segmentation import segmented_line, segmented_path
+from fullcontrol.geometry.segmentation import segmented_line, segmented_path, segmented_line_np, segmented_path_np
 from fullcontrol.geometry.travel_to import travel_to
+from fullcontrol.geometry.affine import Transform
@@ -0,0 +1,159 @@
+from fullcontrol.geometry import Point, Vector
+from fullcontrol.geometry.array_transforms import transform_steps, transform_copies, rotation_matrix
+from fullcontrol.common import flatten
+from typing import Union
+
+
+def translation_matrix(vector: Vector):
+    'return a 4x4 matrix for translation by a Vector (undefined vector attributes are treated as zero)'
+    import numpy as np
+    matrix = np.eye(4)
+    matrix[:3, 3] = [value if value is not None else 0 for value in (vector.x, vector.y, vector.z)]
+    return matrix
+
+
+def rotation_matrix_4x4(axis_start: Point, axis_end: Point, angle_rad: float):
+    'return a 4x4 matrix for rotation about the axis from axis_start to axis_end by angle_rad'
+    import numpy as np
+    rotation = rotation_matrix(axis_start, axis_end, angle_rad)
+    origin = np.array([axis_start.x, axis_start.y, axis_start.z], dtype=float)
+    matrix = np.eye(4)
+    matrix[:3, :3] = rotation
+    matrix[:3, 3] = origin - rotation @ origin
+    return matrix
+
+
+def reflectionXY_matrix(p1_reflect: Point, p2_reflect: Point):
+    'return a 4x4 matrix for reflection of x and y values about the line through two Points'
+    import numpy as np
+    dx, dy = p2_reflect.x - p1_reflect.x, p2_reflect.y - p1_reflect.y
+    length = (dx*dx + dy*dy)**0.5
+    dx, dy = dx/length, dy/length
+    matrix = np.eye(4)
+    # the if and elif avoid numerical errors (see reflectXY)
+    if dx == 0:  # reflection line in Y direction
+        matrix[:2, :2] = [[-1, 0], [0, 1]]
+    elif dy == 0:  # reflection line in X direction
+        matrix[:2, :2] = [[1, 0], [0, -1]]
+    else:
+        # the reflection of a vector v about a line with unit direction d is 2(v.d)d - v
+        matrix[:2, :2] = [[2*dx*dx - 1, 2*dx*dy], [2*dx*dy, 2*dy*dy - 1]]
+    origin = np.array([p1_reflect.x, p1_reflect.y])
+    matrix[:2, 3] = origin - matrix[:2, :2] @ origin
+    return matrix
+
+
+def apply_matrix(xyz, matrix):
+    '''
+    Apply a 4x4 affine transformation matrix to an array of x y z values.
+
+    Args:
+        xyz (np.ndarray): An array with shape (n, 3). nan values are equivalent to Point attributes that are None.
+        matrix (np.ndarray): A 4x4 affine transformation matrix.
+
+    Returns:
+        np.ndarray: The transformed array. A value is nan if it depends on any nan value in the original array
+        (e.g. translation of a Point with z=None gives z=None, but rotation about the z axis of a Point with
+        x=None gives x=None and y=None).
+    '''
+    import numpy as np
+    undefined = np.isnan(xyz)
+    xyz_new = np.where(undefined, 0, xyz) @ matrix[:3, :3].T + matrix[:3, 3]
+    if undefined.any():
+        xyz_new[(undefined @ (matrix[:3, :3] != 0).T)] = np.nan
+    return xyz_new
+
+
+class Transform:
+    '''
+    A lazy sequence of affine transformations (translations, rotations and reflections, with optional copies)
+    applied to a list of steps.
+
+    Transformations are recorded rather than being carried out immediately, and are combined into one 4x4
+    matrix (or one matrix for each copy of the geometry). No new Points are created until the Transform is
+    passed to fc.transform() (alone or as an element in the list of steps), or until to_steps() is called. All
+    Points are then transformed at once as an array (see array_transforms.py). Elements in the list that are
+    not Points pass through and are replicated without modification. In a generator of steps or a LazySteps design
+    (see fc.flatten(steps, lazy=True)), each copy is only created when it is read.
+
+    Each method returns a new Transform, so the original Transform can be reused.
+
+    Example:
+        steps = fc.Transform(layer).move(fc.Vector(z=0.2), copy=True, copy_quantity=50).rotate(centre, 'z', 0.01)
+
+    Args:
+        steps (Union[Point, list]): The geometry to be transformed (a Point or a list of steps including Points).
+        matrices (list, optional): The 4x4 matrices for each copy of the geometry. Defaults to None (one copy,
+            not transformed).
+    '''
+
+    def __init__(self, steps: Union[Point, list], matrices: list = None):
+        import numpy as np
+        self.steps = steps
+        self.matrices = matrices if matrices is not None else [np.eye(4)]
+
+    def __repr__(self):
+        return f'Transform(steps={type(self.steps).__name__}, copies={len(self.matrices)})'
+
+    def then(self, matrices: list) -> 'Transform':
+        '''
+        Return a new Transform with another transformation applied after the transformations so far.
+
+        Args:
+            matrices (list): The 4x4 matrix of the transformation, or a list of matrices to create copies of the
+                geometry (one for each copy, including the position of the current geometry).
+
+        Returns:
+            Transform: The new Transform.
+        '''
+        if not isinstance(matrices, list):
+            matrices = [matrices]
+        # copies are in the same order as for copy=True in move(), i.e. all current copies, then all current copies again
+        return Transform(self.steps, [matrix @ matrix_before for matrix in matrices for matrix_before in self.matrices])
+
+    def move(self, vector: Vector, copy: bool = False, copy_quantity: int = 2) -> 'Transform':
+        'record a translation by vector, with multiple copies each offset by vector from the previous copy if copy is True (see move())'
+        if copy:
+            vectors = [Vector(x=vector.x*i if vector.x != None else None, y=vector.y*i if vector.y != None else None,
+                              z=vector.z*i if vector.z != None else None) for i in range(copy_quantity)]
+            return self.then([translation_matrix(v_now) for v_now in vectors])
+        return self.then(translation_matrix(vector))
+
+    def rotate(self, axis_start: Point, axis_end_or_direction: Union[Point, str], angle_rad: float, copy: bool = False, copy_quantity: int = 2) -> 'Transform':
+        '''record a rotation about an axis by angle_rad. the axis is defined by two points for axis_start and axis_end or
+        by one point for axis_start and a direction 'x', 'y' or 'z' (see lab.fullcontrol.geometry.rotate()). if copy is True,
+        multiple copies are created, each rotated by angle_rad from the previous copy'''
+        if isinstance(axis_end_or_direction, str):
+            axis_end = Point(x=axis_start.x + (axis_end_or_direction == 'x'), y=axis_start.y + (axis_end_or_direction == 'y'),
+                             z=axis_start.z + (axis_end_or_direction == 'z'))
+        else:
+            axis_end = axis_end_or_direction
+        if copy:
+            return self.then([rotation_matrix_4x4(axis_start, axis_end, angle_rad*i) for i in range(copy_quantity)])
+        return self.then(rotation_matrix_4x4(axis_start, axis_end, angle_rad))
+
+    def move_polar(self, centre: Point, angle: float, copy: bool = False, copy_quantity: int = 2) -> 'Transform':
+        '''record a move about a centre point by the given angle (radians). this is equivalent to move_polar() with radius=0,
+        which is a rotation about a vertical axis through the centre point (changes of radius are not affine transformations)'''
+        axis_start = Point(x=centre.x, y=centre.y, z=0)
+        return self.rotate(axis_start, 'z', angle, copy, copy_quantity)
+
+    def reflectXY(self, p1_reflect: Point, p2_reflect: Point) -> 'Transform':
+        'record a reflection of x and y values about the line through two Points (see reflectXY())'
+        return self.then(reflectionXY_matrix(p1_reflect, p2_reflect))
+
+    def geometry(self) -> list:
+        'return the untransformed geometry as a 1D list of steps'
+        if isinstance(self.steps, Transform):
+            return self.steps.to_steps()
+        steps = self.steps if isinstance(self.steps, list) else [self.steps]
+        steps = [step.to_steps() if isinstance(step, Transform) else step for step in steps]
+        return flatten(steps) if any(isinstance(step, list) for step in steps) else steps
+
+    def to_steps(self) -> list:
+        'carry out the transformations and return the new list of steps (the original geometry is not edited)'
+        return transform_steps(self.geometry(), apply_matrix, copies=self.matrices)
+
+    def copies(self):
+        'generate the new list of steps for each copy in turn, so only one copy is held in memory at a time (see StepSource)'
+        return transform_copies(self.geometry(), apply_matrix, self.matrices)
@@ -1,11 +1,12 @@
 
 from fullcontrol.common import linspace
-from fullcontrol.geometry import Point, polar_to_point, ramp_xyz, ramp_polar
+from fullcontrol.geometry import Point, PointArray, polar_to_point, ramp_xyz, ramp_polar
 from fullcontrol.geometry.midpoint import centreXY_3pt
+from fullcontrol.geometry.arrays import linspace_array, polar_to_array
 from math import tau, sin , cos
 
 
-def arcXY(centre: Point, radius: float, start_angle: float, arc_angle: float, segments: int = 100) -> list:
+def arcXY(centre: Point, radius: float, start_angle: float, arc_angle: float, segments: int = 100, as_array: bool = False) -> list:
     '''Generate a 2D-XY arc with angles defined in radians and z-position the same as that of the centre point.
     
     Args:
@@ -14,15 +15,18 @@ def arcXY(centre: Point, radius: float, start_angle: float, arc_angle: float, se
         start_angle (float): The starting angle (radians) of the arc.
         arc_angle (float): The angle (radians) of the arc.
         segments (int, optional): The number of segments to divide the arc into. Defaults to 100.
+        as_array (bool, optional): If True, return a PointArray instead of a list of Points. Defaults to False.
     
     Returns:
-        list: A list of Points representing the arc.
+        list: A list of Points representing the arc (or a PointArray if as_array is True).
     '''
+    if as_array:
+        return PointArray(xyz=arcXY_np(centre, radius, start_angle, arc_angle, segments))
     a_steps = linspace(start_angle, start_angle+arc_angle, segments+1)
     return [polar_to_point(centre, radius, a) for a in a_steps]
 
 
-def variable_arcXY(centre: Point, start_radius: float, start_angle: float, arc_angle: float, segments: int = 100, radius_change: float = 0, z_change: float = 0) -> list:
+def variable_arcXY(centre: Point, start_radius: float, start_angle: float, arc_angle: float, segments: int = 100, radius_change: float = 0, z_change: float = 0, as_array: bool = False) -> list:
     '''Generate a arc with optionally varying radius and z-position. angles are defined in radians. z-position starts the same as that of the centre point and increased by z_change.
 
     Parameters:
@@ -33,18 +37,21 @@ def variable_arcXY(centre: Point, start_radius: float, start_angle: float, arc_a
     - segments (int, optional): The number of segments to divide the arc into (default is 100).
     - radius_change (float, optional): The optional change in radius of the arc (default is 0).
     - z_change (float, optional): The optional change in z-position of the arc (default is 0).
+    - as_array (bool, optional): If True, return a PointArray instead of a list of Points (default is False).
 
     Returns:
-    - list: A list of Points representing the variable arc.
+    - list: A list of Points representing the variable arc (or a PointArray if as_array is True).
 
     '''
+    if as_array:
+        return PointArray(xyz=variable_arcXY_np(centre, start_radius, start_angle, arc_angle, segments, radius_change, z_change))
     arc = arcXY(centre, start_radius, start_angle, arc_angle, segments)  # create arc with constant radius and z
     arc = ramp_xyz(arc, z_change=z_change)  # ramp z of the arc
     # ramp radius of the arc
     return ramp_polar(arc, centre, radius_change=radius_change)
 
 
-def elliptical_arcXY(centre: Point, a: float, b: float, start_angle: float, arc_angle: float, segments: int = 100) -> list:
+def elliptical_arcXY(centre: Point, a: float, b: float, start_angle: float, arc_angle: float, segments: int = 100, as_array: bool = False) -> list:
     '''Generate a 2D-XY elliptical arc with z-position the same as that of the centre point
     Args:
         centre (Point): The centre point of the arc.
@@ -53,16 +60,19 @@ def elliptical_arcXY(centre: Point, a: float, b: float, start_angle: float, arc_
         start_angle (float): The starting polar angle of the arc in radians.
         arc_angle (float): The angle of the arc in radians.
         segments (int, optional): The number of segments to divide the arc into. Defaults to 100.
+        as_array (bool, optional): If True, return a PointArray instead of a list of Points. Defaults to False.
     
     Returns:
-        list: A list of Points representing the elliptical arc.
+        list: A list of Points representing the elliptical arc (or a PointArray if as_array is True).
     '''
     
+    if as_array:
+        return PointArray(xyz=elliptical_arcXY_np(centre, a, b, start_angle, arc_angle, segments))
     t_steps = linspace(start_angle, start_angle+arc_angle, segments+1)
     return [Point(x=a*cos(t) + centre.x, y=b*sin(t) + centre.y, z=centre.z) for t in t_steps]
 
 
-def arcXY_3pt(pt1: Point, pt2: Point, pt3: Point, segments: int = 100) -> list:
+def arcXY_3pt(pt1: Point, pt2: Point, pt3: Point, segments: int = 100, as_array: bool = False) -> list:
     '''Generate a 2D-XY arc passing through three specified points.
     
     Args:
@@ -70,9 +80,10 @@ def arcXY_3pt(pt1: Point, pt2: Point, pt3: Point, segments: int = 100) -> list:
         pt2 (Point): An intermediate point that the arc passes through.
         pt3 (Point): The ending point of the arc.
         segments (int, optional): The number of segments to divide the arc into. Defaults to 100.
+        as_array (bool, optional): If True, return a PointArray instead of a list of Points. Defaults to False.
     
     Returns:
-        list: A list of Points representing the arc from pt1 through pt2 to pt3.
+        list: A list of Points representing the arc from pt1 through pt2 to pt3 (or a PointArray if as_array is True).
     '''
     from math import atan2, pi
     
@@ -92,4 +103,69 @@ def arcXY_3pt(pt1: Point, pt2: Point, pt3: Point, segments: int = 100) -> list:
     ccw = (mid_angle > start_angle and mid_angle < end_angle) or (start_angle > end_angle and (mid_angle > start_angle or mid_angle < end_angle))
     arc_angle = end_angle - start_angle if ccw else -(2*pi - (end_angle - start_angle))
     
-    return arcXY(centre, radius, start_angle, arc_angle, segments)
+    return arcXY(centre, radius, start_angle, arc_angle, segments, as_array)
+
+
+# vectorised versions of the functions above, which calculate all points at once with numpy and return an
+# array with shape (segments+1, 3) rather than a list of Points. use fc.PointArray(xyz=...) to include the
+# array in a design or fc.array_to_points() to convert it to a list of Points
+
+
+def arcXY_np(centre: Point, radius: float, start_angle: float, arc_angle: float, segments: int = 100):
+    '''Vectorised version of arcXY(). Generate a 2D-XY arc with angles defined in radians and z-position the same as that of the centre point.
+
+    Args:
+        centre (Point): The center point of the arc.
+        radius (float): The radius of the arc.
+        start_angle (float): The starting angle (radians) of the arc.
+        arc_angle (float): The angle (radians) of the arc.
+        segments (int, optional): The number of segments to divide the arc into. Defaults to 100.
+
+    Returns:
+        np.ndarray: An array of x y z positions with shape (segments+1, 3).
+    '''
+    return polar_to_array(centre, radius, linspace_array(start_angle, start_angle+arc_angle, segments+1))
+
+
+def variable_arcXY_np(centre: Point, start_radius: float, start_angle: float, arc_angle: float, segments: int = 100, radius_change: float = 0, z_change: float = 0):
+    '''Vectorised version of variable_arcXY(). Generate a arc with optionally varying radius and z-position. angles are defined in radians.
+
+    Parameters:
+    - centre (Point): The centre point of the arc.
+    - start_radius (float): The starting radius of the arc.
+    - start_angle (float): The starting polar angle (radians) of the arc.
+    - arc_angle (float): The angle (radians) of the arc.
+    - segments (int, optional): The number of segments to divide the arc into (default is 100).
+    - radius_change (float, optional): The optional change in radius of the arc (default is 0).
+    - z_change (float, optional): The optional change in z-position of the arc (default is 0).
+
+    Returns:
+    - np.ndarray: An array of x y z positions with shape (segments+1, 3).
+    '''
+    angles = linspace_array(start_angle, start_angle+arc_angle, segments+1)
+    radii = start_radius + linspace_array(0, radius_change, segments+1)
+    z = None if centre.z is None else centre.z + linspace_array(0, z_change, segments+1)
+    return polar_to_array(centre, radii, angles, z)
+
+
+def elliptical_arcXY_np(centre: Point, a: float, b: float, start_angle: float, arc_angle: float, segments: int = 100):
+    '''Vectorised version of elliptical_arcXY(). Generate a 2D-XY elliptical arc with z-position the same as that of the centre point.
+
+    Args:
+        centre (Point): The centre point of the arc.
+        a (float): The x-width of the ellipse.
+        b (float): The y-height of the ellipse.
+        start_angle (float): The starting polar angle of the arc in radians.
+        arc_angle (float): The angle of the arc in radians.
+        segments (int, optional): The number of segments to divide the arc into. Defaults to 100.
+
+    Returns:
+        np.ndarray: An array of x y z positions with shape (segments+1, 3).
+    '''
+    import numpy as np
+    t_steps = linspace_array(start_angle, start_angle+arc_angle, segments+1)
+    xyz = np.empty((segments+1, 3))
+    xyz[:, 0] = a*np.cos(t_steps) + centre.x
+    xyz[:, 1] = b*np.sin(t_steps) + centre.y
+    xyz[:, 2] = np.nan if centre.z is None else centre.z
+    return xyz
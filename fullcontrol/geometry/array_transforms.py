@@ -0,0 +1,200 @@
+from fullcontrol.geometry import Point, PointArray, Vector
+from fullcontrol.common import SlottedPoint
+from copy import copy, deepcopy
+
+
+# transformations applied to all Points in a list of steps at once. the x y z values of all Points (and all
+# rows of PointArrays) are extracted into one numpy array, transformed with array operations, and written to
+# shallow copies of the Points - this is much faster than transforming deepcopies of Points one at a time.
+# steps that are not Points pass through without modification. nan values in the arrays are equivalent to
+# Point attributes that are None, and remain nan (None) after transformation
+
+
+def extract_xyz(steps: list) -> tuple:
+    '''
+    Extract x y z values from all Points and PointArrays in a list of steps.
+
+    Args:
+        steps (list): A list of steps.
+
+    Returns:
+        tuple: (xyz, positions, lengths). xyz is an array with shape (n, 3), positions are the indices of the
+        Points/PointArrays in steps, and lengths are the number of rows of xyz for each of them (None for a Point).
+    '''
+    import numpy as np
+    parts, positions, lengths, point_values = [], [], [], []
+    for i, step in enumerate(steps):
+        if isinstance(step, (Point, SlottedPoint)):
+            point_values.append((step.x, step.y, step.z))
+            positions.append(i)
+            lengths.append(None)
+        elif isinstance(step, PointArray):
+            if len(point_values) > 0:
+                parts.append(np.array(point_values, dtype=float))
+                point_values = []
+            parts.append(step.xyz)
+            positions.append(i)
+            lengths.append(len(step.xyz))
+    if len(point_values) > 0:
+        parts.append(np.array(point_values, dtype=float))
+    xyz = np.concatenate(parts) if len(parts) > 0 else np.empty((0, 3))
+    return xyz, positions, lengths
+
+
+def rebuild_steps(steps: list, positions: list, lengths: list, xyz) -> list:
+    '''
+    Return a new list of steps with Points and PointArrays replaced by shallow copies with x y z values from xyz.
+
+    Args:
+        steps (list): The original list of steps (not edited).
+        positions (list): Positions of Points/PointArrays in steps (see extract_xyz).
+        lengths (list): Number of rows of xyz for each Point/PointArray (see extract_xyz).
+        xyz (np.ndarray): The new x y z values.
+
+    Returns:
+        list: The new list of steps.
+    '''
+    steps_new = list(steps)
+    values = xyz.tolist()
+    row = 0
+    for position, length in zip(positions, lengths):
+        step_new = copy(steps[position])
+        if getattr(step_new, 'color', None) is not None:
+            step_new.color = deepcopy(step_new.color)  # so that the color attribute is copied, as for deepcopy(point)
+        if length is None:
+            x, y, z = values[row]
+            # x != x for nan
+            x, y, z = None if x != x else x, None if y != y else y, None if z != z else z
+            if hasattr(step_new, '__dict__'):
+                step_new.__dict__.update(x=x, y=y, z=z)  # quicker than setting attributes of pydantic models
+            else:
+                step_new.x, step_new.y, step_new.z = x, y, z
+            row += 1
+        else:
+            step_new.xyz = xyz[row:row+length]
+            row += length
+        steps_new[position] = step_new
+    return steps_new
+
+
+def row_positions(steps: list, positions: list, lengths: list) -> tuple:
+    '''
+    Find the position of each row of xyz (see extract_xyz) in the list of steps, if PointArrays were expanded to Points.
+
+    Args:
+        steps (list): The list of steps.
+        positions (list): Positions of Points/PointArrays in steps (see extract_xyz).
+        lengths (list): Number of rows of xyz for each Point/PointArray (see extract_xyz).
+
+    Returns:
+        tuple: (rows, total). rows is an array of the position of each row, and total is the number of steps in the expanded list.
+    '''
+    import numpy as np
+    rows, extra = [], 0  # extra is the number of additional steps from PointArrays so far
+    for position, length in zip(positions, lengths):
+        if length is None:
+            rows.append(position + extra)
+        else:
+            rows.extend(range(position + extra, position + extra + length))
+            extra += length - 1
+    return np.array(rows, dtype=int), len(steps) + extra
+
+
+def transform_steps(steps: list, function, copies: list = None) -> list:
+    '''
+    Apply an array function to the x y z values of all Points and PointArrays in a list of steps.
+
+    Args:
+        steps (list): A list of steps (not edited).
+        function: A function that takes an array of x y z values (n, 3) and returns the transformed array. If
+            copies is set, the function also takes a second argument.
+        copies (list, optional): If set, a copy of the steps is created for each element of copies, which is
+            passed to function as the second argument. Defaults to None.
+
+    Returns:
+        list: The new list of steps (with the copies one after another if copies is set).
+    '''
+    if copies is None:
+        if not isinstance(steps, list):
+            steps = list(steps)
+        xyz, positions, lengths = extract_xyz(steps)
+        return rebuild_steps(steps, positions, lengths, function(xyz))
+    steps_new = []
+    for steps_copy in transform_copies(steps, function, copies):
+        steps_new.extend(steps_copy)
+    return steps_new
+
+
+def transform_copies(steps: list, function, copies: list):
+    '''
+    Generate a transformed copy of a list of steps for each element of copies in turn (see transform_steps). Only one
+    copy is created at a time, when it is needed.
+
+    Args:
+        steps (list): A list of steps (not edited).
+        function: A function that takes an array of x y z values (n, 3) and an element of copies, and returns the
+            transformed array.
+        copies (list): An element for each copy, passed to function as the second argument.
+
+    Yields:
+        list: The new list of steps for each copy.
+    '''
+    if not isinstance(steps, list):
+        steps = list(steps)
+    xyz, positions, lengths = extract_xyz(steps)
+    for copy_arg in copies:
+        yield rebuild_steps(steps, positions, lengths, function(xyz, copy_arg))
+
+
+def translate_xyz(xyz, vector: Vector):
+    'return x y z values moved by a Vector (undefined vector attributes do not change the values)'
+    # -0.0 is added for undefined vector attributes since x + -0.0 == x for all x (including x = -0.0)
+    return xyz + [value if value is not None else -0.0 for value in (vector.x, vector.y, vector.z)]
+
+
+def move_polar_xyz(xyz, centre: Point, radius, angle):
+    'return x y z values moved about centre by radius and angle (radians) relative to their current polar coordinates (floats or arrays)'
+    import numpy as np
+    dx, dy = xyz[:, 0] - centre.x, xyz[:, 1] - centre.y
+    radius_new = np.sqrt(dx*dx + dy*dy) + radius
+    angle_new = np.arctan2(dy, dx) % (2*np.pi) + angle  # 0 to 2pi as for point_to_polar()
+    xyz_new = xyz.copy()
+    xyz_new[:, 0] = centre.x + radius_new*np.cos(angle_new)
+    xyz_new[:, 1] = centre.y + radius_new*np.sin(angle_new)
+    return xyz_new
+
+
+def rotation_matrix(axis_start: Point, axis_end: Point, angle_rad: float):
+    'return a 3x3 matrix for rotation about the axis from axis_start to axis_end by angle_rad (Rodrigues rotation formula)'
+    import numpy as np
+    axis = np.array([axis_end.x - axis_start.x, axis_end.y - axis_start.y, axis_end.z - axis_start.z], dtype=float)
+    kx, ky, kz = axis / np.sqrt(axis @ axis)
+    cross = np.array([[0, -kz, ky], [kz, 0, -kx], [-ky, kx, 0]])
+    return np.cos(angle_rad)*np.eye(3) + np.sin(angle_rad)*cross + (1 - np.cos(angle_rad))*np.outer([kx, ky, kz], [kx, ky, kz])
+
+
+def rotate_xyz(xyz, axis_start: Point, axis_end: Point, angle_rad: float):
+    'return x y z values rotated about the axis from axis_start to axis_end by angle_rad (all values must be defined)'
+    import numpy as np
+    if np.isnan(xyz).any():
+        raise Exception('rotation can only be applied to points with x, y and z values all defined')
+    origin = [axis_start.x, axis_start.y, axis_start.z]
+    return (xyz - origin) @ rotation_matrix(axis_start, axis_end, angle_rad).T + origin
+
+
+def reflect_xyz(xyz, p1_reflect: Point, p2_reflect: Point):
+    'return x y z values with x and y reflected about the line through two Points'
+    import numpy as np
+    xyz_new = xyz.copy()
+    # the if and elif avoid numerical errors (see reflectXY)
+    if p2_reflect.x - p1_reflect.x == 0:  # reflection line in Y direction
+        xyz_new[:, 0] = xyz[:, 0] + 2 * (p1_reflect.x - xyz[:, 0])
+    elif p2_reflect.y - p1_reflect.y == 0:  # reflection line in X direction
+        xyz_new[:, 1] = xyz[:, 1] + 2 * (p1_reflect.y - xyz[:, 1])
+    else:
+        direction = np.array([p2_reflect.x - p1_reflect.x, p2_reflect.y - p1_reflect.y])
+        direction /= np.sqrt(direction @ direction)
+        relative = xyz[:, :2] - [p1_reflect.x, p1_reflect.y]
+        # the reflection of a vector v about a line with unit direction d is 2(v.d)d - v
+        xyz_new[:, :2] = 2*np.outer(relative @ direction, direction) - relative + [p1_reflect.x, p1_reflect.y]
+    return xyz_new
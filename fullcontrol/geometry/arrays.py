@@ -0,0 +1,70 @@
+from fullcontrol.geometry import Point, PointArray
+
+
+# functions for geometry stored in numpy arrays with shape (n, 3), where each row is the x y z position of a
+# point and nan values are equivalent to Point attributes that are None. numpy is imported within each function
+# so that it is only imported if these functions are used
+
+
+def linspace_array(start: float, end: float, number_of_points: int):
+    '''
+    Generate evenly spaced floats from start to end as a numpy array (the same values as fc.linspace()).
+
+    Args:
+        start (float): The starting value of the range.
+        end (float): The ending value of the range.
+        number_of_points (int): The number of points to generate.
+
+    Returns:
+        np.ndarray: An array of number_of_points floats, including the start and end values.
+    '''
+    import numpy as np
+    return start + np.arange(number_of_points, dtype=float)/(number_of_points-1)*(end-start)
+
+
+def polar_to_array(centre: Point, radius, angle, z=None):
+    '''
+    Convert polar coordinates (arrays or floats) to an array of x y z positions. Vectorised version of polar_to_point().
+
+    Args:
+        centre (Point): The centre point.
+        radius (Union[float, np.ndarray]): The radius (or an array of radii).
+        angle (Union[float, np.ndarray]): The angle in radians (or an array of angles).
+        z (Union[float, np.ndarray], optional): The z position(s). Defaults to None, in which case z = centre.z.
+
+    Returns:
+        np.ndarray: An array with shape (n, 3).
+    '''
+    import numpy as np
+    radius, angle = np.broadcast_arrays(np.asarray(radius, dtype=float), np.asarray(angle, dtype=float))
+    xyz = np.empty((radius.size, 3))
+    xyz[:, 0] = centre.x + radius*np.cos(angle)
+    xyz[:, 1] = centre.y + radius*np.sin(angle)
+    xyz[:, 2] = (np.nan if centre.z is None else centre.z) if z is None else z
+    return xyz
+
+
+def points_to_array(points: list):
+    '''
+    Convert a list of Points to an array of x y z positions.
+
+    Args:
+        points (list): A list of Points (other steps in the list are ignored).
+
+    Returns:
+        np.ndarray: An array with shape (n, 3), with nan for undefined (None) values.
+    '''
+    return PointArray.from_points(points).xyz
+
+
+def array_to_points(xyz) -> list:
+    '''
+    Convert an array of x y z positions (e.g. from arcXY_np()) to a list of Points.
+
+    Args:
+        xyz (np.ndarray): An array with shape (n, 3). nan values become None.
+
+    Returns:
+        list: A list of Points.
+    '''
+    return PointArray(xyz=xyz).to_points()
@@ -1,10 +1,12 @@
 
 from fullcontrol.geometry import Point, Vector
+from fullcontrol.geometry.array_transforms import transform_steps, transform_copies, translate_xyz
+from fullcontrol.common import SlottedPoint, LazySteps
 from copy import deepcopy
 from typing import Union
 
 
-def move(geometry: Union[Point, list], vector: Vector, copy: bool = False, copy_quantity: int = 2) -> Union[Point, list]:
+def move(geometry: Union[Point, list], vector: Vector, copy: bool = False, copy_quantity: int = 2, lazy: bool = False) -> Union[Point, list]:
     '''
     Move 'geometry' (a Point or list of steps including Points) by 'vector'.
 
@@ -17,16 +19,23 @@ def move(geometry: Union[Point, list], vector: Vector, copy: bool = False, copy_
     The total number of copies is determined by 'copy_quantity', which includes the position of the original geometry.
     The new geometries are returned as a list, with the original geometry not being modified.
 
+    If 'lazy' is True, a LazySteps design is returned instead of a list. The moved geometry (or each copy) is only
+    created when it is read, e.g. by fc.transform(), so all copies are never held in memory at once.
+
     Parameters:
         geometry (Union[Point, list]): The geometry to be moved. It can be a Point or a list of Points.
         vector (Vector): The vector by which the geometry should be moved.
         copy (bool, optional): If True, multiple copies of the geometry are created. Defaults to False.
         copy_quantity (int, optional): The number of copies to be created. Defaults to 2.
+        lazy (bool, optional): If True, return a LazySteps design that creates the moved geometry when it is read.
+            Defaults to False.
 
     Returns:
         Union[Point, list]: The new geometry after being moved. If 'geometry' is a Point, a new Point is returned.
         If 'geometry' is a list, a new list with the modified Points is returned.
     '''
+    if lazy:
+        return LazySteps(move_lazy, geometry, vector, copy, copy_quantity)
     if copy:
         return copy_geometry(geometry, vector, copy_quantity)
     else:
@@ -69,16 +78,11 @@ def move_geometry(geometry: Union[Point, list], vector: Vector) -> Union[Point,
             point_new.z += vector.z
         return point_new
 
-    if isinstance(geometry, Point):
+    if isinstance(geometry, (Point, SlottedPoint)):
         return move_point(geometry, vector)
     else:
-        geometry_new = []
-        for element in geometry:
-            if isinstance(element, Point):
-                geometry_new.append(move_point(element, vector))
-            else:
-                geometry_new.append(element)
-        return geometry_new
+        # all Points in the list are moved at once as an array (see array_transforms.py)
+        return transform_steps(geometry, lambda xyz: translate_xyz(xyz, vector))
 
 
 
@@ -100,14 +104,37 @@ def copy_geometry(geometry: Union[Point, list], vector: Vector, quantity: int) -
     Returns:
         A list containing the new geometry, with each copy offset by the specified vector.
     '''
-    steps_new = []
+    vectors = copy_vectors(vector, quantity)
+    if isinstance(geometry, (Point, SlottedPoint)):
+        return [move_geometry(geometry, v_now) for v_now in vectors]
+    # x y z values of Points are only extracted to an array once for all copies
+    return transform_steps(geometry, translate_xyz, copies=vectors)
+
+
+def move_lazy(geometry: Union[Point, list], vector: Vector, copy: bool, quantity: int):
+    '''
+    Function called by move() with lazy=True
+
+    Generate the same geometry as move_geometry() or copy_geometry(), one copy at a time.
+
+    Yields:
+        list: The steps of each copy (or the moved Point if 'geometry' is a Point).
+    '''
+    vectors = copy_vectors(vector, quantity) if copy else [vector]
+    if isinstance(geometry, (Point, SlottedPoint)):
+        for v_now in vectors:
+            yield move_geometry(geometry, v_now)
+    else:
+        yield from transform_copies(geometry, translate_xyz, vectors)
+
+
+def copy_vectors(vector: Vector, quantity: int) -> list:
+    'return the offset of each copy from the original geometry (see copy_geometry())'
+    vectors = []
     for i in range(quantity):
         v_now = Vector()
         v_now.x = vector.x*i if vector.x != None else None
         v_now.y = vector.y*i if vector.y != None else None
         v_now.z = vector.z*i if vector.z != None else None
-        if isinstance(geometry, Point):
-            steps_new.append(move_geometry(geometry, v_now))
-        else:
-            steps_new.extend(move_geometry(geometry, v_now))
-    return steps_new
+        vectors.append(v_now)
+    return vectors
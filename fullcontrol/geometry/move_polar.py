@@ -1,5 +1,6 @@
 
 from fullcontrol.geometry import Point, point_to_polar, polar_to_point
+from fullcontrol.geometry.array_transforms import transform_steps, move_polar_xyz
 from fullcontrol.check import check_points
 from copy import deepcopy
 from typing import Union
@@ -81,13 +82,8 @@ def move_geometry_polar(geometry: Union[Point, list], centre: Point, radius: flo
     if type(geometry).__name__ == "Point":
         return move_point_about_point(geometry, centre, radius, angle)
     else:
-        geometry_new = []
-        for i in range(len(geometry)):
-            if type(geometry[i]).__name__ == 'Point':
-                geometry_new.append(move_point_about_point(geometry[i], centre, radius, angle))
-            else:
-                geometry_new.append(geometry[i])
-        return geometry_new
+        # all Points in the list are moved at once as an array (see array_transforms.py)
+        return transform_steps(geometry, lambda xyz: move_polar_xyz(xyz, centre, radius, angle))
 
 
 def copy_geometry_polar(geometry: Union[Point, list], centre: Point, radius: float, angle: float, quantity: int) -> list:
@@ -111,12 +107,7 @@ def copy_geometry_polar(geometry: Union[Point, list], centre: Point, radius: flo
     Returns:
         A list containing the moved geometry.
     '''
-    steps_new = []
-    for i in range(quantity):
-        radius_now = radius * i
-        angle_now = angle * i
-        if type(geometry).__name__ == "Point":
-            steps_new.append(move_geometry_polar(geometry, centre, radius_now, angle_now))
-        else:
-            steps_new.extend(move_geometry_polar(geometry, centre, radius_now, angle_now))
-    return steps_new
+    if type(geometry).__name__ == "Point":
+        return [move_geometry_polar(geometry, centre, radius * i, angle * i) for i in range(quantity)]
+    # x y z values of Points are only extracted to an array once for all copies
+    return transform_steps(geometry, lambda xyz, i: move_polar_xyz(xyz, centre, radius * i, angle * i), copies=range(quantity))
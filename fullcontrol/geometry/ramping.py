@@ -1,6 +1,8 @@
 
 from fullcontrol.common import linspace
-from fullcontrol.geometry import Point, Vector, move, move_polar
+from fullcontrol.geometry import Point
+from fullcontrol.geometry.array_transforms import extract_xyz, rebuild_steps, row_positions, move_polar_xyz
+from fullcontrol.check import check_points
 
 
 def ramp_xyz(steplist: list, x_change: float = 0, y_change: float = 0, z_change: float = 0) -> list:
@@ -16,12 +18,12 @@ def ramp_xyz(steplist: list, x_change: float = 0, y_change: float = 0, z_change:
     Returns:
         list: List of Points with modified x/y/z values.
     '''
-    x_steps = linspace(0, x_change, len(steplist))
-    y_steps = linspace(0, y_change, len(steplist))
-    z_steps = linspace(0, z_change, len(steplist))
-    # for i in range(len(steplist)): steplist[i].z += z_steps[i]
-    for i in range(len(steplist)):
-        steplist[i] = move(steplist[i], Vector(x=x_steps[i], y=y_steps[i], z=z_steps[i]))
+    import numpy as np
+    # all Points are moved at once as an array (see array_transforms.py). each row of a PointArray counts as one step
+    xyz, positions, lengths = extract_xyz(steplist)
+    rows, total = row_positions(steplist, positions, lengths)
+    steps = np.array([linspace(0, x_change, total), linspace(0, y_change, total), linspace(0, z_change, total)]).T
+    steplist[:] = rebuild_steps(steplist, positions, lengths, xyz + steps[rows])
     return steplist
 
 
@@ -38,8 +40,12 @@ def ramp_polar(steplist: list, centre: Point, radius_change: float = 0, angle_ch
     Returns:
         list: A list of modified Points.
     '''
-    r_steps = linspace(0, radius_change, len(steplist))
-    a_steps = linspace(0, angle_change, len(steplist))
-    for i in range(len(steplist)):
-        steplist[i] = move_polar(steplist[i], centre, r_steps[i], a_steps[i])
+    import numpy as np
+    check_points(steplist, check='polar_xy')
+    # all Points are moved at once as an array (see array_transforms.py). each row of a PointArray counts as one step
+    xyz, positions, lengths = extract_xyz(steplist)
+    rows, total = row_positions(steplist, positions, lengths)
+    r_steps = np.array(linspace(0, radius_change, total))[rows]
+    a_steps = np.array(linspace(0, angle_change, total))[rows]
+    steplist[:] = rebuild_steps(steplist, positions, lengths, move_polar_xyz(xyz, centre, r_steps, a_steps))
     return steplist
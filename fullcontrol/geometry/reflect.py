@@ -1,5 +1,7 @@
 
 from fullcontrol.geometry import Point
+from fullcontrol.geometry.array_transforms import transform_steps, reflect_xyz
+from typing import Union
 
 
 def reflectXY_mc(p: Point, m_reflect: float, c_reflect: float) -> Point:
@@ -22,18 +24,23 @@ def reflectXY_mc(p: Point, m_reflect: float, c_reflect: float) -> Point:
     return Point(x=p.x + 2 * (p_foot.x - p.x), y=p.y + 2 * (p_foot.y - p.y), z=p.z)
 
 
-def reflectXY(p: Point, p1_reflect: Point, p2_reflect: Point) -> Point:
+def reflectXY(p: Union[Point, list], p1_reflect: Point, p2_reflect: Point) -> Union[Point, list]:
     '''
     Reflects the x and y values of a Point about a line defined by two Points.
+
+    If p is a list of steps, all Points in the list are reflected at once and a new list is returned (the
+    original list is not edited). Elements in the list that are not Points pass through without modification.
     
     Parameters:
-        p (Point): The Point to be reflected.
+        p (Union[Point, list]): The Point (or list of steps including Points) to be reflected.
         p1_reflect (Point): The first Point defining the reflection line.
         p2_reflect (Point): The second Point defining the reflection line.
     
     Returns:
-        Point: A new Point with the original z value and the reflected x and y values.
+        Union[Point, list]: A new Point with the original z value and the reflected x and y values, or a new list of steps.
     '''
+    if isinstance(p, list):
+        return transform_steps(p, lambda xyz: reflect_xyz(xyz, p1_reflect, p2_reflect))
     # the if and elif avoid numerical errors associated with calculating the gradient of a vertical line
     if p2_reflect.x - p1_reflect.x == 0:  # reflection line in Y direction
         return Point(x=p.x + 2 * (p1_reflect.x - p.x), y=p.y, z=p.z)
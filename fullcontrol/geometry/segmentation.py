@@ -1,9 +1,10 @@
 
-from fullcontrol.geometry import Point, interpolated_point, distance
+from fullcontrol.geometry import Point, PointArray, interpolated_point, distance
 from fullcontrol.common import linspace
+from fullcontrol.geometry.arrays import linspace_array, points_to_array
 
 
-def segmented_line(point1: Point, point2: Point, segments: int) -> list:
+def segmented_line(point1: Point, point2: Point, segments: int, as_array: bool = False) -> list:
     '''
     Return a list of Points linearly spaced between the start Point and end Point.
     The total number of Points in the list is segments+1.
@@ -12,28 +13,34 @@ def segmented_line(point1: Point, point2: Point, segments: int) -> list:
         point1 (Point): The start Point of the line segment.
         point2 (Point): The end Point of the line segment.
         segments (int): The number of segments to divide the line into.
+        as_array (bool, optional): If True, return a PointArray instead of a list of Points. Defaults to False.
     
     Returns:
-        list: A list of Points linearly spaced between the start and end Points.
+        list: A list of Points linearly spaced between the start and end Points (or a PointArray if as_array is True).
     '''
+    if as_array:
+        return PointArray(xyz=segmented_line_np(point1, point2, segments))
     x_steps = linspace(point1.x, point2.x, segments+1)
     y_steps = linspace(point1.y, point2.y, segments+1)
     z_steps = linspace(point1.z, point2.z, segments+1)
     return [Point(x=x_steps[i], y=y_steps[i], z=z_steps[i]) for i in range(segments+1)]
 
 
-def segmented_path(points: list, segments: int) -> int:
+def segmented_path(points: list, segments: int, as_array: bool = False) -> int:
     """
     Calculate a segmented path (equidistant points) based on a list of points and the desired number of segments.
 
     Args:
         points (list): A list of equidistant points along the path.
         segments (int): The desired number of segments.
+        as_array (bool, optional): If True, return a PointArray instead of a list of points. Defaults to False.
 
     Returns:
-        list: A list of points representing the segmented path.
+        list: A list of points representing the segmented path (or a PointArray if as_array is True).
 
     """
+    if as_array:
+        return PointArray(xyz=segmented_path_np(points, segments))
     lengths = [distance(points[i], points[i+1])
                for i in range(len(points)-1)]
     cumulative_length = [0]
@@ -55,3 +62,53 @@ def segmented_path(points: list, segments: int) -> int:
             points[path_section_now-1], points[path_section_now], interpolation_fraction))
     path_pts.append(points[-1])
     return path_pts
+
+
+# vectorised versions of the functions above, which calculate all points at once with numpy and return an
+# array with shape (segments+1, 3) rather than a list of Points. use fc.PointArray(xyz=...) to include the
+# array in a design or fc.array_to_points() to convert it to a list of Points
+
+
+def segmented_line_np(point1: Point, point2: Point, segments: int):
+    '''
+    Vectorised version of segmented_line(). Return an array of positions linearly spaced between point1 and point2.
+
+    Parameters:
+        point1 (Point): The start Point of the line segment.
+        point2 (Point): The end Point of the line segment.
+        segments (int): The number of segments to divide the line into.
+
+    Returns:
+        np.ndarray: An array of x y z positions with shape (segments+1, 3).
+    '''
+    import numpy as np
+    start, end = points_to_array([point1, point2]).tolist()
+    xyz = np.empty((segments+1, 3))
+    for axis in range(3):
+        xyz[:, axis] = linspace_array(start[axis], end[axis], segments+1)
+    return xyz
+
+
+def segmented_path_np(points: list, segments: int):
+    '''
+    Vectorised version of segmented_path(). Return an array of equidistant positions along a path.
+
+    Args:
+        points (list): A list of points along the path.
+        segments (int): The desired number of segments.
+
+    Returns:
+        np.ndarray: An array of x y z positions with shape (segments+1, 3).
+    '''
+    import numpy as np
+    xyz = points_to_array(points)
+    lengths = (((xyz[1:] - xyz[:-1])**2).sum(axis=1))**0.5
+    cumulative_length = np.concatenate(([0.0], np.cumsum(lengths)))
+    # the positions along the path are accumulated in the same way as segmented_path()
+    path_lengths = np.cumsum(np.full(segments-1, cumulative_length[-1]/segments))
+    sections = np.maximum(np.searchsorted(cumulative_length, path_lengths, side='left'), 1)
+    fractions = (path_lengths - cumulative_length[sections-1]) / lengths[sections-1]
+    path_xyz = np.empty((segments+1, 3))
+    path_xyz[0], path_xyz[-1] = xyz[0], xyz[-1]
+    path_xyz[1:-1] = xyz[sections-1] + fractions[:, None]*(xyz[sections] - xyz[sections-1])
+    return path_xyz
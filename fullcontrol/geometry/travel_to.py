@@ -1,4 +1,5 @@
 from fullcontrol.geometry import Point, Extruder
+from fullcontrol.common import SlottedPoint
 from typing import Union
 from fullcontrol.common import first_point
 
@@ -15,7 +16,7 @@ def travel_to(geometry: Union[Point, list]) -> list:
         Exception: If an object of a type other than Point is supplied.
 
     '''
-    if isinstance(geometry, Point):
+    if isinstance(geometry, (Point, SlottedPoint)):
         point = geometry
     elif isinstance(geometry, list):
         point = first_point(geometry)
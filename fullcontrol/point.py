@@ -1,5 +1,6 @@
 from typing import Optional
 from fullcontrol.common import BaseModelPlus
+from fullcontrol.base import SlottedModel
 
 
 class Point(BaseModelPlus):
@@ -7,3 +8,8 @@ class Point(BaseModelPlus):
     x: Optional[float] = None
     y: Optional[float] = None
     z: Optional[float] = None
+
+
+class SlottedPoint(SlottedModel):
+    """Base class for slotted Points (see SlottedModel), allowing them to be identified with isinstance()."""
+    __slots__ = ()
@@ -0,0 +1,68 @@
+from typing import Any, ClassVar
+from pydantic import __version__
+from fullcontrol.base import BaseModelPlus
+from fullcontrol.point import Point, SlottedPoint
+
+
+def xyz_array(xyz):
+    'return xyz as a float numpy array with shape (n, 3). None values are converted to nan'
+    import numpy as np
+    return np.asarray(xyz, dtype=float).reshape(-1, 3)
+
+
+class PointArray(BaseModelPlus):
+    '''
+    Represents a polyline as a single step, with the x, y, z values of all its points stored in one array.
+
+    A PointArray is equivalent to a list of Points, one for each row of the array, but uses much less memory
+    and is processed much faster. nan values are equivalent to Point attributes that are None (i.e. the
+    nozzle does not move in that direction).
+
+    Attributes:
+        xyz (Any): An array with shape (n, 3), or any list of [x, y, z] values that can be converted to one.
+    '''
+    xyz: Any
+    point_class: ClassVar[type] = Point  # the type of Point that each row of the array is equivalent to
+
+    if int(__version__.split('.')[0]) >= 2:
+        from pydantic import field_validator
+        @field_validator('xyz')
+        @classmethod
+        def convert_xyz(cls, value):
+            return xyz_array(value)
+    else:
+        from pydantic import validator
+        @validator('xyz')
+        def convert_xyz(cls, value):
+            return xyz_array(value)
+
+    @classmethod
+    def from_points(cls, points: list) -> 'PointArray':
+        '''
+        Create a PointArray from a list of Points.
+
+        Args:
+            points (list): A list of Points (any other steps in the list are ignored).
+
+        Returns:
+            PointArray: The new PointArray.
+        '''
+        points = [point for point in points if isinstance(point, (Point, SlottedPoint))]
+        return cls(xyz=[(point.x, point.y, point.z) for point in points])
+
+    def point(self, index: int) -> Point:
+        '''
+        Return the Point equivalent to a row of the array.
+
+        Args:
+            index (int): The index of the row.
+
+        Returns:
+            Point: A new Point, with attributes set to None for nan values.
+        '''
+        x, y, z = (None if value != value else value for value in self.xyz[index].tolist())
+        return self.point_class(x=x, y=y, z=z)
+
+    def to_points(self) -> list:
+        '''Return a list of Points equivalent to this PointArray.'''
+        return [self.point(i) for i in range(len(self.xyz))]
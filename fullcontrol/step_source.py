@@ -0,0 +1,181 @@
+from collections.abc import Iterator
+
+# steps for gcode generation are read from a StepSource rather than by index from a list, so a design can be any
+# iterable of steps - e.g. a generator that creates each layer as it is needed, so the full list of steps is never
+# built. steps that expand into more steps (lists, generators and lazy Transforms) are pushed onto a stack of
+# 'frames' and read before the rest of the design. lists are read by position, so runs of consecutive Points can
+# be sliced from them without reading each step separately
+
+_END = object()  # returned by next() for an exhausted iterator
+_transform_class = None  # the lazy Transform class, see transform_class()
+
+
+def transform_class() -> type:
+    'return the lazy Transform class (geometry/affine.py is imported when it is first needed, to avoid a circular import)'
+    global _transform_class
+    if _transform_class is None:
+        from fullcontrol.geometry.affine import Transform
+        _transform_class = Transform
+    return _transform_class
+
+
+def expands(step) -> bool:
+    'return True if the step is a list/tuple, iterator or lazy Transform that expands into other steps'
+    return isinstance(step, (list, tuple, Iterator)) or isinstance(step, _transform_class or transform_class())
+
+
+class StepSource:
+    '''
+    A stream of steps read from one or more iterables (lists, tuples, generators, other StepSources) in order.
+
+    Elements that expand into more steps (nested lists, generators and lazy Transforms) are expanded when they
+    are read, so the steps produced are always a 1D sequence of fullcontrol class instances. Steps can be added
+    with inject(), in which case they are read before the remaining steps. For example, a step's gcode() method
+    can inject replacement steps with state.steps.inject([...]).
+
+    Args:
+        *iterables: The iterables of steps, read in order.
+    '''
+
+    def __init__(self, *iterables):
+        # frames are read from the end of the list: [steps, position] for lists, or an iterator
+        self.frames = []
+        for iterable in reversed(iterables):
+            self.inject(iterable)
+
+    def inject(self, steps):
+        '''
+        Add steps to be read before the remaining steps.
+
+        Args:
+            steps: A list, tuple, iterator, lazy Transform, StepSource or other iterable of steps.
+        '''
+        if isinstance(steps, StepSource):
+            self.frames.extend(steps.frames)
+            steps.frames = []  # the steps now belong to this StepSource
+        elif isinstance(steps, list):
+            self.frames.append([steps, 0])
+        elif isinstance(steps, transform_class()):
+            self.frames.append(steps.copies())  # each copy is generated when it is read
+        else:
+            self.frames.append(iter(steps))
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        frames = self.frames
+        while len(frames) > 0:
+            frame = frames[-1]
+            if type(frame) is list:
+                steps, position = frame
+                if position >= len(steps):
+                    frames.pop()
+                    continue
+                frame[1] = position + 1
+                step = steps[position]
+            else:
+                step = next(frame, _END)
+                if step is _END:
+                    frames.pop()
+                    continue
+            if expands(step):
+                self.inject(step)
+                continue
+            return step
+        raise StopIteration
+
+    def next_run(self, is_run_step, max_length: int) -> list:
+        '''
+        Read the run of consecutive steps for which is_run_step(step) is True, starting with the next step.
+
+        The run may continue from one frame into the next (e.g. from the end of one layer into the next layer).
+
+        Args:
+            is_run_step (function): Returns True for steps that can be included in the run. Results are assumed to
+                be the same for all steps of the same type.
+            max_length (int): The maximum number of steps in the run.
+
+        Returns:
+            list: The steps in the run (empty if the next step is not a run step). The first step after the run
+            is not read.
+        '''
+        frames = self.frames
+        run = []
+        while len(run) < max_length and len(frames) > 0:
+            frame = frames[-1]
+            if type(frame) is list:
+                steps, position = frame
+                end = position
+                limit = min(len(steps), position + max_length - len(run))
+                run_type = None  # the type of the previous step, which does not need to be checked again
+                while end < limit:
+                    step_type = type(steps[end])
+                    if step_type is not run_type:
+                        if not is_run_step(steps[end]):
+                            break
+                        run_type = step_type
+                    end += 1
+                if end > position:
+                    if len(run) == 0:
+                        run = steps[position:end]
+                    else:
+                        run.extend(steps[position:end])
+                    frame[1] = end
+                if end < len(steps):
+                    break
+                frames.pop()
+            else:
+                step = next(frame, _END)
+                if step is _END:
+                    frames.pop()
+                elif is_run_step(step) and not expands(step):
+                    run.append(step)
+                else:
+                    frames.append([[step], 0])  # the step is read again by the next call to __next__
+                    break
+        return run
+
+    def lookahead(self, until) -> list:
+        '''
+        Read steps ahead without removing them from the source, up to and including the first step for which
+        until(step) is True (or all remaining steps).
+
+        Args:
+            until (function): Returns True for the last step to read ahead.
+
+        Returns:
+            list: The steps read ahead. They are read again by the next calls to __next__.
+        '''
+        steps = []
+        for step in self:
+            steps.append(step)
+            if until(step):
+                break
+        self.frames.append([steps, 0])
+        return steps
+
+
+class LazySteps:
+    '''
+    A design that is generated again each time it is iterated, by calling function(*args), e.g. the result of
+    fc.flatten(steps, lazy=True) or fc.move(steps, vector, copy=True, lazy=True).
+
+    Unlike a generator, it can be read more than once (e.g. plots read the design once to find the bounding box and
+    number of points, and again to plot it), but steps are never all held in memory at once. Iterating gives a
+    StepSource, so nested lists, generators and Transforms in the design are expanded as they are read.
+
+    Args:
+        function: A function that returns an iterable of steps.
+        *args: The arguments for function.
+    '''
+
+    def __init__(self, function, *args):
+        self.function = function
+        self.args = args
+
+    def __repr__(self):
+        return f'LazySteps({getattr(self.function, "__name__", self.function)})'
+
+    def __iter__(self):
+        return StepSource(self.function(*self.args))
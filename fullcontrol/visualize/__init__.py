@@ -1,9 +1,19 @@
 
 # import classes
 from fullcontrol.visualize.point import Point
+from fullcontrol.visualize.point_array import PointArray
 from fullcontrol.visualize.annotations import PlotAnnotation
 from fullcontrol.visualize.controls import PlotControls
 from fullcontrol.visualize.extrusion_classes import Extruder, ExtrusionGeometry
 
 # import functions
-from fullcontrol.visualize.steps2visualization import visualize
+# functions are imported when they are first used (PEP 562 module __getattr__), so that 'import fullcontrol' does not
+# import the plotting modules until a plot is created
+
+
+def __getattr__(name):
+    if name == 'visualize':
+        from fullcontrol.visualize.steps2visualization import visualize
+        globals()['visualize'] = visualize
+        return visualize
+    raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
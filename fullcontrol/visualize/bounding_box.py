@@ -1,7 +1,7 @@
 from pydantic import BaseModel
 from typing import Optional
 
-from fullcontrol.common import Point
+from fullcontrol.common import Point, SlottedPoint, PointArray
 
 
 class BoundingBox(BaseModel):
@@ -38,16 +38,24 @@ class BoundingBox(BaseModel):
     maxz: Optional[float] = None
     rangez: Optional[float] = None
 
-    def calc_bounds(self, steps):
+    def calc_bounds(self, steps, summary=None):
         '''
         Calculate the bounds and other useful geometric measures of the bounding box for all points in a list of steps.
 
         Args:
             steps (List[Point]): A list of points representing the steps.
+            summary (DesignSummary, optional): If the summary includes the bounds, they are used rather than
+                reading the steps. Defaults to None.
 
         Returns:
             None
         '''
+        if summary is not None and summary.point_count is not None:
+            # the bounds were found when the design was checked (see fullcontrol/check.py)
+            self.minx, self.maxx, self.miny, self.maxy, self.minz, self.maxz = \
+                summary.minx, summary.maxx, summary.miny, summary.maxy, summary.minz, summary.maxz
+            self.calc_mid_range()
+            return
         self.minx = 1e10  # initial high value always overwritten
         self.miny = 1e10  # initial high value always overwritten
         self.minz = 1e10  # initial high value always overwritten
@@ -55,7 +63,7 @@ class BoundingBox(BaseModel):
         self.maxy = -1e10  # initial low value always overwritten
         self.maxz = -1e10  # initial low value always overwritten
         for step in steps:
-            if isinstance(step, Point):
+            if isinstance(step, (Point, SlottedPoint)):
                 if (x := step.x) is not None:
                     self.minx = min(self.minx, x)
                     self.maxx = max(self.maxx, x)
@@ -65,6 +73,17 @@ class BoundingBox(BaseModel):
                 if (z := step.z) is not None:
                     self.minz = min(self.minz, z)
                     self.maxz = max(self.maxz, z)
+            elif isinstance(step, PointArray) and len(step.xyz) > 0:
+                import numpy as np
+                mins, maxs = np.fmin.reduce(step.xyz, axis=0), np.fmax.reduce(step.xyz, axis=0)  # nan values ignored
+                for axis, min_value, max_value in zip('xyz', mins.tolist(), maxs.tolist()):
+                    if min_value == min_value:  # not nan (i.e. at least one value defined)
+                        setattr(self, f'min{axis}', min(getattr(self, f'min{axis}'), min_value))
+                        setattr(self, f'max{axis}', max(getattr(self, f'max{axis}'), max_value))
+        self.calc_mid_range()
+
+    def calc_mid_range(self):
+        'calculate mid values and ranges from the bounds'
         self.midx = (self.minx + self.maxx) / 2
         self.midy = (self.miny + self.maxy) / 2
         self.midz = (self.minz + self.maxz) / 2
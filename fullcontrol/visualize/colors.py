@@ -0,0 +1,135 @@
+import numpy as np
+from typing import Optional
+from math import tau
+from random import random
+from fullcontrol.gcode.array_formatting import round_numbers
+
+# colors of points in a plot for each PlotControls.color_type. they are calculated for all points of a plot at once
+# (see PlotData.update_colors) from arrays of z values and point counts, rather than for each point as it is added.
+# for plotly, the colors of a path are given as numbers with a colorscale, rather than a color string for each point
+
+PRECISION_COLOR = 3  # number of decimal places to use for colors in plot_data
+TRAVEL_COLOR = [0.75, 0.5, 0.5]
+FLUCTUATIONS = 5  # number of color cycles in a print for color_type 'print_sequence_fluctuating'
+STOPS_PER_CYCLE = 32  # colorscale stops for each color cycle of 'print_sequence_fluctuating'
+COLOR_TYPES = ['manual', 'random_blue', 'z_gradient', 'print_sequence', 'print_sequence_fluctuating']
+
+
+def point_colors(color_type: str, extruding: np.ndarray, z: np.ndarray, counts: np.ndarray, point_count_total: int,
+                 bounding_box) -> np.ndarray:
+    '''
+    Calculate the [r, g, b] color of each point for a color_type other than 'manual'.
+
+    Args:
+        color_type (str): PlotControls.color_type.
+        extruding (np.ndarray): Boolean array of whether the extruder is on for the path of each point.
+        z (np.ndarray): The z value of each point.
+        counts (np.ndarray): The number of points in the design before each point (see State.point_count_now).
+        point_count_total (int): The number of points in the design.
+        bounding_box (BoundingBox): The bounding box of the design.
+
+    Returns:
+        np.ndarray: Colors with shape (n, 3) and values 0-1, rounded to PRECISION_COLOR decimal places.
+    '''
+    if color_type not in COLOR_TYPES[1:]:
+        raise Exception(f'colour {color_type} not in list of allowable color types')
+    colors = np.empty((len(z), 3))
+    colors[:] = TRAVEL_COLOR
+    n = int(np.count_nonzero(extruding))
+    if n == 0:
+        return colors
+    z, counts = z[extruding], counts[extruding]
+    if color_type == 'random_blue':
+        values = [0.1, round_numbers(np.array([random() for _ in range(n)]), PRECISION_COLOR), 2]
+    elif color_type == 'z_gradient':
+        z_range = max(bounding_box.rangez, 0.00000001)
+        # round to the same number of decimal places used for xyz ('precision_xyz') to avoid numerical rounding errors causing negative or very large (not allowbale) values in plot_data
+        z_min = round(bounding_box.minz, 3)
+        values = [0, round_numbers((z - z_min)/z_range, PRECISION_COLOR), 1]
+    elif color_type == 'print_sequence':
+        fraction = 2*counts/point_count_total
+        values = [round_numbers(0.8*np.maximum(1 - fraction, 0), PRECISION_COLOR), round_numbers(np.maximum(fraction - 1, 0), PRECISION_COLOR), 1]
+    else:
+        point_count_fluc = point_count_total / FLUCTUATIONS
+        angles = (((counts % point_count_fluc) + 0.00001)/point_count_fluc)*tau
+        values = [round_numbers(0.25 + 0.25*np.sin(angles), PRECISION_COLOR), round_numbers(0.5 - 0.5*np.cos(angles), PRECISION_COLOR), 1]
+    for i, value in enumerate(values):
+        colors[extruding, i] = value
+    return colors
+
+
+def point_color_ints(color_type: str, extruding: np.ndarray, counts: np.ndarray, point_count_total: int) -> np.ndarray:
+    '''
+    Return flags for which [r, g, b] values of the colors from point_colors() are integers (bit 0 for r), as they are
+    for colors calculated one point at a time (e.g. [0, 0.5, 1] for 'z_gradient'). See PlotBuffer in path.py.
+
+    Args:
+        color_type (str): PlotControls.color_type.
+        extruding (np.ndarray): Boolean array of whether the extruder is on for the path of each point.
+        counts (np.ndarray): The number of points in the design before each point (see State.point_count_now).
+        point_count_total (int): The number of points in the design.
+
+    Returns:
+        np.ndarray: The flags for each point (0 for travel colors).
+    '''
+    if color_type == 'z_gradient':
+        ints = np.full(len(counts), 0b101, dtype=np.uint8)
+    elif color_type == 'print_sequence':
+        # green is max(value, 0), which is the integer 0 for the first half of the print
+        ints = np.where(2*counts/point_count_total - 1 < 0, 0b110, 0b100).astype(np.uint8)
+    else:
+        ints = np.full(len(counts), 0b100, dtype=np.uint8)
+    ints[~extruding] = 0
+    return ints
+
+
+def rgb_string(color: list) -> str:
+    'return a plotly color string for [r, g, b] with values 0-1'
+    return f'rgb({color[0]*255:.2f}, {color[1]*255:.2f}, {color[2]*255:.2f})'
+
+
+def rgb_strings(colors: np.ndarray) -> np.ndarray:
+    'return an array of plotly color strings for an array of [r, g, b], formatting each distinct color only once'
+    unique, inverse = np.unique(colors, axis=0, return_inverse=True)
+    return np.array([rgb_string(color) for color in unique.tolist()], dtype=object)[inverse.reshape(-1)]
+
+
+def fluctuating_color(cycles: np.ndarray) -> np.ndarray:
+    'return the unrounded colors for print_sequence_fluctuating, for a number of color cycles since the first point'
+    return np.stack((0.25 + 0.25*np.sin(cycles*tau), 0.5 - 0.5*np.cos(cycles*tau), np.ones(len(cycles))), axis=1)
+
+
+def colorscale_values(color_type: str, colors: np.ndarray) -> Optional[dict]:
+    '''
+    Return numbers that plotly maps to the colors of the points in a path through a colorscale, so that a color
+    string is not needed for each point.
+
+    Args:
+        color_type (str): PlotControls.color_type.
+        colors (np.ndarray): The [r, g, b] colors of the points in a path with the extruder on (see point_colors()).
+
+    Returns:
+        dict: 'values' (np.ndarray) with a number for each point, and 'colorscale', 'cmin' and 'cmax' for plotly. None
+        for color_type 'manual', since designed colors cannot be given by one colorscale.
+    '''
+    if color_type == 'random_blue' or color_type == 'z_gradient':
+        # only the green value changes
+        low, high = colors[0].tolist(), colors[0].tolist()
+        low[1], high[1] = 0, 1
+        return {'values': colors[:, 1], 'colorscale': [[0, rgb_string(low)], [1, rgb_string(high)]], 'cmin': 0, 'cmax': 1}
+    if color_type == 'print_sequence':
+        # red decreases from 0.8 to 0 for the first half of the print, then green increases from 0 to 1
+        values = np.where(colors[:, 0] > 0, 0.5 - colors[:, 0]/1.6, 0.5 + colors[:, 1]/2)
+        return {'values': values, 'colorscale': [[0, rgb_string([0.8, 0, 1])], [0.5, rgb_string([0, 0, 1])], [1, rgb_string([0, 1, 1])]],
+                'cmin': 0, 'cmax': 1}
+    if color_type == 'print_sequence_fluctuating':
+        # the number of color cycles since the start of the print (unwrapped so values increase along the path),
+        # with a colorscale that repeats the cycle
+        angles = np.unwrap(np.arctan2((colors[:, 0] - 0.25)/0.25, (0.5 - colors[:, 1])/0.5))
+        values = angles/tau
+        cmin, cmax = float(np.floor(values.min())), float(np.ceil(values.max()))
+        cmax = max(cmax, cmin + 1)
+        stops = np.linspace(cmin, cmax, round(cmax - cmin)*STOPS_PER_CYCLE + 1)
+        colorscale = [[(stop - cmin)/(cmax - cmin), rgb_string(color)] for stop, color in zip(stops.tolist(), fluctuating_color(stops).tolist())]
+        return {'values': values, 'colorscale': colorscale, 'cmin': cmin, 'cmax': cmax}
+    return None
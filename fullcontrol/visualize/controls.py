@@ -19,6 +19,10 @@ class PlotControls(BaseModel):
         hide_axes (Optional[bool]): Whether to hide axes in the plot. Default is False.
         neat_for_publishing (Optional[bool]): Whether to optimize the plot for publishing. Default is False.
         raw_data (Optional[bool]): Whether to show raw data in the plot. Default is False.
+        simplify (Optional[bool]): Whether to simplify extruded paths before plotting, by removing points that are not needed to show the paths, their colors and widths/heights within simplify_tolerance, so that very large designs can be previewed. Travel paths are unchanged. The number of points removed is shown on the plot (and printed if show_tips is True). Default is False.
+        simplify_tolerance (Optional[float]): The maximum deviation of simplified paths, as a fraction of the size of the design (its largest dimension). Default is 0.0005.
+        merge_traces (Optional[bool]): Whether to combine all extruded paths into one plotly trace (and all travel paths into another), instead of one trace for each path, so that designs with many separate paths are plotted and rendered much faster. Default is False.
+        processes (Optional[int]): The number of processes used to generate the tube meshes of paths in parallel for large designs. The plot is identical to that generated by one process. Defaults to None (one process).
         printer_name (Optional[str]): The name of the printer. Default is 'generic'.
         initialization_data (Optional[dict]): Information about initial printing conditions. Default is an empty dictionary. Values passed for initialization_data overwrite the default initialization_data of the printer.
     """
@@ -33,6 +37,10 @@ class PlotControls(BaseModel):
     hide_axes: Optional[bool] = False
     neat_for_publishing: Optional[bool] = False
     raw_data: Optional[bool] = False
+    simplify: Optional[bool] = False
+    simplify_tolerance: Optional[float] = 0.0005
+    merge_traces: Optional[bool] = False
+    processes: Optional[int] = None
     printer_name: Optional[str] = 'generic'
     # initialization_data is information about initial printing conditions, which may be changed by the fullcontrol 'design', whereas the above attributes are never changed by the 'design'
     initialization_data: Optional[dict] = {}  # values passed for initialization_data overwrite the default initialization_data of the printer
@@ -28,13 +28,11 @@ class Extruder(BaseExtruder):
         if self.on != None and self.on != state.extruder.on:
             state.extruder.on = self.on
             # if path has more than one point in it (so there is at least a single line plotted), add new path, otherwise change state of the current path
-            if len(plot_data.paths[-1].xvals) > 1:
+            if len(plot_data.paths[-1]) > 1:
                 plot_data.add_path(state, plot_data, plot_controls)
                 state.path_count_now += 1
             else:
                 plot_data.paths[-1].extruder.on = self.on
-                state.point.update_color(state, plot_data, plot_controls)
-                if len(plot_data.paths[-1].colors) > 0: plot_data.paths[-1].colors[-1] = state.point.color
 
 
 class ExtrusionGeometry(BaseExtrusionGeometry):
@@ -0,0 +1,82 @@
+import multiprocessing
+from fullcontrol.visualize.path import Path, PlotBuffer
+
+# the tube meshes of the paths of a plot or 3D model are independent of each other, so they are generated in parallel
+# by splitting the paths into sections with a similar number of points, which are processed in separate processes (see
+# PlotControls.processes and ModelControls.processes). each section is sent to a worker process with copies of its
+# paths that only contain their own points (the paths of a plot share one buffer of points). the meshes of each section
+# are returned in order, so the result is identical to meshes generated by one process
+
+SECTIONS_PER_PROCESS = 4  # more sections than processes so that processes finishing early can start another section
+MIN_SECTION_POINTS = 25000  # smaller sections are not worth the overhead of sending them to another process
+
+def section_starts(path_lengths: list, processes: int) -> list:
+    '''
+    Return the index of the first path in each section, so that sections have a similar number of points.
+
+    Args:
+        path_lengths (list): The number of points in each path.
+        processes (int): The number of processes.
+
+    Returns:
+        list: The start index of each section (a single section starting at 0 if there are too few points to split).
+    '''
+    total = sum(path_lengths)
+    sections = max(1, min(processes * SECTIONS_PER_PROCESS, len(path_lengths), total // MIN_SECTION_POINTS))
+    starts, points = [0], 0
+    for i, length in enumerate(path_lengths[:-1]):
+        points += length
+        if points >= total * len(starts) / sections:
+            starts.append(i + 1)
+    return starts
+
+
+def standalone_path(path: Path) -> Path:
+    'return a copy of path with a buffer of only its own points, so it can be pickled without the points of other paths'
+    points = path.points
+    buffer = PlotBuffer(capacity=len(points))
+    buffer.add_rows(points)
+    return Path(extruder=path.extruder, buffer=buffer, start=0, end=len(points))
+
+
+def mesh_section(section: tuple) -> list:
+    '''
+    Generate the meshes for a section of paths (called in a worker process).
+
+    Args:
+        section (tuple): (paths, colors, mesh_args). paths and colors are the paths of this section and their colors.
+            mesh_args are the other arguments of generate_mesh().
+
+    Returns:
+        list: (mesh, local_max) for each path (see generate_meshes() in plotly.py).
+    '''
+    from fullcontrol.visualize import plotly
+    paths, colors, mesh_args = section
+    results = []
+    for path, colors_now in zip(paths, colors):
+        mesh = plotly.generate_mesh(path, *mesh_args, colors_now)
+        results.append((mesh, plotly.local_max))
+    return results
+
+
+def parallel_meshes(paths: list, colors: list, processes: int, mesh_args: tuple) -> list:
+    '''
+    Generate the mesh of each path in parallel in several processes.
+
+    Args:
+        paths (list): The extruded paths to generate meshes for.
+        colors (list): colors_now for each path (see generate_mesh() in plotly.py).
+        processes (int): The number of processes.
+        mesh_args (tuple): (linewidth_now, Mesh, sides, rounding_strength, flat_sides) for generate_mesh().
+
+    Returns:
+        list: (mesh, local_max) for each path, in the order of the paths.
+    '''
+    starts = section_starts([len(path) for path in paths], processes)
+    ends = starts[1:] + [len(paths)]
+    # sections are created as they are sent to worker processes
+    sections = (([standalone_path(path) for path in paths[start:end]], colors[start:end], mesh_args) for start, end in zip(starts, ends))
+    # fork (where available) starts processes without importing the designer's script again
+    fork = 'fork' in multiprocessing.get_all_start_methods()
+    with multiprocessing.get_context('fork' if fork else None).Pool(processes) as pool:
+        return [result for results in pool.imap(mesh_section, sections) for result in results]
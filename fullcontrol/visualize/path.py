@@ -1,34 +1,214 @@
 from pydantic import BaseModel
-from typing import Optional, TYPE_CHECKING
+from typing import Optional, Any, TYPE_CHECKING
 # from fullcontrol.vis_OO2.color import PathColors, Color
 from fullcontrol.common import Extruder, ExtrusionGeometry
 from fullcontrol.visualize.point import Point
+from fullcontrol.visualize.point_array import nan_to_none
 
 if TYPE_CHECKING:
     from fullcontrol.visualize.state import State
 
+# fields of the structured array of points in a PlotBuffer
+POINT_DTYPE = [('xyz', 'f8', 3), ('color', 'f8', 3), ('width', 'f8'), ('height', 'f8'), ('count', 'i8'), ('color_ints', 'u1')]
+NO_COLOR = (None, None, None)  # stored as nan, for points without a color (color_type 'manual' without colors)
+BLOCK_SIZE = 10000  # number of single points collected before they are added to the array
+LIST_FIELDS = ['xvals', 'yvals', 'zvals', 'colors', 'widths', 'heights']  # values of a Path that are stored in its PlotBuffer
+
+
+def color_ints(color) -> int:
+    'return flags for which values of color ([r, g, b]) are integers (bit 0 for r, see PlotBuffer)'
+    return (type(color[0]) is int) | (type(color[1]) is int) << 1 | (type(color[2]) is int) << 2
+
+
+class PlotBuffer:
+    '''
+    Columnar storage for the points of all paths in a plot, in the order they are added. Each Path is a range of rows.
+
+    Points are kept in one structured NumPy array with fields 'xyz', 'color', 'width', 'height', 'count' (the
+    number of points in the design before each point, see State.point_count_now, for colors) and 'color_ints' (flags
+    for which [r, g, b] values are integers, bit 0 for r, so that colors such as [0, 0.5, 1] are returned as they were
+    given, see Path.colors). The array is
+    preallocated (see PlotData) and grows when it is full. Single points (see Path.add_point) are collected in a list
+    and added to the array in blocks, since setting one row of a NumPy array is slower than appending to a list.
+    Undefined values (None) are stored as nan.
+
+    Attributes:
+        capacity (int): The number of rows allocated when the first points are added.
+        array (np.ndarray): The structured array of points (None until points are added). Only the first 'size' rows
+            are used.
+        size (int): The number of points in the array.
+        pending (list): Points not yet added to the array, as tuples (x, y, z, r, g, b, width, height, count, color_ints).
+    '''
+
+    def __init__(self, capacity: int = 1024):
+        self.capacity = max(capacity, 1)
+        self.array = None
+        self.size = 0
+        self.pending = []
+
+    def __len__(self):
+        return self.size + len(self.pending)
+
+    def reserve(self, size: int):
+        'make sure the array has room for at least size points'
+        import numpy as np
+        if self.array is None:
+            self.array = np.empty(max(self.capacity, size), dtype=POINT_DTYPE)
+        elif size > len(self.array):
+            array = np.empty(max(size, len(self.array) + len(self.array)//2), dtype=POINT_DTYPE)
+            array[:self.size] = self.array[:self.size]
+            self.array = array
+
+    def add_point(self, xyz: tuple, color: list, width: float, height: float, count: int):
+        'add a single point (x y z values may be None)'
+        if color is None:
+            self.pending.append((*xyz, *NO_COLOR, width, height, count, 0))
+        else:
+            self.pending.append((*xyz, *color, width, height, count, color_ints(color)))
+        if len(self.pending) >= BLOCK_SIZE:
+            self.flush()
+
+    def add_points(self, xyz, colors, widths, heights, counts):
+        '''
+        Add several points at once.
+
+        Args:
+            xyz (np.ndarray): x y z values with shape (n, 3), with nan for undefined values.
+            colors (list | np.ndarray): [r, g, b] (or None) for each point, or an array with shape (n, 3), or None if
+                colors are not yet known (see PlotData.update_colors). Integer values are only kept for a list.
+            widths (float | np.ndarray): The width for all points or for each point.
+            heights (float | np.ndarray): The height for all points or for each point.
+            counts (np.ndarray): The number of points in the design before each point.
+        '''
+        import numpy as np
+        self.flush()
+        ints = 0
+        if colors is None:
+            colors = np.nan
+        elif not isinstance(colors, np.ndarray):
+            ints = [0 if color is None else color_ints(color) for color in colors]
+            colors = np.array([NO_COLOR if color is None else color for color in colors], dtype=float).reshape(-1, 3)
+        self.write(xyz, colors, widths, heights, counts, ints)
+
+    def flush(self):
+        'add pending single points to the array'
+        if len(self.pending) > 0:
+            import numpy as np
+            values = np.array(self.pending, dtype=float)  # None becomes nan
+            self.pending = []
+            self.write(values[:, 0:3], values[:, 3:6], values[:, 6], values[:, 7], values[:, 8], values[:, 9])
+
+    def write(self, xyz, colors, widths, heights, counts, ints):
+        self.reserve(self.size + len(xyz))
+        rows = self.array[self.size:self.size + len(xyz)]
+        rows['xyz'], rows['color'], rows['width'], rows['height'], rows['count'] = xyz, colors, widths, heights, counts
+        rows['color_ints'] = ints
+        self.size += len(xyz)
+
+    def add_rows(self, rows):
+        'add rows of a structured array of points (see POINT_DTYPE)'
+        self.flush()
+        self.reserve(self.size + len(rows))
+        self.array[self.size:self.size + len(rows)] = rows
+        self.size += len(rows)
+
+    def row(self, index: int) -> tuple:
+        'return the point at index (counted from the first point in the buffer) as (x, y, z, r, g, b, width, height, count)'
+        if index >= self.size:
+            return self.pending[index - self.size][:9]
+        point = self.array[index]
+        return (*point['xyz'].tolist(), *point['color'].tolist(), float(point['width']), float(point['height']), int(point['count']))
+
+    def points(self, start: int = 0, end: Optional[int] = None):
+        'return a view of rows start to end of the structured array (end=None for all points from start)'
+        import numpy as np
+        self.flush()
+        if self.array is None:
+            return np.empty(0, dtype=POINT_DTYPE)
+        return self.array[start:self.size if end is None else end]
+
 
 class Path(BaseModel):
     """
     A class representing a path to be plotted.
 
+    The points of the path are rows start to end of a PlotBuffer, which is shared by all paths of a plot. The
+    structured array of points is accessed with `points` (fields 'xyz', 'color', 'width', 'height', 'count' and
+    'color_ints', with nan for undefined values) and the values are also available as lists with the attributes
+    below. The lists may also be given when a Path is created (e.g. Path(xvals=[...], yvals=[...], zvals=[...])), in
+    which case they are added to the buffer as points. They are read-only after that.
+
     Attributes:
-        xvals (Optional[list]): List of x-values for the line.
-        yvals (Optional[list]): List of y-values for the line.
-        zvals (Optional[list]): List of z-values for the line.
-        colors (Optional[list]): List of [r, g, b] values for the line color.
+        xvals (list): List of x-values for the line.
+        yvals (list): List of y-values for the line.
+        zvals (list): List of z-values for the line.
+        colors (list): List of [r, g, b] values for the line color.
         extruder (Optional[Extruder]): Information about the extruder state for the path.
-        widths (Optional[list]): List of widths for the line.
-        heights (Optional[list]): List of heights for the line.
+        widths (list): List of widths for the line.
+        heights (list): List of heights for the line.
+        buffer (Optional[PlotBuffer]): The buffer of points (a new one is created if not given).
+        start (Optional[int]): The index of the first point of the path in the buffer.
+        end (Optional[int]): The index after the last point of the path in the buffer, or None for the path that
+            points are currently added to.
     """
 
-    xvals: Optional[list] = []
-    yvals: Optional[list] = []
-    zvals: Optional[list] = []
-    colors: Optional[list] = []  # [r,g,b]
     extruder: Optional[Extruder] = None
-    widths: Optional[list] = []
-    heights: Optional[list] = []
+    buffer: Optional[Any] = None
+    start: Optional[int] = 0
+    end: Optional[int] = None
+
+    def __init__(self, **data):
+        values = [data.pop(name, None) for name in LIST_FIELDS]
+        super().__init__(**data)
+        if self.buffer is None:
+            self.buffer = PlotBuffer()
+        if any(value is not None for value in values):
+            if self.end != None or self.start != len(self.buffer):
+                raise Exception(f'{", ".join(LIST_FIELDS)} can only be given for a Path with a new buffer or at the end of a buffer')
+            length = max(len(value) for value in values if value is not None)
+            values = [[None]*length if value is None else value for value in values]
+            if any(len(value) != length for value in values):
+                raise Exception(f'{", ".join(LIST_FIELDS)} must all have the same length')
+            for count, (x, y, z, color, width, height) in enumerate(zip(*values)):
+                self.buffer.add_point((x, y, z), color, width, height, count)
+
+    def __len__(self):
+        return (len(self.buffer) if self.end is None else self.end) - self.start
+
+    def __repr_args__(self):
+        return [('xvals', self.xvals), ('yvals', self.yvals), ('zvals', self.zvals), ('colors', self.colors),
+                ('extruder', self.extruder), ('widths', self.widths), ('heights', self.heights)]
+
+    @property
+    def points(self):
+        'the structured array of points in this path (a view of the buffer, not a copy)'
+        return self.buffer.points(self.start, self.end)
+
+    @property
+    def xvals(self) -> list:
+        return nan_to_none(self.points['xyz'][:, 0])
+
+    @property
+    def yvals(self) -> list:
+        return nan_to_none(self.points['xyz'][:, 1])
+
+    @property
+    def zvals(self) -> list:
+        return nan_to_none(self.points['xyz'][:, 2])
+
+    @property
+    def colors(self) -> list:
+        points = self.points
+        return [None if color[0] != color[0] else color if ints == 0 else [int(value) if ints >> i & 1 else value for i, value in enumerate(color)]
+                for color, ints in zip(points['color'].tolist(), points['color_ints'].tolist())]
+
+    @property
+    def widths(self) -> list:
+        return nan_to_none(self.points['width'])
+
+    @property
+    def heights(self) -> list:
+        return nan_to_none(self.points['height'])
 
     def add_point(self, state: 'State'):
         """
@@ -37,9 +217,18 @@ class Path(BaseModel):
         Args:
             state ('State'): The state containing the point to be added.
         """
-        self.xvals.append(state.point.x)
-        self.yvals.append(state.point.y)
-        self.zvals.append(state.point.z)
-        self.colors.append(state.point.color)
-        self.widths.append(state.extrusion_geometry.width)
-        self.heights.append(state.extrusion_geometry.height)
+        self.buffer.add_point((state.point.x, state.point.y, state.point.z), state.point.color,
+                              state.extrusion_geometry.width, state.extrusion_geometry.height, state.point_count_now)
+
+    def add_points(self, xyz, colors: list, state: 'State'):
+        """
+        Append several points to this path, all with the current extrusion geometry.
+
+        Args:
+            xyz (np.ndarray): x y z values with shape (n, 3), with nan for undefined values.
+            colors (list): [r, g, b] for each point, or None if colors are calculated later (see PlotData.update_colors).
+            state ('State'): The state containing the extrusion geometry and the number of points before these points.
+        """
+        import numpy as np
+        self.buffer.add_points(xyz, colors, state.extrusion_geometry.width, state.extrusion_geometry.height,
+                               state.point_count_now + np.arange(len(xyz)))
@@ -1,8 +1,8 @@
 from pydantic import BaseModel
-from typing import Optional, TYPE_CHECKING
+from typing import Optional, Any, TYPE_CHECKING
 from fullcontrol.visualize.extrusion_classes import Extruder
 from fullcontrol.visualize.bounding_box import BoundingBox
-from fullcontrol.visualize.path import Path
+from fullcontrol.visualize.path import Path, PlotBuffer
 from fullcontrol.visualize.controls import PlotControls
 
 if TYPE_CHECKING:
@@ -14,7 +14,9 @@ if TYPE_CHECKING:
 class PlotData(BaseModel):
     '''
     A class representing a list of Paths (path.py), each with details about x, y, z values, [r,g,b] colors, and the 
-    state of the extruder. A new path is created each time the extruder changes on/off. Data for 
+    state of the extruder. A new path is created each time the extruder changes on/off. The points of all paths are
+    stored in one PlotBuffer (path.py), preallocated for the number of points in the design, and each path is a range
+    of rows in it. Data for 
     annotations of the plot and the bounding box enclosing all paths are also included. A list of 
     steps and pre-initialized State must be passed upon instantiation to allow initialization of 
     various attributes.
@@ -23,36 +25,51 @@ class PlotData(BaseModel):
         paths (Optional[list]): A list of Paths.
         bounding_box (Optional[BoundingBox]): The bounding box enclosing all paths.
         annotations (Optional[list]): A list of annotations for the plot.
+        buffer (Optional[PlotBuffer]): The points of all paths.
+        simplify_report (Optional[SimplifyReport]): The number of points removed by simplify() (None if the paths have
+            not been simplified).
 
     Methods:
         __init__(steps: list, state: 'State'): Initializes the PlotData object with the given steps and state.
         add_path(state: 'State', plot_data: 'PlotData', plot_controls: PlotControls): Adds a new path to the PlotData object.
         add_annotation(annotation: 'PlotAnnotation'): Adds an annotation to the PlotData object.
+        update_colors(state: 'State', plot_controls: PlotControls): Calculates the colors of all points.
+        last_color(state: 'State', plot_controls: PlotControls): Returns the color of the most recently added point.
         cleanup(): Removes single-point paths from the PlotData object.
+        simplify(tolerance: float): Removes points from extruded paths that are not needed to show them within a tolerance.
     '''
     paths: Optional[list] = []  # list of Paths
     bounding_box: Optional[BoundingBox] = BoundingBox()
     annotations: Optional[list] = []
+    buffer: Optional[Any] = None
+    simplify_report: Optional[Any] = None
 
-    def __init__(self, steps: list, state: 'State'):
+    def __init__(self, steps: list, state: 'State', summary=None):
         """
             Initializes a PlotData object.
 
             Args:
                 steps (list): A list of steps.
                 state (State): The state object.
+                summary (DesignSummary, optional): The summary of the design, which includes the bounding box.
 
             Returns:
                 None
             """
         super().__init__()
         # calculate and assign initial values in plot_data'
-        self.bounding_box.calc_bounds(steps)
-        self.paths.append(Path())
+        self.bounding_box.calc_bounds(steps, summary)
+        # each path after the first starts with a copy of the last point of the previous path, so allow for some more
+        self.buffer = PlotBuffer(capacity=state.point_count_total + 1024)
+        self.paths.append(Path(buffer=self.buffer))
         state.path_count_now += 1  # increased since plot_data is initialised with 1 path
         self.paths[-1].extruder = Extruder(on=state.extruder.on)
 
 
+    def __repr_args__(self):
+        return [(name, value) for name, value in super().__repr_args__() if name not in ('buffer', 'simplify_report')]
+
+
     def add_path(self, state: 'State', plot_data: 'PlotData', plot_controls: PlotControls):
         """
         Adds a new path to the list of paths and updates the state, plot data, and plot controls.
@@ -62,8 +79,8 @@ class PlotData(BaseModel):
             plot_data (PlotData): The plot data object.
             plot_controls (PlotControls): The plot controls object.
         """
-        self.paths.append(Path())
-        state.point.update_color(state, plot_data, plot_controls)
+        self.paths[-1].end = len(self.buffer)
+        self.paths.append(Path(buffer=self.buffer, start=len(self.buffer)))
         self.paths[-1].add_point(state)
         # self.paths[-1].colors.add_colors(state, plot_data)
         self.paths[-1].extruder = Extruder(on=state.extruder.on)
@@ -82,6 +99,46 @@ class PlotData(BaseModel):
         self.annotations.append({'label': annotation.label, 'x': annotation.point.x, 'y': annotation.point.y, 'z': annotation.point.z})
 
 
+    def update_colors(self, state: 'State', plot_controls: PlotControls):
+        """
+        Calculate the colors of all points for plot_controls.color_type, for all paths at once (see colors.py). For
+        color_type 'manual', points keep the colors they were given in the design.
+
+        Args:
+            state (State): The state object.
+            plot_controls (PlotControls): The plot controls object.
+        """
+        if plot_controls.color_type == 'manual' or len(self.buffer) == 0:
+            return
+        import numpy as np
+        from fullcontrol.visualize.colors import point_colors, point_color_ints
+        points = self.buffer.points()
+        extruding = np.repeat([path.extruder.on == True for path in self.paths], [len(path) for path in self.paths])
+        points['color'] = point_colors(plot_controls.color_type, extruding, points['xyz'][:, 2], points['count'],
+                                       state.point_count_total, self.bounding_box)
+        points['color_ints'] = point_color_ints(plot_controls.color_type, extruding, points['count'], state.point_count_total)
+
+
+    def last_color(self, state: 'State', plot_controls: PlotControls) -> list:
+        """
+        Return the color of the most recently added point, as it will be calculated by update_colors().
+
+        Args:
+            state (State): The state object.
+            plot_controls (PlotControls): The plot controls object.
+
+        Returns:
+            list: [r, g, b], or state.point.color if no points have been added.
+        """
+        if len(self.buffer) == 0:
+            return state.point.color
+        import numpy as np
+        from fullcontrol.visualize.colors import point_colors
+        x, y, z, r, g, b, width, height, count = self.buffer.row(len(self.buffer) - 1)
+        return point_colors(plot_controls.color_type, np.array([self.paths[-1].extruder.on == True]), np.array([z], dtype=float),
+                            np.array([count]), state.point_count_total, self.bounding_box)[0].tolist()
+
+
     def cleanup(self):
         '''
         Remove single-point paths from the list of paths.
@@ -91,4 +148,33 @@ class PlotData(BaseModel):
         Returns:
             None
         '''
-        self.paths = [path for path in self.paths if len(path.xvals)>1]
+        self.buffer.flush()
+        self.paths[-1].end = len(self.buffer)
+        self.paths = [path for path in self.paths if len(path)>1]
+
+
+    def simplify(self, tolerance: float):
+        '''
+        Remove points from extruded paths that are not needed to show the paths, their colors and extrusion geometry
+        within a tolerance (see simplify.py). Travel paths are unchanged. The result is saved in simplify_report.
+
+        Args:
+            tolerance (float): The maximum deviation of the simplified paths, as a fraction of the size of the
+                bounding box (its largest range in x, y or z).
+
+        Returns:
+            None
+        '''
+        from fullcontrol.visualize.simplify import SimplifyReport, simplify_points
+        box = self.bounding_box
+        tolerance_mm = tolerance * max(box.rangex or 0, box.rangey or 0, box.rangez or 0)
+        self.simplify_report = SimplifyReport(points_before=sum(len(path) for path in self.paths), tolerance=tolerance_mm)
+        if tolerance_mm > 0:
+            buffer = PlotBuffer(capacity=self.simplify_report.points_before)
+            for path in self.paths:
+                points = path.points
+                path.start = len(buffer)
+                buffer.add_rows(points[simplify_points(points, tolerance_mm)] if path.extruder.on == True else points)
+                path.end, path.buffer = len(buffer), buffer
+            self.buffer = buffer
+        self.simplify_report.points_after = sum(len(path) for path in self.paths)
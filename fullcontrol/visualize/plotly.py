@@ -4,9 +4,11 @@ import os
 from fullcontrol.visualize.plot_data import PlotData
 from fullcontrol.visualize.controls import PlotControls
 from fullcontrol.visualize.tube_mesh import CylindersMesh, FlowTubeMesh, MeshExporter
+from fullcontrol.visualize.colors import colorscale_values, rgb_string, rgb_strings
+from fullcontrol.visualize.parallel import parallel_meshes, section_starts
 
 
-def generate_mesh(path, linewidth_now: float, Mesh: FlowTubeMesh, sides, rounding_strength, flat_sides, colors_now: list = None):
+def generate_mesh(path, linewidth_now: float, Mesh: FlowTubeMesh, sides, rounding_strength, flat_sides, colors_now=None):
     """
     Generate a mesh using the given parameters.
 
@@ -17,43 +19,136 @@ def generate_mesh(path, linewidth_now: float, Mesh: FlowTubeMesh, sides, roundin
         sides: The number of sides for the tube in the mesh.
         rounding_strength: The rounding strength for cross-sectional shape of the mesh.
         flat_sides: Boolean value to indicate whether the sides of the tube are flat (as opposed to an edge) instead of the top and bottom (imagine a hexagonal tube).
-        colors_now: The list of colors for the mesh at each point along the length.
+        colors_now: The colors for the mesh at each point along the length (an array of color strings or numbers for
+            a colorscale), or a single color. They are stored in the mesh metadata for mesh.to_Mesh3d().
 
     Returns:
         The generated mesh object.
 
     """
     global local_max # allow external tracking for nice plot boundaries
-    path_points = np.array([path.xvals, path.yvals, path.zvals]).T
+    points = path.points  # structured array (see PlotBuffer) - a view, so rows are selected below before use
+    path_points = points['xyz']
     good_points = np.ones(len(path_points), dtype=bool)
     dups = np.all(np.diff(path_points, axis=0)==0, axis=1)
     if np.any(dups):
         # remove successive duplicate points so TubeMesh can be generated
         good_points[1:] = ~dups
-        if colors_now is not None:
-            # for stl generation, no colors are required so this is necessary
-            # modify colors list so the new ones are accessible outside the function
-            colors_now[:] = np.array(colors_now, dtype=object)[good_points]
+    if colors_now is not None and not isinstance(colors_now, str):
+        # for stl generation, no colors are required so this is necessary
+        colors_now = colors_now[good_points]
     path_points = path_points[good_points]
     capped = False
-    widths = path.widths
-    if not widths:  # TODO: check whether it's ever reasonable for a user to not define the widths for their extrusion path
+    if len(points) == 0:  # TODO: check whether it's ever reasonable for a user to not define the widths for their extrusion path
         local_max = widths = linewidth_now/10
+        heights = None
     else:
-        widths = np.array(widths)[good_points]
+        widths = points['width'][good_points]
+        heights = points['height'][good_points]
         if Mesh == CylindersMesh:
-            widths = widths[1:]
+            widths, heights = widths[1:], heights[1:]
         local_max = max(widths)
-    heights = path.heights or None
-    if heights:
-        heights = np.array(heights)[good_points]
-        if Mesh == CylindersMesh:
-            heights = heights[1:]
     return Mesh(path_points, widths=widths, heights=heights, sides=sides, capped=capped, inplace_path=True,
-                rounding_strength=rounding_strength, flat_sides=flat_sides)
- 
+                rounding_strength=rounding_strength, flat_sides=flat_sides, metadata={'colors': colors_now})
+
+
+def generate_meshes(paths: list, colors: list, processes: int, *mesh_args) -> list:
+    '''
+    Generate the mesh of each path with generate_mesh(), in parallel processes for large designs (see parallel.py).
+
+    Args:
+        paths (list): The paths.
+        colors (list): colors_now for each path (see generate_mesh()), or None if colors are not required (e.g. for stl).
+        processes (int): The number of processes (PlotControls.processes or ModelControls.processes), or None for one.
+        mesh_args: The other arguments of generate_mesh() (linewidth_now, Mesh, sides, rounding_strength, flat_sides).
+
+    Returns:
+        list: (mesh, local_max) for each path, where local_max is the largest width of the path.
+    '''
+    if colors is None:
+        colors = [None]*len(paths)
+    if processes != None and processes > 1 and len(section_starts([len(path) for path in paths], processes)) > 1:
+        return parallel_meshes(paths, colors, processes, mesh_args)
+    results = []
+    for path, colors_now in zip(paths, colors):
+        mesh = generate_mesh(path, *mesh_args, colors_now)
+        results.append((mesh, local_max))
+    return results
+
+
+def trace_colors(colors: np.ndarray, extruding: bool, color_type: str) -> tuple:
+    '''
+    Return colors for the plotly trace of a path, without a color string for each point.
+
+    Args:
+        colors (np.ndarray): The [r, g, b] color of each point in the path.
+        extruding (bool): Whether the extruder is on for the path.
+        color_type (str): PlotControls.color_type.
+
+    Returns:
+        tuple: (colors, colorscale). colors is a single color string if all points have the same color, numbers that
+        are mapped to colors by colorscale (a dict with 'colorscale', 'cmin' and 'cmax', see colors.colorscale_values),
+        or an array of color strings with each distinct color formatted once (colorscale is then an empty dict).
+    '''
+    if len(colors) > 0 and (colors == colors[0]).all():
+        return rgb_string(colors[0].tolist()), {}
+    colorscale = colorscale_values(color_type, colors) if extruding else None
+    if colorscale is not None:
+        return colorscale.pop('values'), colorscale
+    return rgb_strings(colors), {}
 
 
+def merged_mesh(meshes: list, colors: list, color_type: str) -> go.Mesh3d:
+    '''
+    Combine the meshes of extruded paths into one plotly trace (see PlotControls.merge_traces).
+
+    Args:
+        meshes (list): The mesh of each path (see generate_mesh()), generated with colors_now as the index of each point
+            in the path, so the color of each vertex of the mesh can be found.
+        colors (list): The [r, g, b] colors of the points in each path.
+        color_type (str): PlotControls.color_type.
+
+    Returns:
+        go.Mesh3d: The combined mesh.
+    '''
+    colors_now, colorscale = trace_colors(np.concatenate(colors), True, color_type)
+    point_offsets = np.cumsum([0] + [len(path_colors) for path_colors in colors])
+    vertex_offsets = np.cumsum([0] + [len(mesh.mesh_points) for mesh in meshes])
+    mesh_points = np.concatenate([mesh.mesh_points for mesh in meshes])
+    triangles = np.concatenate([mesh.triangles + offset for mesh, offset in zip(meshes, vertex_offsets)])
+    if isinstance(colors_now, str):
+        color_kwargs = {'color': colors_now}
+    else:
+        # the point index of each vertex (given to plotly as intensity by the mesh) selects its color
+        indices = np.concatenate([mesh.mesh3d_kwargs()['intensity'] + offset for mesh, offset in zip(meshes, point_offsets)])
+        if colorscale:
+            color_kwargs = {'intensity': colors_now[indices], 'intensitymode': 'vertex', 'showscale': False, **colorscale}
+        else:
+            color_kwargs = {'vertexcolor': colors_now[indices]}
+    return go.Mesh3d(x=mesh_points[:, 0], y=mesh_points[:, 1], z=mesh_points[:, 2],
+                     i=triangles[:, 0], j=triangles[:, 1], k=triangles[:, 2], **color_kwargs)
+
+
+def merged_lines(paths_points: list, linewidth: float, extruding: bool, color_type: str) -> go.Scatter3d:
+    '''
+    Combine the lines of several paths into one plotly trace, with a gap between paths (see PlotControls.merge_traces).
+
+    Args:
+        paths_points (list): The structured array of points of each path (see PlotBuffer).
+        linewidth (float): The width of the lines.
+        extruding (bool): Whether the extruder is on for the paths.
+        color_type (str): PlotControls.color_type.
+
+    Returns:
+        go.Scatter3d: The combined lines.
+    '''
+    # a row of nan after each path (except the last) breaks the line. it takes the color of the last point in the path
+    xyz = np.concatenate([np.vstack((points['xyz'], np.full((1, 3), np.nan))) for points in paths_points])[:-1]
+    colors = np.concatenate([np.vstack((points['color'], points['color'][-1:])) for points in paths_points])[:-1]
+    colors_now, colorscale = trace_colors(colors, extruding, color_type)
+    return go.Scatter3d(mode='lines', x=xyz[:, 0], y=xyz[:, 1], z=xyz[:, 2], showlegend=False,
+                        line=dict(width=linewidth, color=colors_now, **colorscale))
+
 
 def plot(data: PlotData, controls: PlotControls):
     '''
@@ -78,18 +173,39 @@ def plot(data: PlotData, controls: PlotControls):
 
     # generate line plots
     max_width = 0
+    # for controls.merge_traces, the meshes and colors of extruded paths, and the points of lines for each line width
+    meshes, mesh_colors, lines = [], [], {}
+    # tube meshes for extruded paths are generated first, so they can be generated in parallel (see controls.processes)
+    tube_paths = [path for path in data.paths if path.extruder.on and controls.style == 'tube']
+    tube_colors = [(np.arange(len(path)), {}) if controls.merge_traces else trace_colors(path.points['color'], True, controls.color_type)
+                   for path in tube_paths]
+    sides, rounding_strength, flat_sides = controls.tube_sides, 0.4, False
+    tube_meshes = generate_meshes(tube_paths, [colors_now for colors_now, _ in tube_colors], controls.processes,
+                                  controls.line_width*2, Mesh, sides, rounding_strength, flat_sides)
+    tubes = iter(zip(tube_colors, tube_meshes))
     for path in data.paths:
-        colors_now = [f'rgb({color[0]*255:.2f}, {color[1]*255:.2f}, {color[2]*255:.2f})' for color in path.colors]
+        points = path.points
         linewidth_now = controls.line_width * \
             2 if path.extruder.on == True else controls.line_width*0.5
         if path.extruder.on and controls.style == 'tube':
-            sides, rounding_strength, flat_sides = controls.tube_sides, 0.4, False
-            mesh = generate_mesh(path, linewidth_now, Mesh, sides, rounding_strength, flat_sides, colors_now)
-            fig.add_trace(mesh.to_Mesh3d(colors=colors_now))
+            (colors_now, colorscale), (mesh, local_max) = next(tubes)
+            if controls.merge_traces:
+                meshes.append(mesh)
+                mesh_colors.append(points['color'])
+            else:
+                fig.add_trace(mesh.to_Mesh3d(**colorscale, **({'showscale': False} if colorscale else {})))
             max_width = max(max_width, local_max)
         elif not controls.hide_travel or path.extruder.on:  # plot travel lines for tube and line
-            fig.add_trace(go.Scatter3d(mode='lines', x=path.xvals, y=path.yvals, z=path.zvals,
-                                       showlegend=False, line=dict(width=linewidth_now, color=colors_now)))
+            if controls.merge_traces:
+                lines.setdefault((linewidth_now, path.extruder.on == True), []).append(points)
+            else:
+                colors_now, colorscale = trace_colors(points['color'], path.extruder.on == True, controls.color_type)
+                fig.add_trace(go.Scatter3d(mode='lines', x=points['xyz'][:, 0], y=points['xyz'][:, 1], z=points['xyz'][:, 2],
+                                           showlegend=False, line=dict(width=linewidth_now, color=colors_now, **colorscale)))
+    if len(meshes) > 0:
+        fig.add_trace(merged_mesh(meshes, mesh_colors, controls.color_type))
+    for (linewidth_now, extruding), paths_points in lines.items():
+        fig.add_trace(merged_lines(paths_points, linewidth_now, extruding, controls.color_type))
 
     # find a bounding box, to create a plot with equally proportioned X Y Z scales (so a cuboid looks like a cuboid, not a cube)
     bounding_box_size = max(data.bounding_box.maxx-data.bounding_box.minx, data.bounding_box.maxy -
@@ -151,6 +267,10 @@ def plot(data: PlotData, controls: PlotControls):
                 scene={axis: dict(showgrid=False, zeroline=False, visible=False)})
     if controls.neat_for_publishing:
         fig.update_layout(width=500, height=500)
+    elif data.simplify_report is not None:
+        # say how many points were removed by PlotControls(simplify=True)
+        fig.add_annotation(text=str(data.simplify_report), xref='paper', yref='paper', x=0, y=0, xanchor='left',
+                           yanchor='bottom', showarrow=False, font=dict(size=10, color='grey'))
 
     # cicd_testing is a flag set by the CICD testing script (as a temporary environmental variable) to save the plot as a .png file
     if not cicd_testing:
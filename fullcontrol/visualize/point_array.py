@@ -0,0 +1,101 @@
+from typing import Optional, Any, ClassVar, TYPE_CHECKING
+from fullcontrol.point_array import PointArray as BasePointArray
+from fullcontrol.visualize.point import Point
+from fullcontrol.visualize.controls import PlotControls
+
+if TYPE_CHECKING:
+    from fullcontrol.visualize.state import State
+    from fullcontrol.visualize.plot_data import PlotData
+
+
+def nan_to_none(values) -> list:
+    'convert a 1D array to a list, with nan values converted to None'
+    values = values.tolist()
+    return [None if value != value else value for value in values] if any(value != value for value in values) else values
+
+
+class PointArray(BasePointArray):
+    '''
+    A generic fullcontrol PointArray with a color attribute and visualization methods added.
+
+    Attributes:
+        color (Optional[Any]): The color of all points as [r, g, b] with values 0-1, or a list of [r, g, b] (or None) for each point.
+    '''
+    color: Optional[Any] = None
+    point_class: ClassVar[type] = Point
+
+    def point(self, index: int) -> Point:
+        'return the Point equivalent to a row of the array, including its color'
+        point = super().point(index)
+        colors = self.row_colors()
+        if colors is not None:
+            point.color = colors[index]
+        return point
+
+    def row_colors(self) -> list:
+        'return a list of colors for each row of the array (or None if color is not defined)'
+        if self.color is None:
+            return None
+        colors = self.color.tolist() if hasattr(self.color, 'tolist') else list(self.color)
+        if len(colors) > 0 and isinstance(colors[0], (int, float)):
+            return [colors] * len(self.xyz)  # one color for all points
+        return colors
+
+    def visualize(self, state: 'State', plot_data: 'PlotData', plot_controls: PlotControls):
+        '''
+        Process a PointArray in a list of steps supplied by the designer to update plot_data and state.
+
+        The result is identical to the equivalent list of Points (see Point.visualize), but all rows of the
+        array are processed at once.
+
+        Args:
+            state ('State'): The current state of the plot.
+            plot_data ('PlotData'): The data used for plotting.
+            plot_controls ('PlotControls'): The controls for plotting.
+
+        Returns:
+            None
+        '''
+        import numpy as np
+        from fullcontrol.gcode.array_formatting import round_numbers
+        xyz = self.xyz
+        n = len(xyz)
+        if n == 0:
+            return
+        colors = self.row_colors()
+        if colors is not None and plot_controls.color_type != 'manual':
+            # colors set by the designer are compared to colors calculated for each point, so process points one at a time
+            for i in range(n):
+                self.point(i).visualize(state, plot_data, plot_controls)
+            return
+
+        precision_xyz = 3  # see Point.visualize
+        defined = ~np.isnan(xyz)
+        # x y z values of state.point after each row, which are rounded values of the most recently defined x y z
+        initial = np.array([np.nan if value is None else value for value in (state.point.x, state.point.y, state.point.z)])
+        last_defined = np.where(defined, np.arange(n)[:, None], -1)
+        np.maximum.accumulate(last_defined, axis=0, out=last_defined)
+        after = np.where(last_defined >= 0, np.take_along_axis(round_numbers(xyz, precision_xyz), np.maximum(last_defined, 0), axis=0), initial)
+        before = np.vstack((initial, after[:-1]))
+        changed = (defined & (xyz != before)).any(axis=1)
+        if colors is not None:
+            # state.point.color after each row, for color_type 'manual'
+            color_now = state.point.color
+            colors_after = []
+            for i, color in enumerate(colors):
+                if color != None and color != color_now:
+                    color_now = color
+                    changed[i] = True
+                colors_after.append(color_now)
+        rows = np.nonzero(changed)[0]
+        if len(rows) == 0:
+            return
+
+        if plot_controls.color_type == 'manual':
+            point_colors = [colors_after[i] for i in rows.tolist()] if colors is not None else [state.point.color] * len(rows)
+            state.point.color = point_colors[-1]
+        else:
+            point_colors = None  # calculated for all points at the end (see PlotData.update_colors)
+        state.point.x, state.point.y, state.point.z = nan_to_none(after[-1])
+        plot_data.paths[-1].add_points(after[rows], point_colors, state)
+        state.point_count_now += len(rows)
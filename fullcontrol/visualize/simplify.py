@@ -0,0 +1,87 @@
+import numpy as np
+from typing import Optional
+from pydantic import BaseModel
+
+# paths of a plot can be simplified (see PlotControls.simplify) so that very large designs can be previewed. points of
+# extruded paths are removed with the Ramer-Douglas-Peucker algorithm if they are within the tolerance of the line
+# between the points that are kept. each point is compared as a vector of its x y z position, color, width and height,
+# each scaled by its tolerance, so points are kept where the colour or the extrusion geometry changes. travel paths,
+# the first and last point of each path, and points with undefined values are always kept
+
+DEFAULT_TOLERANCE = 0.0005  # the maximum deviation of the simplified paths, as a fraction of the bounding box size
+COLOR_TOLERANCE = 0.01  # the maximum difference of [r, g, b] values (0-1) from the simplified color gradient
+
+
+class SimplifyReport(BaseModel):
+    '''
+    The number of points removed from the paths of a plot (see PlotControls.simplify).
+
+    Attributes:
+        points_before (int): The number of points before simplification.
+        points_after (int): The number of points after simplification.
+        tolerance (float): The maximum deviation (mm) of the simplified paths.
+    '''
+    points_before: Optional[int] = 0
+    points_after: Optional[int] = 0
+    tolerance: Optional[float] = None
+
+    def __str__(self):
+        dropped = self.points_before - self.points_after
+        percent = 100*dropped/self.points_before if self.points_before > 0 else 0
+        return f'plot simplified: {self.points_before} points reduced to {self.points_after} ' + \
+            f'({dropped} points or {percent:.1f}% dropped, tolerance {self.tolerance:.3g} mm)'
+
+
+def segment_distances(vectors: np.ndarray, start: np.ndarray, end: np.ndarray) -> np.ndarray:
+    'return the distance of each vector (any number of dimensions) from the line segment between start and end'
+    chord = end - start
+    offsets = vectors - start
+    chord_squared = float(chord @ chord)
+    if chord_squared > 0:
+        offsets = offsets - np.clip(offsets @ chord / chord_squared, 0, 1)[:, None] * chord
+    return np.sqrt(np.einsum('ij,ij->i', offsets, offsets))
+
+
+def keep_points(vectors: np.ndarray, fixed: np.ndarray) -> np.ndarray:
+    '''
+    Return which points to keep for the Ramer-Douglas-Peucker algorithm with a tolerance of 1.
+
+    Args:
+        vectors (np.ndarray): The point vectors, shape (n, m), scaled so the tolerance is 1 for each dimension.
+        fixed (np.ndarray): Boolean array of points that must be kept. The first and last points are always kept.
+
+    Returns:
+        np.ndarray: Boolean array of the points to keep.
+    '''
+    keep = fixed.copy()
+    keep[0] = keep[-1] = True
+    kept = np.flatnonzero(keep).tolist()
+    pending = list(zip(kept[:-1], kept[1:]))
+    while len(pending) > 0:
+        first, last = pending.pop()
+        if last - first < 2:
+            continue
+        distances = segment_distances(vectors[first + 1:last], vectors[first], vectors[last])
+        worst = int(np.argmax(distances))
+        if distances[worst] > 1:
+            split = first + 1 + worst
+            keep[split] = True
+            pending.extend([(first, split), (split, last)])
+    return keep
+
+
+def simplify_points(points: np.ndarray, tolerance: float) -> np.ndarray:
+    '''
+    Return which points of an extruded path to keep (see the comment at the top of simplify.py).
+
+    Args:
+        points (np.ndarray): The structured array of points of the path (see PlotBuffer).
+        tolerance (float): The maximum deviation (mm) of the simplified path.
+
+    Returns:
+        np.ndarray: Boolean array of the points to keep.
+    '''
+    vectors = np.hstack((points['xyz'] / tolerance, points['color'] / COLOR_TOLERANCE,
+                         points['width'][:, None] / tolerance, points['height'][:, None] / tolerance))
+    undefined = np.isnan(vectors).any(axis=1)
+    return keep_points(np.where(np.isnan(vectors), 0, vectors), undefined)
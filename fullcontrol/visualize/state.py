@@ -2,7 +2,7 @@ from typing import Optional
 from pydantic import BaseModel
 from importlib import import_module
 
-from fullcontrol.common import Point, Extruder, ExtrusionGeometry
+from fullcontrol.common import Point, Extruder, ExtrusionGeometry, SlottedPoint, PointArray
 from fullcontrol.visualize.point import Point
 from fullcontrol.visualize.controls import PlotControls
 
@@ -28,6 +28,7 @@ class State(BaseModel):
     Parameters:
         steps (list): The list of steps.
         plot_controls (PlotControls): The plot controls.
+        summary (DesignSummary, optional): The summary of the design, which includes the number of points.
 
     '''
 
@@ -48,11 +49,14 @@ class State(BaseModel):
         Returns:
             int: The number of points.
         '''
-        return sum(1 for step in steps if isinstance(step, Point))
+        return sum(1 if isinstance(step, (Point, SlottedPoint)) else len(step.xyz) if isinstance(step, PointArray) else 0 for step in steps)
 
-    def __init__(self, steps: list, plot_controls: PlotControls):
+    def __init__(self, steps: list, plot_controls: PlotControls, summary=None):
         super().__init__()
-        self.point_count_total = self.count_points(steps)
+        if summary is not None and summary.point_count is not None:
+            self.point_count_total = summary.point_count  # counted when the design was checked (see fullcontrol/check.py)
+        else:
+            self.point_count_total = self.count_points(steps)
 
         initialization_data = import_module(f'fullcontrol.devices.community.singletool.{plot_controls.printer_name}').set_up(plot_controls.initialization_data)  # future plan: move printer library from gcode package since it can affect more than just gcode
 
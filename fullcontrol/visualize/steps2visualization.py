@@ -5,12 +5,15 @@ from fullcontrol.visualize.controls import PlotControls
 from fullcontrol.visualize.tips import tips
 
 
-def visualize(steps: list, plot_controls: PlotControls, show_tips: bool):
+def visualize(steps: list, plot_controls: PlotControls, show_tips: bool, summary=None):
     '''
     Visualize the list of steps.
 
     Parameters:
-    - steps (list): The list of steps to visualize.
+    - steps (list): The list of steps to visualize, or a LazySteps design (which is generated again for each pass
+      through the steps, so the design is never held in memory as one list).
+    - summary (DesignSummary, optional): The summary from fix_design(), so the number of points and the bounding
+      box are not found by reading the steps again.
     - plot_controls (PlotControls, optional): The style of the plot can be adjusted by passing a PlotControls instance.
 
     Returns:
@@ -19,11 +22,15 @@ def visualize(steps: list, plot_controls: PlotControls, show_tips: bool):
     plot_controls.initialize()
     if show_tips: tips(plot_controls)
 
-    state = State(steps, plot_controls)
-    plot_data = PlotData(steps, state)
+    state = State(steps, plot_controls, summary)
+    plot_data = PlotData(steps, state, summary)
     for step in steps:
         step.visualize(state, plot_data, plot_controls)
+    plot_data.update_colors(state, plot_controls)
     plot_data.cleanup()
+    if plot_controls.simplify:
+        plot_data.simplify(plot_controls.simplify_tolerance)
+        if show_tips: print(plot_data.simplify_report)
 
     if plot_controls.raw_data == True:
         return plot_data
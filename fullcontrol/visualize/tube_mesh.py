@@ -4,6 +4,8 @@ from numbers import Real
 import pathlib
 import math
 # functionality
+import io
+import multiprocessing
 import struct
 from datetime import datetime
 from itertools import chain, pairwise
@@ -34,7 +36,11 @@ class MeshExporter:
         return self._mesh_normals
 
     def to_stl(self, path: pathlib.Path | str, binary: bool = True,
-               overwrite: bool = False, combined_file: bool = True):
+               overwrite: bool = False, combined_file: bool = True, processes: int | None = None):
+        '''
+        `processes` is the number of processes used to generate the data of the
+            bodies in parallel (one process if `None`), for files with many bodies.
+        '''
         write_header = self._write_binary_stl_header if binary else lambda out: None
         write_data = self._write_binary_stl_data if binary else self._write_ascii_stl_data
 
@@ -44,28 +50,55 @@ class MeshExporter:
         # Calculate digits needed for zero-padding increments
         digits = math.ceil(math.log10(num_bodies)) + 1
         mode = 'w' + 'b'*binary
-        if combined_file or num_bodies == 1:
+        combined = combined_file or num_bodies == 1
+        identifiers = [
+            (index if binary
+             else (name if num_bodies == 1 else f'{name}_{index:>0{digits}}'))
+            if combined else (0 if binary else name)
+            for index in range(num_bodies)
+        ]
+        # Generate the data of all bodies in parallel (if requested), to write in order
+        bodies_data = self.stl_bodies_data(binary, identifiers, processes) \
+            if processes is not None and processes > 1 and num_bodies > 1 else None
+
+        def write_body(out, body, identifier):
+            if bodies_data is None:
+                write_data(out, body.mesh_normals,
+                           body.triangle_points.reshape(-1,9), identifier)
+            else:
+                out.write(next(bodies_data))
+
+        if combined:
             if num_bodies > 1:
                 print("WARNING! Multi-object STL file - may not work in some softwares, nor with stl_type='binary'.")
 
             with self.valid_path(path, overwrite).open(mode) as out:
                 write_header(out)
-                for index, body in enumerate(self._bodies):
-                    identifier = (
-                        index if binary
-                        else (name if num_bodies == 1 else f'{name}_{index:>0{digits}}')
-                    )
-                    write_data(out, body.mesh_normals,
-                               body.triangle_points.reshape(-1,9), identifier)
+                for body, identifier in zip(self._bodies, identifiers):
+                    write_body(out, body, identifier)
         else:
-            for index, body in enumerate(self._bodies):
+            for index, (body, identifier) in enumerate(zip(self._bodies, identifiers)):
                 file_path = self.valid_path(path.with_stem(f'{path.stem}_{index:>0{digits}}'),
                                             overwrite)
                 with file_path.open(mode) as out:
-                    identifier = 0 if binary else name
                     write_header(out)
-                    write_data(out, body.mesh_normals,
-                               body.triangle_points.reshape(-1,9), identifier)
+                    write_body(out, body, identifier)
+        if bodies_data is not None:
+            bodies_data.close() # end the worker processes
+
+    def stl_bodies_data(self, binary: bool, identifiers: list, processes: int):
+        '''
+        Yield the STL data of each body (bytes if `binary`, otherwise str), in order,
+            generated in parallel in `processes` processes.
+        `identifiers` is the solid index (binary) or name (ascii) of each body.
+        The bodies are pickled and sent to the worker processes.
+        '''
+        jobs = [(body, binary, identifier) for body, identifier in zip(self._bodies, identifiers)]
+        chunksize = max(1, len(jobs) // (processes*4))
+        # fork (where available) starts processes without importing the designer's script again
+        fork = 'fork' in multiprocessing.get_all_start_methods()
+        with multiprocessing.get_context('fork' if fork else None).Pool(processes) as pool:
+            yield from pool.imap(stl_body_data, jobs, chunksize)
 
     @staticmethod
     def _write_ascii_stl_data(out, mesh_normals, triangle_points, solid_name: str = 'object'):
@@ -116,8 +149,8 @@ class MeshExporter:
             for vi, vertex in enumerate('123'):
                 out_data[f'v{vertex}{axis}'] = triangle_points[:, vi*3+index]
         out_data['attrib'] = attribute_byte_count
-        # Dump it to the output file
-        out_data.tofile(out)
+        # Dump it to the output file (or buffer)
+        out.write(out_data.tobytes())
         # TODO compare timing (and memory usage?) for large meshes
         #  Numpy approach expected to be much faster than looping + struct packing
         #for n, vs in zip(mesh_normals, triangle_points):
@@ -134,6 +167,16 @@ class MeshExporter:
         return path
 
 
+def stl_body_data(job: tuple) -> bytes | str:
+    ''' The STL data of one body (see MeshExporter.stl_bodies_data), which may be
+        run in a worker process. `job` is (body, binary, identifier). '''
+    body, binary, identifier = job
+    out = io.BytesIO() if binary else io.StringIO()
+    write_data = MeshExporter._write_binary_stl_data if binary else MeshExporter._write_ascii_stl_data
+    write_data(out, body.mesh_normals, body.triangle_points.reshape(-1,9), identifier)
+    return out.getvalue()
+
+
 class TubeMesh(MeshExporter):
     ''' A triangle mesh of conical tubes that follow a path of points. '''
     def __init__(
@@ -369,12 +412,13 @@ class TubeMesh(MeshExporter):
             print('WARNING! Non-manifold mesh - not using capped ends.')
         super().to_stl(path, **kwargs)
 
-    def to_Mesh3d(
+    def mesh3d_kwargs(
             self,
             colors: np.ndarray | list[Real | str] | str | None = None,
             **mesh_kwargs
-    ) -> go.Mesh3d:
+    ) -> dict:
         '''
+        The data and keyword arguments for a plotly Mesh3d of the tubes.
         `colors` should be either
             - `None` (to use self.metadata / plotly's default / configure elsewhere)
             - a single color for all the tubes,
@@ -397,28 +441,34 @@ class TubeMesh(MeshExporter):
             colors = self.metadata.get('colors')
 
         # turn path colors into appropriate mesh colors
+        # (an array of numbers is given to plotly as intensity, which is mapped to colors by mesh3d.colorscale)
+        numeric = isinstance(colors, np.ndarray) and colors.dtype.kind in 'iuf'
         if colors is None or isinstance(colors, str):
             mesh_kwargs['color'] = colors
         elif len(colors) == len(self.path_points):
             colors = np.repeat(colors, self.sides, axis=0)
             if self.capped:
                 colors = np.hstack((colors, colors[0], colors[-1]))
-            mesh_kwargs['vertexcolor'] = colors
+            mesh_kwargs.update({'intensity': colors, 'intensitymode': 'vertex'} if numeric else {'vertexcolor': colors})
         elif len(colors) == self.num_cylinders:
             colors = np.repeat(colors, self.sides*2, axis=0)
             if self.capped:
                 colors = np.hstack((colors[:self.sides], colors, colors[-self.sides:]))
-            mesh_kwargs['facecolor'] = colors
+            mesh_kwargs.update({'intensity': colors, 'intensitymode': 'cell'} if numeric else {'facecolor': colors})
         elif len(colors) == self.num_cylinders+2:
             colors = np.repeat(colors, self.sides*2, axis=0)[self.sides:-self.sides]
-            mesh_kwargs['facecolor'] = colors
+            mesh_kwargs.update({'intensity': colors, 'intensitymode': 'cell'} if numeric else {'facecolor': colors})
 
-        return go.Mesh3d(
+        return dict(
             x=self.mesh_points[:,0], y=self.mesh_points[:,1], z=self.mesh_points[:,2],
             i=self.triangles[:,0], j=self.triangles[:,1], k=self.triangles[:,2],
             **mesh_kwargs
         )
 
+    def to_Mesh3d(self, *args, **kwargs) -> go.Mesh3d:
+        ''' A plotly Mesh3d of the tubes, with colors as described in `mesh3d_kwargs`. '''
+        return go.Mesh3d(**self.mesh3d_kwargs(*args, **kwargs))
+
     def plot(self, **mesh_kwargs):
         fig = go.Figure(self.to_Mesh3d(**mesh_kwargs))
         fig.update_scenes(aspectmode='data') # set equal axis aspect ratios
@@ -534,12 +584,13 @@ class FlowTubeMesh(TubeMesh):
         #>[ab, abc,  bc,  cd, cde,  de, ef, ef, fg, fgh, ..., xyz, yz] corner_tangents
         return corner_tangents
 
-    def to_Mesh3d(
+    def mesh3d_kwargs(
             self,
             colors: np.ndarray | list[Real | str] | str | None = None,
             **mesh_kwargs
-    ) -> go.Mesh3d:
+    ) -> dict:
         '''
+        The data and keyword arguments for a plotly Mesh3d of the tubes.
         `colors` should be either
             - `None` (to use self.metadata / plotly's default / configure elsewhere)
             - a single color for all the tubes,
@@ -564,8 +615,9 @@ class FlowTubeMesh(TubeMesh):
         # turn high level path colors into low level path colors
         if colors is not None and not isinstance(colors, str):
             n = len(colors)
-            # make into a column to allow row insertion
-            colors = np.array(colors, dtype=object).reshape((-1, 1))
+            # make into a column to allow row insertion (keeping arrays of numbers numeric, see TubeMesh.to_Mesh3d)
+            numeric = isinstance(colors, np.ndarray) and colors.dtype.kind in 'iuf'
+            colors = np.array(colors, dtype=colors.dtype if numeric else object).reshape((-1, 1))
 
             if n == N:
                 colors = self._duplicate_sharp_corner_rows(colors)
@@ -573,12 +625,12 @@ class FlowTubeMesh(TubeMesh):
                 colors = self._duplicate_sharp_corner_rows(colors, offset=1)
             elif n == N+1:
                 path_colors = colors
-                colors = np.empty((len(colors)+len(self._sharp_doubles),1), dtype=object)
+                colors = np.empty((len(colors)+len(self._sharp_doubles),1), dtype=path_colors.dtype)
                 colors[0] = path_colors[0]
                 colors[1:] = self._duplicate_sharp_corner_rows(path_colors[1:])
 
             colors = colors.flatten()
-        return super().to_Mesh3d(colors, **mesh_kwargs)
+        return super().mesh3d_kwargs(colors, **mesh_kwargs)
 
 
 class CylindersMesh(TubeMesh):
@@ -676,13 +728,14 @@ class CylindersMesh(TubeMesh):
         corner_tangents[1::2] = corner_tangents[::2]
         return corner_tangents
 
-    def to_Mesh3d(
+    def mesh3d_kwargs(
             self,
             colors: np.ndarray | list[Real | str] | str | None = None,
             corner_colors: np.ndarray | list[Real | str] | str = None,
             **mesh_kwargs
-    ) -> go.Mesh3d:
+    ) -> dict:
         '''
+        The data and keyword arguments for a plotly Mesh3d of the tubes.
         `colors` should be either
             - `None` (to use self.metadata / plotly's default / configure elsewhere)
             - a single color for all the tubes,
@@ -727,7 +780,7 @@ class CylindersMesh(TubeMesh):
                     colors[::2] = tube_colors
                     colors[1:-1:2] = corner_colors
 
-        return super().to_Mesh3d(colors, **mesh_kwargs)
+        return super().mesh3d_kwargs(colors, **mesh_kwargs)
 
 
 if __name__ == '__main__':
@@ -1,5 +1,7 @@
 import math
 from fullcontrol.geometry import Point
+from fullcontrol.common import SlottedPoint
+from fullcontrol.geometry.array_transforms import transform_steps, rotate_xyz
 from typing import Union
 from copy import deepcopy
 from math import sqrt, cos, sin, radians
@@ -23,7 +25,7 @@ def rotate(geometry: Union[Point, list], axis_start: Point, axis_end_or_directio
     of the original geometry. return the new geometry as a list (original geometry
     is not edited).
     '''
-    if isinstance(axis_end_or_direction, Point):
+    if isinstance(axis_end_or_direction, (Point, SlottedPoint)):
         axis_end = axis_end_or_direction
     elif axis_end_or_direction == 'x':
         axis_end = Point(x=axis_start.x+1, y=axis_start.y, z=axis_start.z)
@@ -76,16 +78,11 @@ def rotate_geometry(geometry: Union[Point, list], axis_start: Point, axis_end: P
 
         return point_new
 
-    if isinstance(geometry, Point):
+    if isinstance(geometry, (Point, SlottedPoint)):
         return rotate_point(geometry, axis_start, axis_end, angle_rad)
     else:
-        geometry_new = []
-        for element in geometry:
-            if isinstance(element, Point):
-                geometry_new.append(rotate_point(element, axis_start, axis_end, angle_rad))
-            else:
-                geometry_new.append(element)
-        return geometry_new
+        # all points in the list are rotated at once as an array with a rotation matrix
+        return transform_steps(geometry, lambda xyz: rotate_xyz(xyz, axis_start, axis_end, angle_rad))
 
 
 def rotate_copy_geometry(geometry: Union[Point, list], axis_start: Point, axis_end: Point, angle_rad: float, quantity: int) -> list:
@@ -95,11 +92,7 @@ def rotate_copy_geometry(geometry: Union[Point, list], axis_start: Point, axis_e
     'quantity' includes the position of the original geometry. return the new
     geometry as a list (original geometry is not edited).
     '''
-    steps_new = []
-    for i in range(quantity):
-        angle_now = angle_rad*i
-        if isinstance(geometry, Point):
-            steps_new.append(rotate_geometry(geometry, axis_start, axis_end, angle_now))
-        else:
-            steps_new.extend(rotate_geometry(geometry, axis_start, axis_end, angle_now))
-    return steps_new
+    if isinstance(geometry, (Point, SlottedPoint)):
+        return [rotate_geometry(geometry, axis_start, axis_end, angle_rad*i) for i in range(quantity)]
+    # x y z values of points are only extracted to an array once for all copies
+    return transform_steps(geometry, lambda xyz, i: rotate_xyz(xyz, axis_start, axis_end, angle_rad*i), copies=range(quantity))
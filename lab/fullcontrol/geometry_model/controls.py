@@ -10,6 +10,7 @@ class ModelControls(BaseModel):
     tube_type: Optional[str] = 'flow'  # 'flow'/'cylinders'
     stl_type: Optional[str] = 'ascii'  # 'binary'/'ascii'
     stls_combined: Optional[bool] = True
+    processes: Optional[int] = None  # number of processes to generate the meshes and stl data of paths in parallel
     # initialization_data is information about initial printing conditions, which may be
     #  changed by the fullcontrol 'design', whereas the above attributes are never changed
     #  by the 'design'.
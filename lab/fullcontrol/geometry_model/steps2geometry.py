@@ -1,23 +1,20 @@
 from fullcontrol.visualize.plot_data import PlotData
 from lab.fullcontrol.geometry_model.controls import ModelControls
 from fullcontrol.visualize.controls import PlotControls
-from fullcontrol.visualize.plotly import generate_mesh
+from fullcontrol.visualize.plotly import generate_meshes
 
 def generate_stl(data: PlotData, controls: ModelControls):
     from fullcontrol.visualize.tube_mesh import CylindersMesh, FlowTubeMesh, MeshExporter
 
     sides, rounding_strength, flat_sides = controls.shape_properties()
     Mesh = {'flow': FlowTubeMesh, 'cylinders': CylindersMesh}[controls.tube_type]
-    meshes = []
-    for path in data.paths:
-        if path.extruder.on:
-            meshes.append(
-                generate_mesh(path, 0, Mesh, sides, rounding_strength, flat_sides)
-            )
+    paths = [path for path in data.paths if path.extruder.on]
+    meshes = [mesh for mesh, _ in generate_meshes(paths, None, controls.processes, 0, Mesh, sides, rounding_strength, flat_sides)]
 
     binary_file = controls.stl_type.lower() == 'binary'
     MeshExporter({'name': 'extrusion'}, meshes).to_stl(
-        controls.stl_filename, binary_file, combined_file=controls.stls_combined, overwrite=True
+        controls.stl_filename, binary_file, combined_file=controls.stls_combined, overwrite=True,
+        processes=controls.processes
     )
 
 def reuse_visualize(steps: list, model_controls: ModelControls):
@@ -29,6 +26,7 @@ def reuse_visualize(steps: list, model_controls: ModelControls):
     plot_data = PlotData(steps, state)
     for step in steps:
         step.visualize(state, plot_data, plot_controls)
+    plot_data.update_colors(state, plot_controls)
     plot_data.cleanup()
     return plot_data
 
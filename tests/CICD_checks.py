@@ -0,0 +1,161 @@
+# checks of gcode generation options and design functions whose results are not covered by the tutorial printouts.
+# each check compares two ways of generating the same result (e.g. with and without an option that should not change
+# the gcode) and is tagged with the change request that added the feature it covers, e.g. (user-001)
+# usage: run by CICD_test.py, or run this script in the tests directory with 'python CICD_checks.py'
+# a line is printed for each check ('passed: ...' or 'FAILED: ...'), and the script exits with an error if any failed
+
+import os
+import sys
+import io
+import tempfile
+from importlib import import_module
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import fullcontrol as fc
+
+results = []
+
+
+def check(request_id: str, description: str, passed: bool):
+    results.append(passed)
+    print(f"{'passed' if passed else 'FAILED'}: ({request_id}) {description}")
+
+
+def gcode(steps, **controls) -> str:
+    controls = {'printer_name': 'generic', 'include_date': False, **controls}
+    return fc.transform(steps, 'gcode', fc.GcodeControls(**controls), show_tips=False)
+
+
+def design() -> list:
+    'a design with runs of Points of various lengths separated by other steps, and a travel move with undefined z'
+    steps = []
+    for layer in range(6):
+        z = 0.2 + 0.2*layer
+        steps.extend(fc.helixZ(fc.Point(x=50, y=50, z=z), 10 + layer, 10 + layer, 0, 1, 0, 40 + 17*layer))
+        steps.extend([fc.Extruder(on=False), fc.Point(x=45, y=50), fc.Extruder(on=True), fc.Printer(print_speed=1000 + 100*layer),
+                      fc.Point(x=45.0001, y=50.0001), fc.GcodeComment(end_of_previous_line_text='tiny move'), fc.Fan(speed_percent=layer*10)])
+    return steps
+
+
+def e_total(gcode_text: str) -> float:
+    'the sum of E values in the gcode'
+    return sum(float(word[1:]) for line in gcode_text.split('\n') if line.startswith(('G0', 'G1')) for word in line.split(';')[0].split() if word.startswith('E'))
+
+
+steps = design()
+reference = gcode(steps)
+
+# user-001 runs of consecutive Points are processed as arrays by default
+check('user-001', 'gcode for runs of Points as arrays (columnar=True) is identical to gcode for one Point at a time',
+      gcode(steps, columnar=False) == reference)
+
+# user-002 gcode written to a file or file-like object as it is generated
+with tempfile.TemporaryDirectory() as directory:
+    file_name = os.path.join(directory, 'streamed.gcode')
+    gcode(steps, stream_to=file_name)
+    with open(file_name) as file:
+        streamed_file = file.read()
+stream = io.StringIO()
+gcode(steps, stream_to=stream)
+check('user-002', 'gcode streamed to a file and to a file-like object (stream_to) is identical to the gcode string',
+      streamed_file == reference and stream.getvalue() == reference)
+check('user-002', "gcode chunks (result_type 'gcode_chunks') join to the gcode string",
+      ''.join(fc.transform(steps, 'gcode_chunks', fc.GcodeControls(printer_name='generic', include_date=False), show_tips=False)) == reference)
+
+# user-003 slotted step classes
+slotted_steps = fc.slotted.to_slotted(steps)
+round_trip = fc.slotted.to_pydantic(slotted_steps)
+check('user-003', 'steps converted to slotted classes and back to pydantic classes are equal to the original steps',
+      all(type(a) is type(b) and a == b for a, b in zip(round_trip, steps)) and len(round_trip) == len(steps))
+check('user-003', 'gcode for slotted steps is identical to gcode for pydantic steps', gcode(slotted_steps) == reference)
+try:
+    fc.slotted.Point(x=1, not_a_field=2)
+    rejected = False
+except Exception:
+    rejected = True
+check('user-003', 'slotted classes reject unknown attributes and convert values as pydantic does',
+      rejected and fc.slotted.Point(x=1).x == fc.Point(x=1).x and type(fc.slotted.Point(x=1).x) is type(fc.Point(x=1).x))
+
+# user-004 PointArray steps
+array_steps = [fc.PointArray.from_points(steps[:40])] + steps[40:]  # the first 40 steps are the Points of the first layer
+check('user-004', 'gcode for a PointArray is identical to gcode for the equivalent list of Points', gcode(array_steps) == reference)
+check('user-004', 'PointArray.to_points() returns the equivalent list of Points',
+      fc.PointArray.from_points(steps[:40]).to_points() == steps[:40])
+
+# user-008 gcode generated in parallel processes
+from fullcontrol.gcode import parallel
+min_section_steps, parallel.MIN_SECTION_STEPS = parallel.MIN_SECTION_STEPS, 100  # split the design into several sections
+check('user-008', 'gcode generated in parallel processes (processes=2) is identical to gcode generated by one process',
+      len(parallel.section_starts(len(steps), 2)) > 1 and gcode(steps, processes=2) == reference)
+parallel.MIN_SECTION_STEPS = min_section_steps
+
+# user-010 output precision and quantization
+quantized = gcode(steps, decimals={'X': 2, 'Y': 2, 'Z': 2, 'E': 6}, quantize=True)
+check('user-010', 'quantized gcode (quantize=True) has the same total extrusion as gcode that is not quantized',
+      abs(e_total(quantized) - e_total(gcode(steps, decimals={'X': 2, 'Y': 2, 'Z': 2, 'E': 6}))) < 1e-4)
+check('user-010', 'quantized gcode has fewer lines (moves that round to zero length are not written)',
+      len(quantized.split('\n')) < len(reference.split('\n')))
+
+# user-011 printer settings read from the compiled profile index
+from fullcontrol.gcode.import_printer import load_library, printer_profile
+matches = True
+for library_name in ['community_minimal', 'cura']:
+    module_names = sorted(set(load_library(library_name).values()))
+    for module_name in module_names[::1 if library_name == 'community_minimal' else 20]:
+        try:
+            settings = import_module(f'fullcontrol.devices.{library_name}.settings.{module_name}').default_initial_settings
+        except Exception:
+            continue  # settings modules that cannot be imported are not in the profile index
+        matches = matches and printer_profile(library_name, module_name) == settings
+check('user-011', 'printer settings from the profile index are equal to the settings in the printer modules', matches)
+
+# user-012 start/end gcode templates
+from fullcontrol.gcode.gcode_templates import compile_template
+template = compile_template("M140 S{data['bed_temp']}\nM104 S{data['nozzle_temp'] + 5}\nM{190 if data['bed_temp'] > 0 else 140} {printer_name}")
+check('user-012', 'start/end gcode templates are rendered with the values of their expressions',
+      template.render({'bed_temp': 60, 'nozzle_temp': 210}, 'generic') == 'M140 S60\nM104 S215\nM190 generic')
+rejected = []
+for expression in ["__import__('os').system('ls')", 'data.__class__', "open('file')", '(lambda: 1)()', '9**9**9', "'x'*10**9",
+                   '((((9**64)**64)**64)**64) > 1', '(2**1000)*(2**1000)', "'%0300000000d' % 1"]:
+    try:
+        compile_template(f'M117 {{{expression}}}').render({}, 'generic')
+        rejected.append(False)
+    except Exception:
+        rejected.append(True)
+check('user-012', 'start/end gcode templates reject unsafe expressions', all(rejected))
+
+# user-014 GcodeSession for many designs with the same controls
+session = fc.GcodeControls(printer_name='generic', include_date=False).compile(show_tips=False)
+check('user-014', 'gcode from a GcodeSession is identical to gcode from transform(), for repeated designs',
+      session.gcode(steps) == reference and session.gcode(steps[:50]) == gcode(steps[:50]) and session.gcode(steps) == reference)
+
+# user-015 StepSource
+source = fc.StepSource([1, 2], (n for n in [3, 4, 'a', 5]), [[6, 7], 8])
+first = next(source)
+source.inject([0])
+run = source.next_run(lambda step: isinstance(step, int), 10)
+ahead = source.lookahead(lambda step: step == 6)
+check('user-015', 'StepSource reads steps in order with inject(), next_run() and lookahead()',
+      first == 1 and run == [0, 2, 3, 4] and ahead == ['a', 5, 6] and list(source) == ['a', 5, 6, 7, 8])
+check('user-015', 'gcode for a generator of steps is identical to gcode for the list of steps',
+      gcode(step for step in steps) == reference)
+
+# user-016 lazy design helpers
+nested = [steps[:30], (step for step in steps[30:60]), [steps[60:90], [steps[90:]]]]
+check('user-016', 'lazy flatten() reads the same steps as flatten()',
+      list(fc.flatten(nested, lazy=True)) == steps and fc.flatten([steps[:30], steps[30:]]) == steps)
+points = fc.points_only(steps[:60], track_xyz=False)
+eager = fc.move(points, fc.Vector(x=1, z=0.5), copy=True, copy_quantity=3)
+check('user-016', 'lazy move() with copies gives the same steps as move()',
+      list(fc.move(points, fc.Vector(x=1, z=0.5), copy=True, copy_quantity=3, lazy=True)) == eager)
+
+# user-017 single-pass design checks
+array_first = [fc.PointArray(xyz=[[None, 10, 0.2], [20, 10, 0.2], [20, 20, None]]), fc.Point(x=10, y=20, z=0.2)]
+points_first = [fc.Point(y=10, z=0.2), fc.Point(x=20, y=10, z=0.2), fc.Point(x=20, y=20), fc.Point(x=10, y=20, z=0.2)]
+check('user-017', 'a design starting with a PointArray that does not define all axes gives the same gcode as Points',
+      gcode(array_first) == gcode(points_first))
+
+failed = results.count(False)
+print(f'{len(results) - failed} of {len(results)} checks passed')
+if failed > 0:
+    sys.exit(f'{failed} checks failed')
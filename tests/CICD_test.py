@@ -46,6 +46,18 @@ def compare_files(file1, file2, str_result):
         str_result.append("great! no differences found between tutorial printouts now and the reference printouts.")
         print(str_result[-1])
 
+def run_checks(str_result):
+    # run the checks in CICD_checks.py, which compare gcode generated in different ways (e.g. with and without options
+    # that should not change the gcode), and add their results to the test results
+    result = subprocess.run(['python', 'CICD_checks.py'], capture_output=True, text=True)
+    lines = [line for line in result.stdout.split('\n') if line.startswith(('passed', 'FAILED'))]
+    if result.returncode != 0:
+        str_result.append("warning: CICD_checks.py failed - the failed checks (and any error) are listed below - they may cause a pull request to be rejected\n" +
+                          '\n'.join(line for line in lines if line.startswith('FAILED')) + ('\n' + result.stderr if result.stderr else ''))
+    else:
+        str_result.append(f"great! all {len(lines)} checks in CICD_checks.py passed.")
+    print(str_result[-1])
+
 def collage_all_images():
     # Open all .png files in the current directory
     png_files = [f for f in os.listdir('.') if f.endswith('.png') and f not in ['collage.png', 'collage_reference.png']]
@@ -84,6 +96,7 @@ print("if you've changed one of the tutorial notebooks, you'll need to run tutor
 run_tutorials()
 del os.environ['FULLCONTROL_CICD_TESTING']
 compare_files('test_print_output.txt','test_print_output_reference.txt', str_result)
+run_checks(str_result)
 collage_all_images()
 delete_redundant_files()
 print('figures generated by the notebooks have been collated in tests/collage.png\ntest results saved to test_result.txt')
@@ -0,0 +1,60 @@
+# benchmark of plot colors calculated for all points at once (see fullcontrol/visualize/colors.py) against colors
+# calculated for one point at a time, which also checks that the colors (including which values are integers) match
+# for each color_type
+# run from the repo directory: python tests/benchmark_colors.py
+
+import os
+import sys
+from math import cos, sin, tau
+from time import perf_counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import numpy as np
+from fullcontrol.visualize.bounding_box import BoundingBox
+from fullcontrol.visualize.colors import point_colors, point_color_ints
+
+POINTS = 1000000
+COLOR_TYPES = ['z_gradient', 'print_sequence', 'print_sequence_fluctuating']
+
+
+def loop_colors(color_type: str, extruding: list, z: list, counts: list, point_count_total: int, bounding_box: BoundingBox) -> list:
+    'return the color of each point, calculated one point at a time'
+    colors = []
+    for on, z_now, count in zip(extruding, z, counts):
+        if not on:
+            colors.append([0.75, 0.5, 0.5])
+        elif color_type == 'z_gradient':
+            z_range = max(bounding_box.rangez, 0.00000001)
+            z_min = round(bounding_box.minz, 3)
+            colors.append([0, round((z_now - z_min)/z_range, 3), 1])
+        elif color_type == 'print_sequence':
+            colors.append([round(0.8*max(1 - (2*count/point_count_total), 0), 3), round(max((2*count/point_count_total) - 1, 0), 3), 1])
+        else:
+            point_count_fluc = point_count_total / 5
+            angle = (((count % point_count_fluc) + 0.00001)/point_count_fluc)*tau
+            colors.append([round(0.25 + 0.25*sin(angle), 3), round(0.5 - 0.5*cos(angle), 3), 1])
+    return colors
+
+
+if __name__ == '__main__':
+    rng = np.random.default_rng(0)
+    z = np.round(np.sort(rng.uniform(0.2, 50, POINTS)), 3)
+    counts = np.arange(POINTS)
+    extruding = rng.random(POINTS) < 0.95
+    bounding_box = BoundingBox(minz=0.2, maxz=50, rangez=49.8)
+    failed = False
+    for color_type in COLOR_TYPES:
+        start = perf_counter()
+        colors = point_colors(color_type, extruding, z, counts, POINTS, bounding_box)
+        t_array = perf_counter() - start
+        start = perf_counter()
+        reference = loop_colors(color_type, extruding.tolist(), z.tolist(), counts.tolist(), POINTS, bounding_box)
+        t_loop = perf_counter() - start
+        ints = point_color_ints(color_type, extruding, counts, POINTS).tolist()
+        # values must match, and so must the flags for which values are integers (e.g. [0, 0.5, 1] for 'z_gradient')
+        matches = colors.tolist() == reference and \
+            ints == [sum(1 << i for i, value in enumerate(color) if type(value) is int) for color in reference]
+        print(f'{color_type}: one point at a time {t_loop:.3f}s, arrays {t_array:.3f}s ({t_loop/t_array:.1f}x), colors match: {matches}')
+        failed = failed or not matches
+    if failed:
+        sys.exit('colors do not match')
@@ -0,0 +1,95 @@
+# benchmark of gcode number formatting (fullcontrol/gcode/formatting.py) against the original formatting,
+# f'{value:.6f}'.rstrip('0').rstrip('.') for each number, which also checks that the results are identical
+# run from the repo directory: python tests/benchmark_formatting.py
+
+import os
+import re
+import sys
+import random
+from time import perf_counter
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from fullcontrol.gcode.formatting import NumberFormat
+from fullcontrol.gcode.array_formatting import format_numbers, format_lines
+
+N = 500_000  # number of lines of gcode (each with X Y and E values)
+REPEATS = 3  # each method is timed several times and the quickest time is reported
+
+
+def test_values(n: int) -> np.ndarray:
+    'random values, values rounded to fewer decimal places, and values close to rounding boundaries'
+    random.seed(0)
+    values = [random.uniform(-300, 300) for _ in range(n // 2)]
+    values += [round(random.uniform(-300, 300), random.randint(0, 6)) for _ in range(n // 4)]
+    values += [random.randint(-300000, 300000) / 1e6 + random.choice([5e-7, -5e-7, 1e-12, 0]) for _ in range(n - len(values) - 9)]
+    values += [0.0, -0.0, 1e-7, -1e-7, 5e-7, 2.5e-6, 1e15, -1e15, 1e300]
+    return np.array(values)
+
+
+def toolpath_values(n: int) -> np.ndarray:
+    'x y e values for a typical toolpath (a helix with cumulative extrusion), as formatted by the columnar gcode path'
+    angles = np.linspace(0, 200*2*np.pi, n)
+    return np.column_stack((50 + 20*np.cos(angles), 50 + 20*np.sin(angles), np.cumsum(np.full(n, 0.0123))))
+
+
+def lines_original(xye: list) -> str:
+    'lines of gcode with each number formatted and trimmed separately (original Point.XYZ_gcode and Extruder.e_gcode)'
+    return '\n'.join([f'G1 X{x:.6f}'.rstrip('0').rstrip('.') + ' ' + f'Y{y:.6f}'.rstrip('0').rstrip('.') + ' ' +
+                      f'E{e:.6f}'.rstrip('0').rstrip('.') for x, y, e in xye])
+
+
+def lines_regex(xye: np.ndarray) -> str:
+    'lines of gcode formatted with one %-format operation and trimmed with a regular expression (original columnar method)'
+    trim_zeros = re.compile(r'\.0+(?=[ \n]|$)|(?<=[1-9])0+(?=[ \n]|$)')
+    return trim_zeros.sub('', '\n'.join(['G1 X%.6f Y%.6f E%.6f'] * len(xye)) % tuple(xye.ravel().tolist()))
+
+
+def lines_number_format(xye: list) -> str:
+    'lines of gcode with each number formatted with NumberFormat templates (current Point.XYZ_gcode and Extruder.e_gcode)'
+    templates = NumberFormat().templates
+    x_template, y_template, e_template = templates['X'], templates['Y'], templates['E']
+    return '\n'.join(['G1 ' + (x_template % x).rstrip('0').rstrip('.') + ' ' + (y_template % y).rstrip('0').rstrip('.') + ' ' +
+                      (e_template % e).rstrip('0').rstrip('.') for x, y, e in xye])
+
+
+def lines_fixed_point(xye: np.ndarray) -> str:
+    'lines of gcode formatted with format_lines() (current columnar method)'
+    return format_lines(['G1 X%.*f Y%.*f E%.*f'] * len(xye), xye, np.ones(xye.shape, dtype=bool), [6, 6, 6])
+
+
+def timed(function, *args):
+    times = []
+    for _ in range(REPEATS):
+        start = perf_counter()
+        result = function(*args)
+        times.append(perf_counter() - start)
+    return result, min(times)
+
+
+if __name__ == '__main__':
+    failed = False
+    for description, xye in [('a typical toolpath', toolpath_values(N)), ('values close to rounding boundaries', test_values(3 * N).reshape(-1, 3))]:
+        xye_list = xye.tolist()
+        reference, t_reference = timed(lines_original, xye_list)
+        print(f'{N} lines of gcode for {description}, original formatting: {t_reference:.3f}s')
+        times = {}
+        for name, function, data in [('NumberFormat templates', lines_number_format, xye_list),
+                                     ('regex trimming (previous columnar method)', lines_regex, xye),
+                                     ('fixed-point format_lines() (columnar method)', lines_fixed_point, xye)]:
+            result, times[name] = timed(function, data)
+            print(f'  {name}: {times[name]:.3f}s ({t_reference/times[name]:.1f}x), identical: {result == reference}')
+            failed = failed or result != reference
+        t_regex = times['regex trimming (previous columnar method)']
+        print(f'  format_lines() is {t_regex/times[name]:.1f}x faster than the previous columnar method')
+    # individual numbers with fewer decimal places
+    values = xye.ravel()
+    for decimals in (3, 1, 0):
+        reference = [f'{value:.{decimals}f}' for value in values.tolist()]
+        if decimals > 0:
+            reference = [text.rstrip('0').rstrip('.') for text in reference]
+        result = format_numbers(values, decimals)
+        print(f'format_numbers() with {decimals} decimals, identical: {result == reference}')
+        failed = failed or result != reference
+    if failed:
+        sys.exit('formatting is not identical to the original')
@@ -0,0 +1,42 @@
+# benchmark of the time taken by 'import fullcontrol', which also checks that modules only needed to generate gcode
+# or plots (including numpy and plotly) are not imported until they are used
+# run from the repo directory: python tests/benchmark_import.py
+
+import os
+import sys
+import subprocess
+
+REPEATS = 5  # each import is timed in a new python process, and the quickest time is reported
+
+# modules that must not be imported by 'import fullcontrol'
+LAZY_MODULES = ['numpy', 'plotly', 'fullcontrol.gcode.steps2gcode', 'fullcontrol.gcode.point_runs', 'fullcontrol.gcode.state',
+                'fullcontrol.visualize.steps2visualization', 'fullcontrol.visualize.plotly', 'fullcontrol.visualize.tube_mesh']
+
+TIMING_CODE = '''
+import sys
+from time import perf_counter
+start = perf_counter()
+import {module}
+print(perf_counter() - start)
+print(' '.join(sorted(sys.modules)))
+'''
+
+
+def timed_import(module: str) -> tuple:
+    'return the time to import a module in a new python process and the names of all modules imported'
+    repo = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    output = subprocess.run([sys.executable, '-c', TIMING_CODE.format(module=module)], cwd=repo,
+                            capture_output=True, text=True, check=True).stdout.split('\n')
+    return float(output[0]), output[1].split(' ')
+
+
+if __name__ == '__main__':
+    t_pydantic = min(timed_import('pydantic')[0] for _ in range(REPEATS))
+    results = [timed_import('fullcontrol') for _ in range(REPEATS)]
+    t_fullcontrol = min(t for t, _ in results)
+    print(f'import pydantic: {t_pydantic:.3f}s')
+    print(f'import fullcontrol: {t_fullcontrol:.3f}s (including pydantic)')
+    imported = [module for module in LAZY_MODULES if module in results[0][1]]
+    if len(imported) > 0:
+        sys.exit(f"modules imported by 'import fullcontrol' that should only be imported when they are used: {imported}")
+    print('numpy, plotly and gcode/plot generation modules are not imported')
@@ -0,0 +1,62 @@
+# benchmark of plotting a design with many separate extrusion paths with all paths combined into one plotly trace of
+# each kind (fc.PlotControls(merge_traces=True)) against one trace for each path, which also checks that the combined
+# traces have the same mesh vertices and line points
+# run from the repo directory: python tests/benchmark_merge_traces.py
+
+import os
+import sys
+from time import perf_counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import numpy as np
+import plotly.graph_objects as go
+import fullcontrol as fc
+
+ISLANDS = 2000  # separate squares, with a travel path between each
+
+
+def design() -> list:
+    steps = []
+    for island in range(ISLANDS):
+        x, y = 3*(island % 50), 3*(island // 50)
+        steps.extend([fc.Extruder(on=False), fc.Point(x=x, y=y, z=0.2), fc.Extruder(on=True)])
+        steps.extend(fc.rectangleXY(fc.Point(x=x, y=y, z=0.2), 2, 2))
+    return steps
+
+
+def plot(steps: list, merge_traces: bool) -> tuple:
+    'return the figure, and the time to generate it and convert it to json (as sent to the browser)'
+    figures = []
+    show = go.Figure.show
+    go.Figure.show = lambda fig, *args, **kwargs: figures.append(fig)
+    try:
+        start = perf_counter()
+        fc.transform(steps, 'plot', fc.PlotControls(style='tube', merge_traces=merge_traces), show_tips=False)
+        t_figure = perf_counter() - start
+        start = perf_counter()
+        json_size = len(figures[0].to_json())
+        t_json = perf_counter() - start
+    finally:
+        go.Figure.show = show
+    return figures[0], t_figure, t_json, json_size
+
+
+def trace_points(fig: go.Figure, trace_type: str) -> np.ndarray:
+    'return the x y z points of all traces of a type in a figure, without the gaps between lines of combined traces'
+    points = np.concatenate([np.stack((trace.x, trace.y, trace.z), axis=1).astype(float)
+                             for trace in fig.data if trace.type == trace_type and getattr(trace, 'mode', None) != 'markers'])
+    return points[~np.isnan(points).any(axis=1)]
+
+
+if __name__ == '__main__':
+    steps = design()
+    results = {}
+    for merge_traces in [False, True]:
+        fig, t_figure, t_json, json_size = plot(steps, merge_traces)
+        results[merge_traces] = fig
+        print(f'merge_traces={merge_traces}: {len(fig.data)} traces, figure {t_figure:.3f}s, json {t_json:.3f}s ({json_size/1e6:.1f} MB)')
+    same = all(np.array_equal(trace_points(results[False], trace_type), trace_points(results[True], trace_type))
+               for trace_type in ['mesh3d', 'scatter3d'])
+    print(f'combined traces match: {same}')
+    if not same:
+        sys.exit('combined traces do not match the traces of each path')
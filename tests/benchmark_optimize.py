@@ -0,0 +1,60 @@
+# benchmark of the gcode optimizer (GcodeControls(optimize=True)) for a densely segmented design, which also checks
+# that the optimized gcode has the same path length and total extrusion as the original gcode
+# run from the repo directory: python tests/benchmark_optimize.py
+
+import os
+import sys
+from math import cos, sin, tau, sqrt
+from time import perf_counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import fullcontrol as fc
+
+LAYERS = 100
+SEGMENTS = 500  # segments for each side of a square (each a separate line of gcode before optimization)
+TOLERANCE = 1e-6  # relative difference allowed (E values of merged moves are rounded)
+
+
+def design() -> list:
+    steps = []
+    for layer in range(LAYERS):
+        z = 0.2 + 0.2*layer
+        corners = [fc.Point(x=x, y=y, z=z) for x, y in [(10, 10), (60, 10), (60, 60), (10, 60), (10, 10)]]
+        steps.extend(fc.segmented_path(corners, 4*SEGMENTS))
+        steps.extend([fc.Point(x=35 + 10*cos(tau*i/200), y=35 + 10*sin(tau*i/200), z=z) for i in range(201)])
+        steps.extend([fc.Extruder(on=False), fc.Point(x=10, y=10), fc.Extruder(on=True), fc.Printer(print_speed=1000)])
+    return steps
+
+
+def gcode_totals(gcode: str) -> tuple:
+    'return (length of moves, total E, number of moves) calculated from lines of gcode (G0/G1 moves with relative E)'
+    position, length, e_total, count = {}, 0, 0, 0
+    for line in gcode.split('\n'):
+        if not (line.startswith('G0 ') or line.startswith('G1 ')):
+            continue
+        words = {word[0]: float(word[1:]) for word in line.split(';')[0].split()[1:]}
+        deltas = [words[axis] - position[axis] for axis in 'XYZ' if axis in words and axis in position]
+        position.update({axis: words[axis] for axis in 'XYZ' if axis in words})
+        length, e_total, count = length + sqrt(sum(delta*delta for delta in deltas)), e_total + words.get('E', 0), count + 1
+    return length, e_total, count
+
+
+if __name__ == '__main__':
+    steps = design()
+    session = fc.GcodeControls(printer_name='generic').compile(show_tips=False)
+    optimizing_session = fc.GcodeControls(printer_name='generic', optimize=True).compile(show_tips=False)
+    start = perf_counter()
+    gcode = session.gcode(steps)
+    t_gcode = perf_counter() - start
+    start = perf_counter()
+    optimized = optimizing_session.gcode(steps)
+    t_optimized = perf_counter() - start
+    print(f'{len(steps)} steps: gcode {t_gcode:.3f}s, optimized gcode {t_optimized:.3f}s')
+    print(optimizing_session.optimize_report)
+    failed = False
+    for name, value, reference in zip(['length of moves', 'total E'], gcode_totals(optimized), gcode_totals(gcode)):
+        matches = abs(value - reference) <= TOLERANCE*abs(reference)
+        print(f'{name}: {value:.6f} (before optimization: {reference:.6f}), matches: {matches}')
+        failed = failed or not matches
+    if failed:
+        sys.exit('optimized gcode does not match the original gcode')
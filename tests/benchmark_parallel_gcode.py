@@ -0,0 +1,60 @@
+# benchmark of gcode generated in parallel processes (GcodeControls(processes=N)) against one process, with the time
+# of the serial pre-pass that finds the state and steps for each section, and checks that the gcode is identical and
+# that the pre-pass (including adding up the extrusion volumes calculated by worker processes) is a small fraction of
+# the time to generate gcode in one process.
+# a speedup needs more than one cpu: with one cpu, the parallel time is the serial time plus the overheads
+# run from the repo directory: python tests/benchmark_parallel_gcode.py
+
+import os
+import sys
+from time import perf_counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import fullcontrol as fc
+from fullcontrol.gcode.state import State
+from fullcontrol.gcode.parallel import section_starts, prepare_sections, section_volumes, set_section_volumes
+
+LAYERS = 100
+POINTS_PER_LAYER = 2000
+PROCESSES = max(2, os.cpu_count() or 1)
+MAX_PREPASS_FRACTION = 0.3  # maximum time of the pre-pass as a fraction of the time for one process
+
+
+def design() -> list:
+    steps = []
+    for layer in range(LAYERS):
+        z = 0.2 + 0.2*layer
+        steps.extend(fc.helixZ(fc.Point(x=50, y=50, z=z), 20, 20, 0, 1, 0, POINTS_PER_LAYER))
+        steps.extend([fc.Extruder(on=False), fc.Point(x=50, y=50), fc.Extruder(on=True), fc.Printer(print_speed=1000 + 10*layer)])
+    return steps
+
+
+if __name__ == '__main__':
+    steps = design()
+    print(f'{os.cpu_count()} cpus, {len(steps)} steps')
+    gcode, times = {}, {}
+    for processes in [None, PROCESSES]:
+        start = perf_counter()
+        gcode[processes] = fc.transform(steps, 'gcode', fc.GcodeControls(printer_name='generic', processes=processes), show_tips=False)
+        times[processes] = perf_counter() - start
+        print(f'gcode with processes={processes}: {times[processes]:.3f}s')
+    controls = fc.GcodeControls(printer_name='generic', processes=PROCESSES)
+    prepass_times = []
+    for repeat in range(3):
+        state = State(steps, controls)
+        starts = section_starts(len(state.steps), PROCESSES)
+        start = perf_counter()
+        sections = prepare_sections(state, starts)
+        prepass_times.append(perf_counter() - start)
+        volumes = [section_volumes(section) for section in sections[:-1]]  # calculated by worker processes
+        start = perf_counter()
+        set_section_volumes(sections, volumes)
+        prepass_times[-1] += perf_counter() - start
+    prepass_fraction = min(prepass_times) / times[None]
+    print(f'pre-pass for {len(starts)} sections: {min(prepass_times):.3f}s ({prepass_fraction:.0%} of the time for one process)')
+    same = gcode[None] == gcode[PROCESSES]
+    print(f'gcode identical: {same}')
+    if not same:
+        sys.exit('gcode generated in parallel differs from gcode generated by one process')
+    if prepass_fraction > MAX_PREPASS_FRACTION:
+        sys.exit(f'the pre-pass takes more than {MAX_PREPASS_FRACTION:.0%} of the time for one process')
@@ -0,0 +1,50 @@
+# benchmark of stl export for a large design with the tube meshes and stl data of paths generated in parallel
+# processes (fclab.ModelControls(processes=N)) against one process, which also checks that the stl files are identical
+# run from the repo directory: python tests/benchmark_parallel_meshes.py
+
+import contextlib
+import hashlib
+import io
+import os
+import sys
+import tempfile
+from time import perf_counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import fullcontrol as fc
+import lab.fullcontrol as fclab
+
+LAYERS = 100
+POINTS_PER_LAYER = 500
+PROCESSES = max(2, os.cpu_count() or 1)
+
+
+def design() -> list:
+    steps = []
+    for layer in range(LAYERS):
+        z = 0.2 + 0.2*layer
+        steps.append(fc.helixZ(fc.Point(x=50, y=50, z=z), 20, 20, 0, 1, 0, POINTS_PER_LAYER, as_array=True))
+        steps.extend([fc.Extruder(on=False), fc.Point(x=50, y=50), fc.Extruder(on=True)])
+    return steps
+
+
+if __name__ == '__main__':
+    steps = design()
+    print(f'{os.cpu_count()} cpus')
+    with tempfile.TemporaryDirectory() as directory:
+        hashes = {}
+        for stl_type in ['binary', 'ascii']:
+            for processes in [None, PROCESSES]:
+                filename = os.path.join(directory, f'{stl_type}_{processes}')
+                start = perf_counter()
+                with contextlib.redirect_stdout(io.StringIO()):  # hide the messages printed for each stl file
+                    fclab.transform(steps, '3d_model', fclab.ModelControls(stl_filename=filename, include_date=False, stl_type=stl_type,
+                                                                           processes=processes), show_tips=False)
+                t_stl = perf_counter() - start
+                with open(filename + '.stl', 'rb') as file:
+                    hashes[(stl_type, processes)] = hashlib.md5(file.read()).hexdigest()
+                print(f'{stl_type} stl with processes={processes}: {t_stl:.3f}s')
+    same = all(hashes[(stl_type, None)] == hashes[(stl_type, PROCESSES)] for stl_type in ['binary', 'ascii'])
+    print(f'stl files identical: {same}')
+    if not same:
+        sys.exit('stl files generated in parallel differ from those generated by one process')
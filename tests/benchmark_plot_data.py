@@ -0,0 +1,42 @@
+# benchmark of the plot data for a large design (fc.PlotControls(raw_data=True)), comparing the memory used by the
+# columnar PlotBuffer of points with the memory of the same values stored as lists for each path
+# run from the repo directory: python tests/benchmark_plot_data.py
+
+import os
+import sys
+import tracemalloc
+from time import perf_counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import fullcontrol as fc
+
+LAYERS = 100
+POINTS_PER_LAYER = 5000
+
+
+def design() -> list:
+    steps = []
+    for layer in range(LAYERS):
+        z = 0.2 + 0.2*layer
+        steps.append(fc.helixZ(fc.Point(x=50, y=50, z=z), 20, 20, 0, 1, 0, POINTS_PER_LAYER, as_array=True))
+        steps.extend([fc.Extruder(on=False), fc.Point(x=50, y=50), fc.Extruder(on=True)])
+    return steps
+
+
+if __name__ == '__main__':
+    steps = design()
+    start = perf_counter()
+    plot_data = fc.transform(steps, 'plot', fc.PlotControls(raw_data=True), show_tips=False)
+    t_plot_data = perf_counter() - start
+    points = plot_data.buffer.points()
+    print(f'{len(points)} points in {len(plot_data.paths)} paths: plot data {t_plot_data:.3f}s')
+    tracemalloc.start()
+    lists = [(path.xvals, path.yvals, path.zvals, path.colors, path.widths, path.heights) for path in plot_data.paths]
+    list_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print(f'memory: points array {points.nbytes/1e6:.1f} MB, the same values as lists {list_bytes/1e6:.1f} MB')
+    same = all(len(path_lists[0]) == len(path) and path_lists[2] == path.points['xyz'][:, 2].tolist()
+               for path_lists, path in zip(lists, plot_data.paths))
+    print(f'list values match the array: {same}')
+    if not same:
+        sys.exit('plot data lists do not match the array of points')
@@ -0,0 +1,85 @@
+# benchmark of the print time estimate (acceleration and junction deviation) against a motion planner that processes
+# one move at a time, which also checks that the times match and that M73 progress lines do not change other gcode
+# run from the repo directory: python tests/benchmark_print_time.py
+
+import os
+import sys
+from math import cos, sin, tau, sqrt
+from time import perf_counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import fullcontrol as fc
+from fullcontrol.gcode.print_time import move_times
+
+LAYERS = 50
+POINTS_PER_LAYER = 2000
+ACCELERATION = 1000
+JUNCTION_DEVIATION = 0.013
+TOLERANCE = 1e-6  # relative difference allowed
+
+
+def design() -> list:
+    steps = []
+    for layer in range(LAYERS):
+        z = 0.2 + 0.2*layer
+        # a wavy circle, so junction speeds vary
+        radius = [20 + (1 if i % 10 < 5 else -1) for i in range(POINTS_PER_LAYER + 1)]
+        steps.extend([fc.Point(x=50 + radius[i]*cos(tau*i/POINTS_PER_LAYER), y=50 + radius[i]*sin(tau*i/POINTS_PER_LAYER), z=z)
+                      for i in range(POINTS_PER_LAYER + 1)])
+        steps.extend([fc.Extruder(on=False), fc.Point(x=50, y=50), fc.Extruder(on=True), fc.Printer(print_speed=1000 + 50*layer)])
+    return steps
+
+
+def loop_move_times(moves) -> list:
+    'return the time for each move, calculated with a forward and backward pass over the moves one at a time'
+    rows = []  # (length, direction, speed) for moves with non-zero length
+    for start, end, length, feedrate in zip(moves.starts.tolist(), moves.ends.tolist(), moves.lengths.tolist(), moves.feedrates.tolist()):
+        if length > 0:
+            direction = [0 if a != a or b != b else (b - a)/length for a, b in zip(start, end)]
+            rows.append((length, direction, feedrate/60))
+    limits = [0.0]*(len(rows) + 1)
+    for i in range(1, len(rows)):
+        cos_theta = max(-1, min(1, -sum(a*b for a, b in zip(rows[i - 1][1], rows[i][1]))))
+        sin_half_theta = sqrt(0.5*(1 - cos_theta))
+        corner = float('inf') if sin_half_theta == 1 else ACCELERATION*JUNCTION_DEVIATION*sin_half_theta/(1 - sin_half_theta)
+        limits[i] = min(corner, rows[i - 1][2]**2, rows[i][2]**2)
+    for i in range(len(rows) - 1, -1, -1):
+        limits[i] = min(limits[i], limits[i + 1] + 2*ACCELERATION*rows[i][0])
+    for i in range(len(rows)):
+        limits[i + 1] = min(limits[i + 1], limits[i] + 2*ACCELERATION*rows[i][0])
+    times = []
+    for i, (length, _, speed) in enumerate(rows):
+        v0, v1 = sqrt(limits[i]), sqrt(limits[i + 1])
+        cruise = length - (speed**2 - v0**2)/(2*ACCELERATION) - (speed**2 - v1**2)/(2*ACCELERATION)
+        if cruise >= 0:
+            times.append((speed - v0)/ACCELERATION + (speed - v1)/ACCELERATION + cruise/speed)
+        else:
+            peak = sqrt((2*ACCELERATION*length + v0**2 + v1**2)/2)
+            times.append((2*peak - v0 - v1)/ACCELERATION)
+    return times
+
+
+if __name__ == '__main__':
+    steps = design()
+    initialization_data = {'acceleration': ACCELERATION, 'junction_deviation': JUNCTION_DEVIATION}
+    session = fc.GcodeControls(printer_name='generic', initialization_data=initialization_data).compile(show_tips=False)
+    moves = session.moves(steps)
+    start = perf_counter()
+    times = move_times(moves, ACCELERATION, JUNCTION_DEVIATION)
+    t_array = perf_counter() - start
+    start = perf_counter()
+    reference = loop_move_times(moves)
+    t_loop = perf_counter() - start
+    print(f'{len(moves.lengths)} moves: one move at a time {t_loop:.3f}s, arrays {t_array:.3f}s ({t_loop/t_array:.1f}x)')
+    total, reference_total = float(times.sum()), sum(reference)
+    print(f'print time {total:.3f}s (one move at a time: {reference_total:.3f}s, full speed: {session.stats(steps).full_speed_time:.3f}s)')
+    failed = len(reference) != int((times > 0).sum()) or abs(total - reference_total) > TOLERANCE*reference_total or \
+        max(abs(a - b) for a, b in zip(times[moves.lengths > 0].tolist(), reference)) > TOLERANCE*max(reference)
+    controls = fc.GcodeControls(printer_name='generic', initialization_data=initialization_data, progress=True)
+    gcode_progress = controls.compile(show_tips=False).gcode(steps)
+    lines = gcode_progress.split('\n')
+    progress_count = sum(line.startswith('M73 ') for line in lines)
+    same_gcode = '\n'.join(line for line in lines if not line.startswith('M73 ')) == session.gcode(steps)
+    print(f'M73 progress lines: {progress_count}, other gcode unchanged: {same_gcode}')
+    if failed or not same_gcode:
+        sys.exit('print times or gcode do not match')
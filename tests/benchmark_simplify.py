@@ -0,0 +1,57 @@
+# benchmark of plot simplification (fc.PlotControls(simplify=True), see fullcontrol/visualize/simplify.py) for a large
+# design, which also checks that every removed point is within the tolerance of the simplified path
+# run from the repo directory: python tests/benchmark_simplify.py
+
+import os
+import sys
+from time import perf_counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import numpy as np
+import fullcontrol as fc
+from fullcontrol.visualize.simplify import segment_distances
+
+LAYERS = 100
+POINTS_PER_LAYER = 5000
+
+
+def design() -> list:
+    steps = []
+    for layer in range(LAYERS):
+        z = 0.2 + 0.2*layer
+        steps.append(fc.helixZ(fc.Point(x=50, y=50, z=z), 20, 20, 0, 1, 0, POINTS_PER_LAYER, as_array=True))
+        steps.extend([fc.Extruder(on=False), fc.Point(x=50, y=50), fc.Extruder(on=True)])
+    return steps
+
+
+def max_deviation(original: np.ndarray, simplified: np.ndarray) -> float:
+    'return the largest distance (mm) of an original point from the simplified path'
+    # the simplified points are a subsequence of the original points
+    kept, i = [], 0
+    for point in simplified:
+        while not (original[i] == point).all():
+            i += 1
+        kept.append(i)
+    worst = 0
+    for first, last in zip(kept[:-1], kept[1:]):
+        if last - first > 1:
+            worst = max(worst, float(segment_distances(original[first + 1:last], original[first], original[last]).max()))
+    return worst
+
+
+if __name__ == '__main__':
+    steps = design()
+    start = perf_counter()
+    full = fc.transform(steps, 'plot', fc.PlotControls(raw_data=True), show_tips=False)
+    t_full = perf_counter() - start
+    start = perf_counter()
+    simplified = fc.transform(steps, 'plot', fc.PlotControls(raw_data=True, simplify=True), show_tips=False)
+    t_simplified = perf_counter() - start
+    print(f'plot data {t_full:.3f}s, with simplification {t_simplified:.3f}s')
+    print(simplified.simplify_report)
+    worst = max(max_deviation(path_full.points['xyz'], path_simplified.points['xyz'])
+                for path_full, path_simplified in zip(full.paths, simplified.paths) if path_full.extruder.on)
+    tolerance = simplified.simplify_report.tolerance
+    print(f'largest deviation of a removed point {worst:.4f} mm (tolerance {tolerance:.4f} mm)')
+    if worst > tolerance*1.000001:
+        sys.exit('simplified paths deviate by more than the tolerance')
@@ -0,0 +1,68 @@
+# benchmark of fc.transform(steps, 'stats') against generating gcode, which also checks that the statistics match
+# values calculated from the gcode (length of moves, time at the full feedrate of each move, and E values)
+# both stats and gcode process runs of Points as arrays, and reading x y z from each Point object into an array takes
+# a large part of the time for both, which limits the speedup for designs made of Points. the same design made of
+# PointArrays (x y z already in arrays) shows the speedup for the rest of the calculation
+# run from the repo directory: python tests/benchmark_stats.py
+
+import os
+import sys
+from math import cos, sin, tau, sqrt
+from time import perf_counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import fullcontrol as fc
+
+LAYERS = 100
+POINTS_PER_LAYER = 3000
+TOLERANCE = 1e-6  # relative difference allowed (gcode values are rounded and stats sums are not in the same order)
+
+
+def design(as_array: bool = False) -> list:
+    steps = []
+    for layer in range(LAYERS):
+        z = 0.2 + 0.2*layer
+        points = [fc.Point(x=50 + 20*cos(tau*i/POINTS_PER_LAYER), y=50 + 20*sin(tau*i/POINTS_PER_LAYER), z=z)
+                  for i in range(POINTS_PER_LAYER + 1)]
+        steps.extend([fc.PointArray.from_points(points)] if as_array else points)
+        steps.extend([fc.Extruder(on=False), fc.Point(x=50, y=50), fc.Extruder(on=True), fc.Printer(print_speed=1000 + 10*layer)])
+    return steps
+
+
+def gcode_totals(gcode: str) -> tuple:
+    'return (time, length of moves, total E) calculated from lines of gcode (G0/G1 moves with X Y Z E F values)'
+    position, feedrate, time, length, e_total = {}, None, 0, 0, 0
+    for line in gcode.split('\n'):
+        if not (line.startswith('G0 ') or line.startswith('G1 ')):
+            continue
+        words = {word[0]: float(word[1:]) for word in line.split(';')[0].split()[1:]}
+        feedrate = words.get('F', feedrate)
+        deltas = [words[axis] - position[axis] for axis in 'XYZ' if axis in words and axis in position]
+        distance = sqrt(sum(delta*delta for delta in deltas))
+        position.update({axis: words[axis] for axis in 'XYZ' if axis in words})
+        time, length, e_total = time + distance/(feedrate/60), length + distance, e_total + words.get('E', 0)
+    return time, length, e_total
+
+
+if __name__ == '__main__':
+    session = fc.GcodeControls(printer_name='generic', decimals={'X': 9, 'Y': 9, 'Z': 9, 'E': 9}).compile(show_tips=False)
+    failed = False
+    for description, as_array in [('Points', False), ('PointArrays', True)]:
+        steps = design(as_array)
+        start = perf_counter()
+        gcode = session.gcode(steps)
+        t_gcode = perf_counter() - start
+        start = perf_counter()
+        stats = session.stats(steps)
+        t_stats = perf_counter() - start
+        print(f'{LAYERS*(POINTS_PER_LAYER + 2)} points as {description}: gcode {t_gcode:.3f}s, stats {t_stats:.3f}s ({t_gcode/t_stats:.1f}x)')
+        print(stats)
+        time, length, e_total = gcode_totals(gcode)
+        for name, value, reference in [('full_speed_time', stats.full_speed_time, time),
+                                       ('extrusion_length + travel_length', stats.extrusion_length + stats.travel_length, length),
+                                       ('filament_length', stats.filament_length, e_total)]:
+            matches = abs(value - reference) <= TOLERANCE*abs(reference)
+            print(f'{name}: {value:.6f} (from gcode: {reference:.6f}), matches: {matches}')
+            failed = failed or not matches
+    if failed:
+        sys.exit('stats do not match the gcode')